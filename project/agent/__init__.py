@@ -1 +1,3 @@
 from .agent import Agent
+from .budget import Budget, BudgetExceeded
+from .loop_detector import LoopDetector
@@ -1,14 +1,28 @@
 from computers import Computer
 from utils import (
-    create_response,
+    create_response_from_body,
     show_image,
     pp,
     sanitize_message,
     check_blocklisted_url,
 )
+from .budget import Budget, BudgetExceeded
+from .loop_detector import LoopDetector, HINT, RELOAD, ABORT
+from .request_body import RequestBody
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import json
+import time
 from typing import Callable
 
+# Per-model-call timings kept in Agent.step_timings
+STEP_TIMINGS_WINDOW = 500
+
+
+def action_arguments(action):
+    """A computer call's action without its type, i.e. the method's keyword arguments."""
+    return {k: v for k, v in action.items() if k != "type"}
+
 
 class Agent:
     """
@@ -23,15 +37,50 @@ class Agent:
         computer: Computer = None,
         tools: list[dict] = [],
         acknowledge_safety_check_callback: Callable = lambda *args: True,  # Changed to True by default
+        functions: dict[str, Callable] = None,
+        end_turn_on: set[str] = None,
+        budget: Budget = None,
+        loop_detector: LoopDetector = None,
+        pipelined: bool = False,
     ):
+        """
+        Args:
+            functions: Handlers for function tools, keyed by tool name. Their return
+                value (JSON-encoded unless already a string) is sent back to the model.
+                A handler rejects a call by returning {"status": "error", ...} or
+                raising; the error is sent back so the model can retry.
+            end_turn_on: Names of function tools that end `run_full_turn` as soon as
+                the model calls them and the handler accepts the call, without
+                another model round trip.
+            budget: Limits checked before every model call; each call's token usage
+                and request size are recorded on it. Can be swapped between turns.
+            loop_detector: Watches for the same action repeating on an unchanged page
+                and hints, reloads the page, or stops the turn (see loop_detector.py).
+            pipelined: Encode the conversation for the next request on a worker thread
+                while computer actions and screenshots run, keeping the encoded items
+                between requests (see request_body.py), and show images off the main
+                thread. Computer calls themselves stay on the calling thread, which
+                Playwright's sync API requires.
+        """
         self.model = model
         self.computer = computer
-        self.tools = tools
+        self.tools = list(tools)  # copy so the default list is never mutated
+        self.functions = dict(functions or {})
+        self.end_turn_on = set(end_turn_on or ())
+        self._rejected_calls = set()  # call ids of function calls their handler rejected
+        self.budget = budget
+        self.loop_detector = loop_detector
         self.print_steps = True
         self.debug = False
         self.show_images = False
         self.acknowledge_safety_check_callback = acknowledge_safety_check_callback
         self.safety_checks_acknowledged = set()  # Track already acknowledged checks
+        self.pipelined = pipelined
+        self.request_body = RequestBody()
+        self._executor = None
+        self._encoding = None  # Future of the history being encoded in the background
+        # Main-thread ms per model call: handling the previous response's items, and building the request
+        self.step_timings = deque(maxlen=STEP_TIMINGS_WINDOW)
 
         if computer:
             dimensions = computer.get_dimensions()
@@ -59,67 +108,166 @@ class Agent:
             if self.print_steps:
                 print(f"{name}({args})")
 
-            if hasattr(self.computer, name):  # if function exists on computer, call it
+            output = "success"
+            if name in self.functions:  # registered handlers report their real result
+                try:
+                    result = self.functions[name](**args)
+                except Exception as e:
+                    result = {"status": "error", "message": str(e)}
+                if isinstance(result, dict) and result.get("status") == "error":
+                    self._rejected_calls.add(item["call_id"])
+                output = result if isinstance(result, str) else json.dumps(result)
+            elif hasattr(self.computer, name):  # if function exists on computer, call it
                 method = getattr(self.computer, name)
                 method(**args)
             return [
                 {
                     "type": "function_call_output",
                     "call_id": item["call_id"],
-                    "output": "success",  # hard-coded output for demo
+                    "output": output,
                 }
             ]
 
         if item["type"] == "computer_call":
-            action = item["action"]
-            action_type = action["type"]
-            action_args = {k: v for k, v in action.items() if k != "type"}
-            if self.print_steps:
-                print(f"{action_type}({action_args})")
+            return self.handle_computer_calls([item])
+        return []
 
-            method = getattr(self.computer, action_type)
-            method(**action_args)
+    def handle_computer_calls(self, items):
+        """
+        Run consecutive computer calls, then take one screenshot for all of them.
 
-            screenshot_base64 = self.computer.screenshot()
-            if self.show_images:
+        Several calls go to the computer's `execute_batch` as one batch; every
+        call gets its own output, all showing the final screenshot.
+        """
+        actions = [item["action"] for item in items]
+        if self.print_steps:
+            for action in actions:
+                print(f"{action['type']}({action_arguments(action)})")
+
+        if len(actions) > 1 and hasattr(self.computer, "execute_batch"):
+            self.computer.execute_batch(actions)
+        else:
+            for action in actions:
+                method = getattr(self.computer, action["type"])
+                method(**action_arguments(action))
+
+        screenshot_base64 = self.computer.screenshot()
+        if self.show_images:
+            if self.pipelined:
+                self._background(show_image, screenshot_base64)
+            else:
                 show_image(screenshot_base64)
 
-            # Handle safety checks more intelligently
-            pending_checks = item.get("pending_safety_checks", [])
-            for check in pending_checks:
-                message = check["message"]
-                # Skip if we've already acknowledged this type of check
-                if message in self.safety_checks_acknowledged:
-                    continue
-                # Auto-acknowledge non-financial checks
-                if "financial" not in message.lower() and "payment" not in message.lower():
-                    self.safety_checks_acknowledged.add(message)
-                    continue
-                # For financial checks, use the callback
-                if not self.acknowledge_safety_check_callback(message):
-                    raise ValueError(
-                        f"Safety check failed: {message}. Cannot proceed with financial transactions."
-                    )
-                self.safety_checks_acknowledged.add(message)
+        # additional URL safety checks for browser environments
+        current_url = None
+        if self.computer.get_environment() == "browser":
+            current_url = self.computer.get_current_url()
+            check_blocklisted_url(current_url)
 
+        call_outputs = []
+        for item in items:
+            pending_checks = item.get("pending_safety_checks", [])
+            self.acknowledge_safety_checks(pending_checks)
             call_output = {
                 "type": "computer_call_output",
                 "call_id": item["call_id"],
                 "acknowledged_safety_checks": pending_checks,
                 "output": {
                     "type": "input_image",
-                    "image_url": f"data:image/png;base64,{screenshot_base64}",
+                    "image_url": self.image_url(screenshot_base64),
                 },
             }
-
-            # additional URL safety checks for browser environments
-            if self.computer.get_environment() == "browser":
-                current_url = self.computer.get_current_url()
-                check_blocklisted_url(current_url)
+            if current_url is not None:
                 call_output["output"]["current_url"] = current_url
+            call_outputs.append(call_output)
 
-            return [call_output]
-        return []
+        if self.loop_detector:
+            # Only the last action is known to have produced the screenshot
+            return call_outputs + self.handle_repetition(
+                actions[-1]["type"], action_arguments(actions[-1]), screenshot_base64, current_url, call_outputs[-1]
+            )
+        return call_outputs
+
+    def acknowledge_safety_checks(self, pending_checks):
+        """Handle safety checks more intelligently."""
+        for check in pending_checks:
+            message = check["message"]
+            # Skip if we've already acknowledged this type of check
+            if message in self.safety_checks_acknowledged:
+                continue
+            # Auto-acknowledge non-financial checks
+            if "financial" not in message.lower() and "payment" not in message.lower():
+                self.safety_checks_acknowledged.add(message)
+                continue
+            # For financial checks, use the callback
+            if not self.acknowledge_safety_check_callback(message):
+                raise ValueError(
+                    f"Safety check failed: {message}. Cannot proceed with financial transactions."
+                )
+            self.safety_checks_acknowledged.add(message)
+
+    def _background(self, fn, *args):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="agent")
+        return self._executor.submit(fn, *args)
+
+    def encode_history(self, items):
+        """Start encoding `items` for the next request on a worker thread (pipelined mode)."""
+        if self.pipelined:
+            self.wait_for_history()
+            self._encoding = self._background(self.request_body.encode_items, list(items))
+
+    def wait_for_history(self):
+        encoding, self._encoding = self._encoding, None
+        if encoding is not None:
+            encoding.result()
+
+    def encode_request(self, request):
+        """
+        The request body, encoded once so the same bytes are sent and counted
+        by the budget. Pipelined mode reuses the items encoded so far.
+        """
+        if not self.pipelined:
+            return json.dumps(request).encode("ascii")
+        self.wait_for_history()
+        fields = {k: v for k, v in request.items() if k != "input"}
+        return self.request_body.build(request["input"], **fields)
+
+    def step_stats(self) -> dict:
+        """
+        Mean main-thread ms per model call spent handling the previous response's
+        items and encoding the request.
+        """
+        if not self.step_timings:
+            return {"steps": 0}
+        steps = len(self.step_timings)
+        handle = sum(t["handle_ms"] for t in self.step_timings) / steps
+        build = sum(t["build_ms"] for t in self.step_timings) / steps
+        return {"steps": steps, "pipelined": self.pipelined, "handle_ms": round(handle, 1),
+                "build_ms": round(build, 1), "overhead_ms": round(handle + build, 1)}
+
+    def image_url(self, screenshot_base64):
+        """Data URI for a screenshot, in whatever format the computer encoded it."""
+        mime_type = getattr(self.computer, "screenshot_mime_type", "image/png")
+        return f"data:{mime_type};base64,{screenshot_base64}"
+
+    def handle_repetition(self, action_type, action_args, screenshot_base64, current_url, call_output):
+        """Feed a step to the loop detector; return any items its verdict adds."""
+        event = self.loop_detector.observe(action_type, action_args, screenshot_base64, current_url)
+        if event is None:
+            return []
+        if event == ABORT:
+            return [{"type": "message", "role": "assistant", "content": [{"text": f"Stopped: {self.loop_detector.aborted}"}]}]
+        if event == RELOAD and not hasattr(self.computer, "reload"):
+            event = HINT  # nothing to reload; nudge the model instead
+        if event == RELOAD:
+            self.computer.reload()
+            # Show the model the reloaded page rather than the stale screenshot
+            screenshot_base64 = self.computer.screenshot()
+            call_output["output"]["image_url"] = self.image_url(screenshot_base64)
+            if current_url is not None:
+                call_output["output"]["current_url"] = self.computer.get_current_url()
+        return [{"role": "user", "content": self.loop_detector.message(event)}]
 
     def run_full_turn(
         self, input_items, print_steps=True, debug=False, show_images=False
@@ -137,6 +285,7 @@ class Agent:
         if not input_items:
             input_items = [{"role": "system", "content": [{"text": "Ready to assist."}]}]
 
+        handle_ms = 0.0  # handling the previous response, which runs before the next request
         # keep looping until we get a final response
         while new_items[-1].get("role") != "assistant" if new_items else True:
             self.debug_print([sanitize_message(msg) for msg in input_items + new_items])
@@ -160,13 +309,21 @@ class Agent:
                     else:
                         formatted_items.append(item)
 
-                response = create_response(
+                request = dict(
                     model=self.model,
                     input=input_items + new_items,
                     tools=self.tools,
                     truncation="auto",
                 )
+                if self.budget:
+                    self.budget.check()
+                started = time.perf_counter()
+                body = self.encode_request(request)
+                self.step_timings.append({"handle_ms": handle_ms, "build_ms": (time.perf_counter() - started) * 1000})
+                response = create_response_from_body(body)
                 self.debug_print(response)
+                if self.budget:
+                    self.budget.record_call(response.get("usage"), len(body))
 
                 if "output" not in response:
                     if self.debug:
@@ -179,8 +336,11 @@ class Agent:
                     raise ValueError("No output from model")
                 
                 # Handle the response output
+                handle_started = time.perf_counter()
                 output_items = response.get("output", [])
-                for item in output_items:
+                end_turn = False
+                batch = []  # consecutive computer calls, run together with one screenshot
+                for index, item in enumerate(output_items):
                     # Ensure each output item has a role
                     if "role" not in item:
                         if item.get("type") == "message":
@@ -188,10 +348,31 @@ class Agent:
                         elif item.get("type") in ["computer_call_output", "function_call_output"]:
                             item["role"] = "system"
                     new_items.append(item)
-                    # Handle any computer actions
-                    result_items = self.handle_item(item)
+                    if item.get("type") == "computer_call":
+                        batch.append(item)
+                        following = output_items[index + 1] if index + 1 < len(output_items) else {}
+                        if following.get("type") == "computer_call":
+                            continue
+                        # Everything up to here is final: encode it while the browser works
+                        self.encode_history(input_items + new_items)
+                        result_items = self.handle_computer_calls(batch)
+                        batch = []
+                    else:
+                        # Handle any computer actions
+                        result_items = self.handle_item(item)
                     if result_items:
                         new_items.extend(result_items)
+                    if (item.get("type") == "function_call" and item.get("name") in self.end_turn_on
+                            and item.get("call_id") not in self._rejected_calls):
+                        end_turn = True
+                    if self.loop_detector and self.loop_detector.aborted:
+                        return new_items
+                handle_ms = (time.perf_counter() - handle_started) * 1000
+                if end_turn:
+                    return new_items
+            except BudgetExceeded as e:
+                print(f"Budget exceeded: {e.reason}")
+                return new_items + [{"type": "message", "role": "assistant", "content": [{"text": f"Budget exceeded: {e.reason}"}]}]
             except Exception as e:
                 print(f"Error processing response: {str(e)}")
                 return new_items + [{"type": "message", "role": "assistant", "content": [{"text": f"Error: {str(e)}"}]}]
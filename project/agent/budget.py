@@ -0,0 +1,130 @@
+import os
+import time
+
+# Usage counters tracked by a Budget, in the order they are reported
+USAGE_FIELDS = ("wall_seconds", "model_calls", "input_tokens", "output_tokens", "upload_bytes")
+
+
+class BudgetExceeded(Exception):
+    """Raised by Budget.check() once a limit has been reached."""
+
+    def __init__(self, reason, budget_name=None):
+        super().__init__(reason)
+        self.reason = reason
+        self.budget_name = budget_name
+
+
+class Budget:
+    """
+    Limits on wall time, model calls, tokens and uploaded request bytes.
+
+    A limit of None means unlimited. Budgets can be nested: usage recorded on a
+    per-test-case budget is also recorded on its parent (session) budget, and
+    check() fails if either one is exhausted.
+    """
+
+    def __init__(
+        self,
+        name="budget",
+        wall_seconds: float = None,
+        model_calls: int = None,
+        input_tokens: int = None,
+        output_tokens: int = None,
+        upload_bytes: int = None,
+        parent: "Budget" = None,
+    ):
+        self.name = name
+        self.limits = {
+            "wall_seconds": wall_seconds,
+            "model_calls": model_calls,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "upload_bytes": upload_bytes,
+        }
+        self.parent = parent
+        self.started_at = time.monotonic()
+        self.model_calls = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.upload_bytes = 0
+        self.exceeded = None  # reason, once a limit has been hit
+
+    def child(self, name, **limits):
+        """A new budget whose usage also counts against this one."""
+        return Budget(name=name, parent=self, **limits)
+
+    @property
+    def wall_seconds(self):
+        return time.monotonic() - self.started_at
+
+    def record_call(self, usage=None, upload_bytes=0):
+        """Record one model call, its `usage` block from the response and the request size."""
+        usage = usage or {}
+        self.model_calls += 1
+        self.input_tokens += usage.get("input_tokens", 0) or 0
+        self.output_tokens += usage.get("output_tokens", 0) or 0
+        self.upload_bytes += upload_bytes
+        if self.parent:
+            self.parent.record_call(usage, upload_bytes)
+
+    def check(self):
+        """Raise BudgetExceeded if this budget or a parent has reached a limit."""
+        if self.parent:
+            try:
+                self.parent.check()
+            except BudgetExceeded as e:
+                self.exceeded = e.reason
+                raise
+        for field, limit in self.limits.items():
+            if limit is not None and getattr(self, field) >= limit:
+                self.exceeded = f"{self.name} {field.replace('_', ' ')} limit reached ({_format(field, limit)})"
+                raise BudgetExceeded(self.exceeded, self.name)
+
+    def usage(self):
+        """Usage so far as a JSON-friendly dict."""
+        return {field: round(getattr(self, field), 2) if field == "wall_seconds" else getattr(self, field)
+                for field in USAGE_FIELDS}
+
+    @classmethod
+    def from_env(cls, name, prefix, defaults=None, parent=None):
+        """
+        Build a budget from `{prefix}_MAX_SECONDS`, `_MAX_MODEL_CALLS`,
+        `_MAX_INPUT_TOKENS`, `_MAX_OUTPUT_TOKENS` and `_MAX_UPLOAD_MB`.
+
+        Unset variables fall back to `defaults` (keyed like the constructor
+        arguments); "0" or "none" disables a limit.
+        """
+        limits = dict(defaults or {})
+        for field, suffix, scale in (
+            ("wall_seconds", "MAX_SECONDS", 1),
+            ("model_calls", "MAX_MODEL_CALLS", 1),
+            ("input_tokens", "MAX_INPUT_TOKENS", 1),
+            ("output_tokens", "MAX_OUTPUT_TOKENS", 1),
+            ("upload_bytes", "MAX_UPLOAD_MB", 1024 * 1024),
+        ):
+            value = os.environ.get(f"{prefix}_{suffix}")
+            if value is None:
+                continue
+            if value.strip().lower() in ("", "0", "none"):
+                limits[field] = None
+            else:
+                limits[field] = int(float(value) * scale)
+        return cls(name=name, parent=parent, **limits)
+
+
+def sum_usage(usages):
+    """Add up usage dicts (e.g. from the test cases of a report)."""
+    totals = dict.fromkeys(USAGE_FIELDS, 0)
+    for usage in usages:
+        for field in USAGE_FIELDS:
+            totals[field] += (usage or {}).get(field, 0) or 0
+    totals["wall_seconds"] = round(totals["wall_seconds"], 2)
+    return totals
+
+
+def _format(field, value):
+    if field == "wall_seconds":
+        return f"{value:g}s"
+    if field == "upload_bytes":
+        return f"{value / (1024 * 1024):.1f} MB"
+    return str(value)
@@ -0,0 +1,119 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import Counter, deque
+
+# What the agent does when a step keeps repeating
+HINT = "hint"
+RELOAD = "reload"
+ABORT = "abort"
+
+HINT_MESSAGE = (
+    "Your last {repeats} actions were identical and the page did not change. "
+    "That action is not working: try a different element, scroll to reveal it, "
+    "use the keyboard, or report the test case result if it cannot be completed."
+)
+RELOAD_MESSAGE = (
+    "The page was reloaded because the same action was repeated {repeats} times "
+    "with no visible change. Look at the new screenshot before acting again."
+)
+
+
+class LoopDetector:
+    """
+    Spots the agent repeating the same step without the page changing.
+
+    Each computer action is fingerprinted as (action, arguments, screenshot hash,
+    URL) after it runs. When one fingerprint shows up `hint_after` times within
+    the last `window` steps the agent gets a corrective hint, at `reload_after`
+    the page is reloaded, and at `abort_after` the turn is stopped. A step that
+    reaches `reload_after` again after its page was already reloaded (the reload
+    gave a new screenshot but the agent kept going) also stops the turn. Events
+    are printed and, if `log_path` is set, appended to it as JSON lines.
+    """
+
+    def __init__(self, hint_after=3, reload_after=5, abort_after=7, window=10, log_path=None):
+        self.hint_after = hint_after
+        self.reload_after = reload_after
+        self.abort_after = abort_after
+        self.window = window
+        self.log_path = log_path
+        self._log_lock = threading.Lock()
+        self.reset()
+
+    def reset(self, context=None):
+        """Forget previous steps, e.g. when a new test case starts."""
+        self.context = context
+        self._recent = deque(maxlen=self.window)
+        self._counts = Counter()
+        self._reloaded = set()  # (action, arguments, URL) already answered with a reload
+        self.aborted = None  # reason, once the detector has stopped a turn
+        self.events = []
+
+    @staticmethod
+    def fingerprint(action_type, action_args, screenshot_base64, url=None):
+        screen = hashlib.sha1(screenshot_base64.encode("ascii")).hexdigest()
+        return (action_type, json.dumps(action_args, sort_keys=True), screen, url)
+
+    def observe(self, action_type, action_args, screenshot_base64, url=None):
+        """
+        Record a step and return HINT, RELOAD, ABORT or None.
+
+        `screenshot_base64` is the screenshot taken after the action ran.
+        """
+        fingerprint = self.fingerprint(action_type, action_args, screenshot_base64, url)
+        if len(self._recent) == self._recent.maxlen:
+            oldest = self._recent[0]
+            self._counts[oldest] -= 1
+        self._recent.append(fingerprint)
+        self._counts[fingerprint] += 1
+        repeats = self._counts[fingerprint]
+        step = (fingerprint[0], fingerprint[1], fingerprint[3])
+        reload_again = self.reload_after and repeats == self.reload_after and step in self._reloaded
+
+        if (self.abort_after and repeats >= self.abort_after) or reload_again:
+            event = ABORT
+            self.aborted = (f"stuck: {action_type} repeated {repeats} times "
+                            f"with no change on the page")
+        elif self.reload_after and repeats == self.reload_after:
+            event = RELOAD
+            self._reloaded.add(step)
+        elif self.hint_after and repeats >= self.hint_after:
+            event = HINT
+        else:
+            return None
+
+        self._log(event, repeats, fingerprint)
+        return event
+
+    def message(self, event):
+        """Text sent to the model for a HINT or RELOAD event."""
+        repeats = self.events[-1]["repeats"] if self.events else self.hint_after
+        template = RELOAD_MESSAGE if event == RELOAD else HINT_MESSAGE
+        return template.format(repeats=repeats)
+
+    def _log(self, event, repeats, fingerprint):
+        action_type, action_args, screen, url = fingerprint
+        record = {
+            "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "context": self.context,
+            "event": event,
+            "repeats": repeats,
+            "action": action_type,
+            "arguments": json.loads(action_args),
+            "url": url,
+            "screenshot_sha1": screen,
+        }
+        self.events.append(record)
+        print(f"Loop detector: {event} after {repeats} identical steps ({action_type} {action_args})")
+        if not self.log_path:
+            return
+        try:
+            with self._log_lock:
+                os.makedirs(os.path.dirname(os.path.abspath(self.log_path)), exist_ok=True)
+                with open(self.log_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record) + "\n")
+        except OSError as e:
+            print(f"Could not write loop event: {e}")
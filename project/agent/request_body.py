@@ -0,0 +1,38 @@
+import json
+import threading
+
+
+class RequestBody:
+    """
+    JSON body of a Responses API request, built from a growing conversation.
+
+    Every screenshot stays in the history, so encoding the whole request each
+    turn costs more and more. Encoded input items are kept and only items added
+    since the last call are encoded, which also lets the agent encode the
+    history on a worker thread while the browser is busy. Items are recognised
+    by identity, in order: an item must not be changed after it was encoded.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._items = []
+        self._encoded = []
+
+    def encode_items(self, items) -> None:
+        """Encode the items not seen yet; items are a prefix-extension of the previous call's."""
+        with self._lock:
+            common = 0
+            limit = min(len(items), len(self._items))
+            while common < limit and items[common] is self._items[common]:
+                common += 1
+            del self._items[common:], self._encoded[common:]
+            for item in items[common:]:
+                self._encoded.append(json.dumps(item))
+                self._items.append(item)
+
+    def build(self, items, **fields) -> bytes:
+        """The request body, byte for byte what `json.dumps({**fields, "input": items})` gives."""
+        self.encode_items(items)
+        with self._lock:
+            head = json.dumps(fields)[:-1] + (", " if fields else "")
+            return (head + '"input": [' + ", ".join(self._encoded) + "]}").encode("ascii")
@@ -0,0 +1,95 @@
+"""
+Benchmark: pipelined agent turns
+Runs Agent.run_full_turn over a scripted conversation of computer calls with a
+stand-in computer (each screenshot takes a fixed capture time and returns a
+fresh, realistically sized base64 image) and a stand-in model endpoint that
+takes the encoded request body and answers after a fixed latency. Both modes
+encode each request exactly once (the sequential mode as a whole, the
+pipelined mode incrementally, on a worker thread); budget accounting is
+optional and identical in both. Compares the per-turn wall time, and the
+agent's own main-thread overhead, as the history grows.
+
+Usage: python benchmarks/bench_agent_pipeline.py [--turns 10 30 60] [--image-kb 250] [--capture-ms 80] [--budget]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from agent import agent as agent_module
+from agent import Agent, Budget
+
+
+class StandInComputer:
+    def __init__(self, image_kb, capture_ms):
+        self.image_kb = image_kb
+        self.capture_ms = capture_ms
+        self.frames = 0
+
+    def get_environment(self):
+        return "browser"
+
+    def get_dimensions(self):
+        return (1024, 768)
+
+    def get_current_url(self):
+        return "https://www.saucedemo.com/inventory.html"
+
+    def click(self, x, y, button="left"):
+        pass
+
+    def screenshot(self):
+        time.sleep(self.capture_ms / 1000)
+        self.frames += 1
+        return (f"{self.frames:08d}" * (self.image_kb * 128))[:self.image_kb * 1024]
+
+
+def script(turns):
+    calls = [{"output": [{"type": "computer_call", "call_id": f"c{i}",
+                          "action": {"type": "click", "x": 10 + i, "y": 20}}],
+              "usage": {"input_tokens": 1000, "output_tokens": 20}} for i in range(turns)]
+    return calls + [{"output": [{"type": "message", "content": [{"text": "Pass"}]}]}]
+
+
+def run(turns, pipelined, image_kb, capture_ms, model_ms, budget):
+    responses = script(turns)
+    sent = []
+
+    def model(body):
+        sent.append(len(body))
+        time.sleep(model_ms / 1000)
+        return responses[len(sent) - 1]
+
+    agent_module.create_response_from_body = model
+    agent = Agent(computer=StandInComputer(image_kb, capture_ms), pipelined=pipelined,
+                  budget=Budget(name="bench") if budget else None)
+    started = time.perf_counter()
+    agent.run_full_turn([{"role": "user", "content": "Add the backpack to the cart"}], print_steps=False)
+    wall_ms = (time.perf_counter() - started) * 1000
+    return wall_ms / len(sent), agent.step_stats(), sent[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sequential vs pipelined agent turns.")
+    parser.add_argument('--turns', type=int, nargs='+', default=[10, 30, 60])
+    parser.add_argument('--image-kb', type=int, default=250, help="base64 screenshot size")
+    parser.add_argument('--capture-ms', type=float, default=80)
+    parser.add_argument('--model-ms', type=float, default=0, help="stand-in model latency")
+    parser.add_argument('--budget', action='store_true', help="record usage on a budget in both modes")
+    args = parser.parse_args()
+
+    print(f"{'turns':>5} {'last body MB':>12} {'mode':<10} {'ms/turn':>8} {'overhead ms':>12} {'saved ms/turn':>14}")
+    for turns in args.turns:
+        baseline = None
+        for pipelined in (False, True):
+            per_turn, stats, body = run(turns, pipelined, args.image_kb, args.capture_ms, args.model_ms, args.budget)
+            saved = "" if baseline is None else f"{baseline - per_turn:>14.1f}"
+            baseline = per_turn if baseline is None else baseline
+            mode = "pipelined" if pipelined else "sequential"
+            print(f"{turns:>5} {body / 2**20:>12.1f} {mode:<10} {per_turn:>8.1f} {stats['overhead_ms']:>12.1f} {saved}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark: blocklist request routing
+Measures page-load time of a local page with many sub-resources under three setups:
+no routing, the previous page-level "**/*" route that checked every request in
+Python, and the context-level route the computers install: the pattern from
+DomainBlocklist.route_pattern() (the built-in list plus any BLOCKLIST_FILES),
+with DomainBlocklist.is_blocked() deciding in the handler.
+
+Needs a Playwright Chromium (`playwright install chromium`); no network access is used.
+
+Usage: python benchmarks/bench_block_routing.py [--resources 50 200 800] [--repeat 5]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from playwright.sync_api import sync_playwright
+from utils import BLOCKED_DOMAINS, BLOCKLIST
+
+PIXEL = bytes.fromhex(
+    "89504e470d0a1a0a0000000d49484452000000010000000108060000001f15c489"
+    "0000000d4944415478da636060606000000005000165a3b8c60000000049454e44ae426082"
+)
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        path = urlparse(self.path)
+        if path.path.startswith('/img/'):
+            body, content_type = PIXEL, 'image/png'
+        else:
+            count = int(path.query.split('=')[1]) if path.query else 0
+            images = ''.join(f'<img src="/img/{i}.png">' for i in range(count))
+            # One blocklisted request per page, so every setup does some blocking work
+            body = f'<html><body>{images}<script src="https://{BLOCKED_DOMAINS[0]}/t.js"></script></body></html>'
+            body, content_type = body.encode(), 'text/html'
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Cache-Control', 'no-store')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def legacy_is_blocked(url):
+    """The per-request check the old page route ran (utils.check_blocklisted_url)."""
+    hostname = urlparse(url).hostname or ""
+    return any(hostname == blocked or hostname.endswith(f".{blocked}") for blocked in BLOCKED_DOMAINS)
+
+
+def setup_none(context, page):
+    pass
+
+
+def setup_page_route(context, page):
+    def handle_route(route, request):
+        if legacy_is_blocked(request.url):
+            route.abort()
+        else:
+            route.continue_()
+    page.route("**/*", handle_route)
+
+
+def setup_context_route(context, page):
+    # Same as BasePlaywrightComputer._setup_context / _handle_blocked_request
+    def handle_route(route, request):
+        if BLOCKLIST.is_blocked(request.url):
+            route.abort("blockedbyclient")
+        else:
+            route.fallback()
+    context.route(BLOCKLIST.route_pattern(), handle_route)
+
+
+SETUPS = [("no routing", setup_none), ("page **/* (old)", setup_page_route), ("context route", setup_context_route)]
+
+
+def time_load(browser, setup, url, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        context = browser.new_context()
+        page = context.new_page()
+        setup(context, page)
+        started = time.perf_counter()
+        page.goto(url, wait_until='load')
+        best = min(best, time.perf_counter() - started)
+        context.close()
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark blocklist request routing.")
+    parser.add_argument('--resources', type=int, nargs='+', default=[50, 200, 800])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    with sync_playwright() as playwright:
+        browser = playwright.chromium.launch(headless=True)
+        print(f"{'resources':>9} " + ' '.join(f"{name + ' (s)':>20}" for name, _ in SETUPS))
+        for count in args.resources:
+            times = [time_load(browser, setup, f"{base}?n={count}", args.repeat) for _, setup in SETUPS]
+            print(f"{count:>9} " + ' '.join(f"{t:>20.4f}" for t in times))
+        browser.close()
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark: domain blocklist lookups
+Compares the suffix-indexed DomainBlocklist in blocklist.py with the previous
+linear `any(... endswith ...)` scan over synthetic lists of increasing size,
+for hostnames with few and many labels. "suffix walk" is the uncached lookup;
+is_blocked(url) includes URL parsing and the per-hostname cache. Also times
+loading a hosts-format file.
+
+Usage: python benchmarks/bench_blocklist.py [--sizes 100 10000 100000 1000000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from urllib.parse import urlparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from blocklist import DomainBlocklist
+
+HOSTS = {
+    2: "https://example.com/",
+    4: "https://static.cdn.example.com/app.js",
+    8: "https://a.b.c.d.e.static.example.com/x.png",
+}
+
+
+def legacy_is_blocked(url, domains):
+    """The check previously in utils.check_blocklisted_url, returning a bool instead of raising."""
+    hostname = urlparse(url).hostname or ""
+    return any(hostname == blocked or hostname.endswith(f".{blocked}") for blocked in domains)
+
+
+def build_domains(size, seed=0):
+    rng = random.Random(seed)
+    return [f"{rng.getrandbits(40):x}.{rng.choice(['com', 'net', 'org', 'io'])}" for _ in range(size)]
+
+
+def time_per_call(func, calls):
+    started = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark domain blocklist lookups.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 10_000, 100_000, 1_000_000])
+    parser.add_argument('--calls', type=int, default=20_000)
+    parser.add_argument('--legacy-max', type=int, default=100_000, help="skip the linear scan above this size")
+    args = parser.parse_args()
+
+    print(f"{'domains':>9} {'load (s)':>9} {'labels':>7} {'legacy (us)':>12} {'suffix walk (us)':>16} {'is_blocked(url) (us)':>21}")
+    for size in args.sizes:
+        domains = build_domains(size)
+        with tempfile.NamedTemporaryFile('w', suffix='.hosts', delete=False) as f:
+            f.writelines(f"0.0.0.0 {domain}\n" for domain in domains)
+        try:
+            started = time.perf_counter()
+            blocklist = DomainBlocklist(blocked_files=[f.name], reload_interval=3600)
+            load_time = time.perf_counter() - started
+        finally:
+            os.unlink(f.name)
+
+        for labels, url in HOSTS.items():
+            if size <= args.legacy_max:
+                calls = max(1, min(args.calls, 2_000_000 // size))
+                legacy = f"{time_per_call(lambda: legacy_is_blocked(url, domains), calls):>12.2f}"
+            else:
+                legacy = f"{'-':>12}"
+            hostname = urlparse(url).hostname
+            uncached = time_per_call(lambda: blocklist._decide(hostname), args.calls)
+            cached = time_per_call(lambda: blocklist.is_blocked(url), args.calls)
+            print(f"{size:>9} {load_time:>9.3f} {labels:>7} {legacy} {uncached:>16.2f} {cached:>21.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark: browser sessions per GB
+Launches N browsers the way LocalPlaywrightBrowser does, each with one page
+showing a shop-like test page, and measures the memory of the whole browser
+process tree (proportional set size, so shared pages are split fairly).
+Compares the default flags with the low-memory headless deployment mode.
+
+Linux only (reads /proc); needs a Playwright Chromium (`playwright install chromium`).
+
+Usage: python benchmarks/bench_headless_density.py [--sessions 1 5 10]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from playwright.sync_api import sync_playwright
+from computers.default.local_playwright import LocalPlaywrightBrowser
+
+PAGE = """<html><head><style>.item{display:inline-block;width:200px;margin:8px;border:1px solid #ccc}</style></head>
+<body><h1>Products</h1>{items}<script>
+const cart = [];
+document.querySelectorAll('button').forEach(b => b.addEventListener('click', () => cart.push(b.dataset.id)));
+</script></body></html>"""
+ITEM = '<div class="item"><h3>Product {i}</h3><p>{text}</p><button data-id="{i}">Add to cart</button></div>'
+
+CONFIGS = [
+    ("headless, default flags", dict(headless=True, low_memory=False)),
+    ("headless, low-memory", dict(headless=True)),
+]
+
+
+def children(pid):
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            return [int(c) for c in f.read().split()]
+    except OSError:
+        return []
+
+
+def tree_pss_kb(root):
+    """PSS of all descendants of `root` (the Playwright driver and its browsers), in KB."""
+    total, stack = 0, children(root)
+    while stack:
+        pid = stack.pop()
+        stack.extend(children(pid))
+        try:
+            with open(f"/proc/{pid}/smaps_rollup") as f:
+                for line in f:
+                    if line.startswith("Pss:"):
+                        total += int(line.split()[1])
+                        break
+        except OSError:
+            pass
+    return total
+
+
+def measure(playwright, options, sessions, settle_seconds):
+    baseline = tree_pss_kb(os.getpid())
+    browsers = []
+    content = PAGE.replace("{items}", "".join(ITEM.format(i=i, text="lorem ipsum " * 20) for i in range(300)))
+    try:
+        for _ in range(sessions):
+            computer = LocalPlaywrightBrowser(**options)
+            browser = playwright.chromium.launch(**computer.launch_options())
+            page = browser.new_context().new_page()
+            page.set_content(content)
+            browsers.append(browser)
+        time.sleep(settle_seconds)
+        return (tree_pss_kb(os.getpid()) - baseline) / 1024 / sessions
+    finally:
+        for browser in browsers:
+            browser.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark browser sessions per GB of memory.")
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 5, 10])
+    parser.add_argument('--settle', type=float, default=2.0, help="seconds to wait before measuring")
+    args = parser.parse_args()
+
+    print(f"{'config':<26} {'sessions':>8} {'MB/session':>11} {'sessions/GB':>12}")
+    with sync_playwright() as playwright:
+        for name, options in CONFIGS:
+            for sessions in args.sessions:
+                mb = measure(playwright, options, sessions, args.settle)
+                print(f"{name:<26} {sessions:>8} {mb:>11.1f} {1024 / mb:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""
+Benchmark: agent output classifier
+Compares the precompiled classifier in webui/output_classifier.py with the
+previous per-keyword substring checks on agent outputs of increasing size.
+
+Usage: python benchmarks/bench_output_classifier.py [--sizes 1 10 100 500]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+WEBUI_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'webui')
+sys.path.append(WEBUI_DIR)
+from output_classifier import classify_output
+
+CORPUS_FILE = os.path.join(WEBUI_DIR, 'output_classifier_corpus.json')
+
+FILLER = ("Clicked the 'Add to cart' button for the Sauce Labs Backpack and took a screenshot "
+          "of the inventory page to check the cart badge count.\n")
+
+
+def legacy_parse_pass_fail_from_output(output_text):
+    """The verdict parser previously in webui/server.py, kept verbatim for comparison."""
+    output_lower = output_text.lower()
+    last_part = output_text[-500:].lower() if len(output_text) > 500 else output_lower
+    if last_part.strip().endswith('pass') or last_part.strip().endswith('passed'):
+        return 'Pass'
+    if last_part.strip().endswith('fail') or last_part.strip().endswith('failed'):
+        return 'Fail'
+    if 'test case is passed' in last_part or 'result: pass' in last_part:
+        return 'Pass'
+    if 'test case is failed' in last_part or 'result: fail' in last_part:
+        return 'Fail'
+    fail_indicators = [
+        'unable to', 'cannot', 'error', 'failed', 'failure',
+        'incorrect', 'does not match', 'not found', 'not visible',
+        'blocked', 'denied', 'locked out'
+    ]
+    for indicator in fail_indicators:
+        if indicator in output_lower:
+            return 'Fail'
+    success_indicators = [
+        'passed', 'successful', 'verified', 'correct', 'appears correctly',
+        'displayed', 'loaded', 'visible', 'confirmation', 'completed successfully'
+    ]
+    for indicator in success_indicators:
+        if indicator in output_lower:
+            return 'Pass'
+    return 'Unknown'
+
+
+def legacy_classify(output_text, last_output):
+    """The checks previously inlined in run_single_testcase, plus the verdict parser."""
+    last_output_lower = last_output.lower()
+    complete = (last_output.strip().lower() in ['pass', 'fail', 'passed', 'failed'] or
+                "test case is passed" in last_output_lower or
+                "test case is failed" in last_output_lower or
+                "result: pass" in last_output_lower or
+                "result: fail" in last_output_lower)
+    question_type = auto_response = None
+    if "?" in last_output:
+        if ("should i" in last_output_lower or "proceed" in last_output_lower or
+                "shall i" in last_output_lower or "go ahead" in last_output_lower):
+            question_type, auto_response = 'procedural', 'yes, proceed'
+        elif "do you want" in last_output_lower or "would you like" in last_output_lower:
+            question_type, auto_response = 'confirmation', 'yes'
+        else:
+            question_type = 'open'
+    return {
+        'verdict': legacy_parse_pass_fail_from_output(output_text),
+        'complete': complete,
+        'question_type': question_type,
+        'auto_response': auto_response,
+        'completed_signal': "completed" in last_output_lower,
+    }
+
+
+def new_classify(output_text, last_output):
+    c = classify_output(output_text, last_output)
+    return {
+        'verdict': c.verdict,
+        'complete': c.complete,
+        'question_type': c.question_type,
+        'auto_response': c.auto_response,
+        'completed_signal': c.completed_signal,
+    }
+
+
+def load_corpus():
+    with open(CORPUS_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def build_outputs(corpus, size_kb):
+    """Pad every corpus entry with filler in front so the output is about size_kb long."""
+    filler = FILLER * max(1, (size_kb * 1024) // len(FILLER))
+    return [(filler + entry['output'], entry['last_output']) for entry in corpus]
+
+
+def time_all(func, outputs, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        results = [func(output, last) for output, last in outputs]
+        best = min(best, time.perf_counter() - started)
+    return best, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the agent output classifier.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 10, 100, 500],
+                        help="Output sizes in KB")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    print(f"{len(corpus)} corpus entries per size")
+    print(f"{'output KB':>10} {'legacy (ms)':>12} {'classifier (ms)':>16} {'speedup':>8}  same labels")
+    for size in args.sizes:
+        outputs = build_outputs(corpus, size)
+        legacy_time, legacy_results = time_all(legacy_classify, outputs, args.repeat)
+        new_time, new_results = time_all(new_classify, outputs, args.repeat)
+        print(f"{size:>10} {legacy_time * 1000:>12.2f} {new_time * 1000:>16.2f} "
+              f"{legacy_time / max(new_time, 1e-9):>7.1f}x  {legacy_results == new_results}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark: test case splitter
+Compares the single-pass parser in webui/testcase_parser.py with the previous
+regex-rescanning splitter on synthetic suites of increasing size.
+
+Usage: python benchmarks/bench_testcase_parser.py [--sizes 100 1000 5000]
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'webui'))
+from testcase_parser import split_instructions_by_testcase
+
+VALIDATION_PATTERN = r'Update the result in one word \(Pass/Fail\) in report against this test case number\.'
+
+STRUCTURED_CASE = """## Test Case {i}: Add Product {i} Test
+
+**Test Case Number:** 1001.1.{i}  
+**Description:** Add Product {i} Test - Ensure product {i} can be added to the cart
+
+**Steps:**
+- Load https://www.saucedemo.com/
+- Login using 'standard_user' as username and 'secret_sauce' as password
+- Click 'ADD TO CART' for product {i}
+- Open the shopping cart icon in the top-right corner
+- Verify that product {i} appears in the cart with the correct name and price
+
+**Validation:**  
+TestCase Number - 1001.1.{i}, Add Product {i} Test: Ensure product {i} can be added to the cart.  
+Tell us if this test case is passed or failed? Update the result in one word (Pass/Fail) in report against this test case number.
+
+---
+
+"""
+
+
+def legacy_split_instructions_by_testcase(instructions):
+    """The splitter previously in webui/server.py, kept verbatim for comparison."""
+    pattern = r'TestCase Number\s*-\s*([0-9.]+)\s*,\s*([^:]+):'
+    test_cases = [
+        {'number': m.group(1).strip(), 'name': m.group(2).strip(), 'start_pos': m.start()}
+        for m in re.finditer(pattern, instructions, re.IGNORECASE)
+    ]
+    if not test_cases:
+        return [(None, None, instructions)]
+
+    result = []
+    for i, tc in enumerate(test_cases):
+        start = tc['start_pos']
+        block_start = 0
+        if i > 0:
+            prev_section = instructions[:start]
+            validation_matches = list(re.finditer(VALIDATION_PATTERN, prev_section, re.IGNORECASE))
+            if validation_matches:
+                block_start = validation_matches[-1].end()
+        if i < len(test_cases) - 1:
+            block_end = test_cases[i + 1]['start_pos']
+            section = instructions[start:block_end]
+            validation_match = re.search(VALIDATION_PATTERN, section, re.IGNORECASE)
+            if validation_match:
+                block_end = start + validation_match.end()
+        else:
+            block_end = len(instructions)
+        result.append((tc['number'], tc['name'], instructions[block_start:block_end].strip()))
+    return result
+
+
+def build_suite(size):
+    return ''.join(STRUCTURED_CASE.format(i=i) for i in range(1, size + 1))
+
+
+def time_call(func, arg, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(arg)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the test case splitter.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 3000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'cases':>8} {'suite KB':>9} {'legacy (s)':>11} {'single-pass (s)':>16} {'speedup':>8}  same output")
+    for size in args.sizes:
+        suite = build_suite(size)
+        legacy_time, legacy_result = time_call(legacy_split_instructions_by_testcase, suite, args.repeat)
+        new_time, new_result = time_call(split_instructions_by_testcase, suite, args.repeat)
+        print(f"{size:>8} {len(suite) / 1024:>9.1f} {legacy_time:>11.4f} {new_time:>16.4f} "
+              f"{legacy_time / max(new_time, 1e-9):>7.1f}x  {legacy_result == new_result}")
+
+
+if __name__ == '__main__':
+    main()
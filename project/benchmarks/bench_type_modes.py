@@ -0,0 +1,74 @@
+"""
+Benchmark: text entry modes
+Times BasePlaywrightComputer.type() for strings of 10 to 10k characters in
+each type mode, into a plain textarea and into one with a keydown listener
+("auto" should insert into the first and type into the second), and checks
+the field ends up holding the whole string.
+
+Needs a Playwright Chromium (`playwright install chromium`).
+
+Usage: python benchmarks/bench_type_modes.py [--lengths 10 100 1000 10000] [--repeat 3]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from playwright.sync_api import sync_playwright
+from computers.shared.base_playwright import TYPE_MODES, BasePlaywrightComputer
+
+PAGE = """<html><body>
+<textarea id="plain" rows="10" cols="80"></textarea>
+<textarea id="listened" rows="10" cols="80"></textarea>
+<script>
+let keys = 0;
+document.getElementById('listened').addEventListener('keydown', () => keys++);
+</script></body></html>"""
+
+FIELDS = ("plain", "listened")
+
+
+def sample_text(length):
+    words = "the quick brown fox jumps over the lazy dog "
+    return (words * (length // len(words) + 1))[:length]
+
+
+def time_type(computer, field, text):
+    page = computer._page
+    page.fill(f"#{field}", "")
+    page.focus(f"#{field}")
+    started = time.perf_counter()
+    computer.type(text)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    value = page.input_value(f"#{field}")
+    assert value == text, f"{field}: expected {len(text)} chars, got {len(value)}"
+    return elapsed_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark text entry modes.")
+    parser.add_argument('--lengths', type=int, nargs='+', default=[10, 100, 1000, 10000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    computer = BasePlaywrightComputer()
+    print(f"{'field':<10} {'mode':<7} {'chars':>6} {'median ms':>10} {'ms/char':>8}")
+    with sync_playwright() as playwright:
+        browser = playwright.chromium.launch(headless=True)
+        computer._page = browser.new_page()
+        computer._page.set_content(PAGE)
+        for field in FIELDS:
+            for mode in TYPE_MODES:
+                computer.set_type_mode(mode)
+                for length in args.lengths:
+                    text = sample_text(length)
+                    median = statistics.median(time_type(computer, field, text) for _ in range(args.repeat))
+                    print(f"{field:<10} {mode:<7} {length:>6} {median:>10.1f} {median / length:>8.3f}")
+        browser.close()
+
+
+if __name__ == '__main__':
+    main()
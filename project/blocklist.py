@@ -0,0 +1,210 @@
+"""
+Domain Blocklist
+Suffix-indexed domain blocklist/allowlist loadable from large files.
+
+Domains are kept in hash sets. A hostname is looked up by walking its label
+suffixes from the most specific one ("a.b.example.com", "b.example.com",
+"example.com", "com"), so a lookup costs O(labels) set probes whatever the
+size of the list. The most specific listed suffix decides: allowing
+"docs.example.com" while blocking "example.com" lets the docs through, and
+blocking "ads.docs.example.com" on top of that blocks it again.
+
+Files may be plain lists (one domain per line) or hosts files
+("0.0.0.0 ads.example.com"), with "#" comments. They are re-read when their
+modification time changes, checked at most every `reload_interval` seconds.
+Decisions are cached per hostname until the next reload.
+"""
+
+import os
+import re
+import threading
+import time
+from urllib.parse import urlsplit
+
+# Hosts-file names that are never meant as blocklist entries
+_HOSTS_FILE_NAMES = {"localhost", "localhost.localdomain", "local", "broadcasthost",
+                     "ip6-localhost", "ip6-loopback", "ip6-localnet", "ip6-mcastprefix",
+                     "ip6-allnodes", "ip6-allrouters", "ip6-allhosts", "0.0.0.0"}
+
+# IPv4 or IPv6 address (hosts-file first column); names never contain ":"
+_ADDRESS = re.compile(r"^(?:\d{1,3}(?:\.\d{1,3}){3}|[0-9a-f.]*:[0-9a-f:.]*)$", re.IGNORECASE)
+
+# Lists up to this size are matched by a URL regex in the browser driver (see route_pattern())
+REGEX_MAX_DOMAINS = 2000
+
+
+def normalize_domain(entry: str) -> str:
+    """Lower-case a list entry and strip wildcard/dot prefixes and a trailing dot."""
+    entry = entry.strip().lower()
+    if entry.startswith("*."):
+        entry = entry[2:]
+    return entry.strip(".")
+
+
+def _is_ip(value: str) -> bool:
+    return _ADDRESS.match(value) is not None
+
+
+def parse_domains(lines) -> set[str]:
+    """Domains listed in plain or hosts-format lines."""
+    domains = set()
+    for line in lines:
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        fields = line.split()
+        if len(fields) > 1 and _is_ip(fields[0]):
+            fields = fields[1:]  # hosts format: address followed by one or more names
+        for field in fields:
+            domain = normalize_domain(field)
+            if domain and domain not in _HOSTS_FILE_NAMES and not _is_ip(domain):
+                domains.add(domain)
+    return domains
+
+
+def url_pattern(domains) -> re.Pattern | None:
+    """
+    Compile a regex matching URLs on any of the domains or their subdomains.
+
+    The pattern only uses syntax JavaScript understands too, so Playwright can
+    match it in the browser driver: requests that don't match never reach Python.
+    Returns None for an empty list.
+    """
+    domains = sorted({normalize_domain(d) for d in domains} - {""}, key=lambda d: (-len(d), d))
+    if not domains:
+        return None
+    hosts = "|".join(re.escape(domain) for domain in domains)
+    return re.compile(
+        rf"^[a-z][a-z0-9+.\-]*://(?:[^/?#@]*@)?(?:[^/?#@:]+\.)?(?:{hosts})\.?(?::\d+)?(?:[/?#]|$)",
+        re.IGNORECASE,
+    )
+
+
+def hostname_of(url_or_host: str) -> str:
+    if "/" in url_or_host or ":" in url_or_host:
+        return (urlsplit(url_or_host).hostname or "").rstrip(".")
+    return url_or_host.lower().rstrip(".")
+
+
+class DomainBlocklist:
+    """Blocked and allowed domains (subdomains included), from lists and files."""
+
+    def __init__(self, blocked=(), allowed=(), blocked_files=(), allowed_files=(),
+                 reload_interval: float = 5.0, cache_size: int = 65536):
+        self._static = (set(map(normalize_domain, blocked)) - {""}, set(map(normalize_domain, allowed)) - {""})
+        self.blocked_files = list(blocked_files)
+        self.allowed_files = list(allowed_files)
+        self.reload_interval = reload_interval
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._mtimes = {}
+        self._next_check = 0.0
+        self._cache = {}  # hostname -> bool
+        self.version = 0  # bumped on every (re)load
+        self._blocked, self._allowed = self._static
+        self.reload(force=True)
+
+    @classmethod
+    def from_env(cls, blocked=(), prefix: str = "BLOCKLIST"):
+        """
+        Built-in domains plus the files named in the environment:
+        `{prefix}_FILES` and `{prefix}_ALLOW_FILES` (os.pathsep-separated), and
+        `{prefix}_ALLOW` (comma-separated domains).
+        """
+        def paths(name):
+            return [p for p in os.getenv(name, "").split(os.pathsep) if p.strip()]
+
+        return cls(
+            blocked=blocked,
+            allowed=[d for d in os.getenv(f"{prefix}_ALLOW", "").split(",") if d.strip()],
+            blocked_files=paths(f"{prefix}_FILES"),
+            allowed_files=paths(f"{prefix}_ALLOW_FILES"),
+            reload_interval=float(os.getenv(f"{prefix}_RELOAD_SECONDS", "5")),
+        )
+
+    def __len__(self):
+        return len(self._blocked)
+
+    # --- Loading ---
+    def _stat_files(self):
+        mtimes = {}
+        for path in self.blocked_files + self.allowed_files:
+            try:
+                mtimes[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                mtimes[path] = None
+        return mtimes
+
+    def reload(self, force: bool = False) -> bool:
+        """Re-read the files if any changed (or always with `force`); returns True if reloaded."""
+        with self._lock:
+            self._next_check = time.monotonic() + self.reload_interval
+            mtimes = self._stat_files()
+            if not force and mtimes == self._mtimes:
+                return False
+            blocked, allowed = set(self._static[0]), set(self._static[1])
+            for paths, target in ((self.blocked_files, blocked), (self.allowed_files, allowed)):
+                for path in paths:
+                    if mtimes[path] is None:
+                        print(f"Blocklist file not found: {path}")
+                        continue
+                    with open(path, "r", encoding="utf-8", errors="replace") as f:
+                        target.update(parse_domains(f))
+            # Swap in whole sets so concurrent lookups see either the old or the new lists
+            self._blocked, self._allowed = blocked, allowed
+            self._cache = {}
+            self._mtimes = mtimes
+            self.version += 1
+            return True
+
+    def _maybe_reload(self):
+        if (self.blocked_files or self.allowed_files) and time.monotonic() >= self._next_check:
+            self.reload()
+
+    # --- Lookups ---
+    def _decide(self, hostname: str) -> bool:
+        blocked, allowed = self._blocked, self._allowed
+        suffix = hostname
+        while True:
+            if suffix in allowed:
+                return False
+            if suffix in blocked:
+                return True
+            dot = suffix.find(".")
+            if dot < 0:
+                return False
+            suffix = suffix[dot + 1:]
+
+    def is_blocked(self, url_or_host: str) -> bool:
+        """Whether a URL's (or bare hostname's) domain is blocked."""
+        self._maybe_reload()
+        hostname = hostname_of(url_or_host)
+        if not hostname:
+            return False
+        cache = self._cache
+        decision = cache.get(hostname)
+        if decision is None:
+            decision = self._decide(hostname)
+            if len(cache) >= self.cache_size:
+                cache.clear()
+            cache[hostname] = decision
+        return decision
+
+    def check(self, url: str) -> None:
+        """Raise ValueError if the URL's domain is blocked."""
+        if self.is_blocked(url):
+            raise ValueError(f"Blocked URL: {url}")
+
+    def route_pattern(self):
+        """
+        URL pattern for a browser route that sees every request that may be blocked.
+
+        A regex of the blocked domains when the list is small and not backed by
+        files, so allowed traffic never reaches Python; otherwise "**/*" (a huge
+        regex is slow to match, and a hot-reloaded list can grow domains the
+        regex would not know about). Either way the route handler should decide
+        with is_blocked(). None when nothing can be blocked.
+        """
+        if self.blocked_files or len(self._blocked) > REGEX_MAX_DOMAINS:
+            return "**/*"
+        return url_pattern(self._blocked)
@@ -3,6 +3,8 @@ from agent.agent import Agent
 from computers.config import *
 from computers.default import *
 from computers import computers_config
+from computers.shared.base_playwright import TYPE_MODES
+from computers.shared.resource_profiles import RESOURCE_PROFILES, parse_overrides
 
 
 def acknowledge_safety_check_callback(message: str) -> bool:
@@ -44,17 +46,84 @@ def main():
         help="Start the browsing session with a specific URL (only for browser environments).",
         default="https://bing.com",
     )
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="Run the local browser without a window, with low-memory Chromium flags (local-playwright only).",
+    )
+    parser.add_argument(
+        "--cdp-url",
+        type=str,
+        help="DevTools endpoint of a running Chromium for the local-cdp computer (default: $CDP_URL or localhost:9222).",
+        default=None,
+    )
+    parser.add_argument(
+        "--har",
+        type=str,
+        help="HAR file to record network traffic to, or replay it from (browser environments).",
+        default=None,
+    )
+    parser.add_argument(
+        "--har-mode",
+        choices=["record", "replay"],
+        help="Record a new HAR or serve requests from an existing one.",
+        default="replay",
+    )
+    parser.add_argument(
+        "--har-unmatched",
+        choices=["abort", "network"],
+        help="During replay, abort requests missing from the HAR or send them to the network.",
+        default="abort",
+    )
+    parser.add_argument(
+        "--resource-profile",
+        choices=list(RESOURCE_PROFILES),
+        help="Sub-resources to load: everything, no images/media/fonts/analytics, or no styling either.",
+        default="full",
+    )
+    parser.add_argument(
+        "--resource-override",
+        type=str,
+        help='Per-domain profiles, e.g. "www.saucedemo.com=full,cdn.example.com=text-only".',
+        default="",
+    )
+    parser.add_argument(
+        "--type-mode",
+        choices=TYPE_MODES,
+        help="Text entry: per-key events, whole strings at once, or insert long strings into fields without key listeners.",
+        default="auto",
+    )
+    parser.add_argument(
+        "--pipelined",
+        action="store_true",
+        help="Encode the conversation for the next model request while actions and screenshots run.",
+    )
     args = parser.parse_args()
     ComputerClass = computers_config[args.computer]
 
-    with ComputerClass() as computer:
+    if args.headless and args.computer == "local-playwright":
+        computer = ComputerClass(headless=True)
+    elif args.computer == "local-cdp":
+        computer = ComputerClass(cdp_url=args.cdp_url)
+    else:
+        if args.headless:
+            print(f"--headless has no effect on the {args.computer} computer")
+        computer = ComputerClass()
+    if args.har:
+        computer.use_har(args.har, mode=args.har_mode, unmatched=args.har_unmatched)
+    if args.resource_profile != "full" or args.resource_override:
+        computer.use_resource_profile(args.resource_profile, parse_overrides(args.resource_override))
+    computer.set_type_mode(args.type_mode)
+
+    with computer:
         agent = Agent(
             computer=computer,
             acknowledge_safety_check_callback=acknowledge_safety_check_callback,
+            pipelined=args.pipelined,
         )
         items = []
 
-        if args.computer in ["browserbase", "local-playwright"]:
+        if args.computer in ["browserbase", "local-playwright", "local-cdp"]:
             if not args.start_url.startswith("http"):
                 args.start_url = "https://" + args.start_url
             agent.computer.goto(args.start_url)
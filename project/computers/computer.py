@@ -26,4 +26,6 @@ class Computer(Protocol):
 
     def drag(self, path: List[Dict[str, int]]) -> None: ...
 
+    def execute_batch(self, actions: List[Dict]) -> None: ...
+
     def get_current_url() -> str: ...
@@ -4,5 +4,6 @@ from .contrib import *
 computers_config = {
     "local-playwright": LocalPlaywrightBrowser,
     "browserbase": BrowserbaseBrowser,
+    "local-cdp": LocalCDPBrowser,
 
 }
@@ -0,0 +1 @@
+from .local_cdp import LocalCDPBrowser
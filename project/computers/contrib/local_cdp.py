@@ -0,0 +1,72 @@
+import os
+from playwright.sync_api import Browser, BrowserContext, Page
+from ..default.local_playwright import LocalPlaywrightBrowser
+
+# Chromium started with --remote-debugging-port=9222
+DEFAULT_CDP_URL = "http://localhost:9222"
+
+
+class LocalCDPBrowser(LocalPlaywrightBrowser):
+    """
+    Attaches to an already-running Chromium over its DevTools endpoint instead of launching one.
+
+    Start the browser once, e.g. `chromium --remote-debugging-port=9222`, and every
+    session connects in milliseconds. Each session works in a context of its own
+    (or, with `reuse_context`, in a new tab of the browser's default context, with
+    its cookies and logins) and leaves the browser running when it is done.
+    Snapshots, HAR, blocklist and resource routing work as for LocalPlaywrightBrowser.
+    """
+
+    def __init__(self, cdp_url: str | None = None, reuse_context: bool = False, timeout_ms: int = 10000):
+        """
+        Args:
+            cdp_url: DevTools endpoint (http://host:port or ws://...). Defaults to
+                the CDP_URL environment variable, then DEFAULT_CDP_URL.
+            reuse_context: Work in the browser's default context instead of a new,
+                isolated one. Tabs the user opens there become visible to the agent.
+            timeout_ms: How long to wait for the connection.
+        """
+        # Nothing is launched, so none of the launch settings (headless, low-memory
+        # flags, heap cap) apply; the running browser keeps the ones it was started with
+        super().__init__(low_memory=False, js_heap_mb=0)
+        self.cdp_url = cdp_url or os.getenv("CDP_URL", DEFAULT_CDP_URL)
+        self.reuse_context = reuse_context
+        self.timeout_ms = timeout_ms
+        self._shared_context: BrowserContext | None = None
+        self._own_pages: list[Page] = []
+
+    def _get_browser_and_page(self) -> tuple[Browser, Page]:
+        browser = self._playwright.chromium.connect_over_cdp(self.cdp_url, timeout=self.timeout_ms)
+        self._browser = browser
+        if self.reuse_context and browser.contexts:
+            self._shared_context = browser.contexts[0]
+            return browser, self._open_page(self._shared_context)
+        return browser, self._new_context()
+
+    def _open_page(self, context: BrowserContext) -> Page:
+        page = super()._open_page(context)
+        self._own_pages.append(page)
+        return page
+
+    def _release_context(self, context: BrowserContext) -> None:
+        if context is self._shared_context:
+            # Not ours to close; only close the tabs this session opened
+            for page in self._own_pages:
+                if page.context is context and not page.is_closed():
+                    page.close()
+        else:
+            context.close()
+        self._own_pages = [page for page in self._own_pages if page.context is not context]
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Close what this session opened and disconnect; the browser keeps running."""
+        self.stop_screencast()
+        self._close_har_contexts()
+        try:
+            if self._context is not None:
+                self._release_context(self._context)
+        except Exception as e:
+            print(f"Error closing CDP session context: {e}")
+        self._context = self._page = None
+        if self._playwright:
+            self._playwright.stop()  # disconnects without closing the browser
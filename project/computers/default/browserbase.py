@@ -1,7 +1,9 @@
 import os
 from typing import Tuple, Dict, List, Union, Optional
-from playwright.sync_api import Browser, Page, BrowserContext, Error as PlaywrightError
+from urllib.parse import urlsplit
+from playwright.sync_api import Browser, Page, BrowserContext
 from ..shared.base_playwright import BasePlaywrightComputer
+from .browserbase_pool import BrowserbaseSessionPool, shared_pool
 from browserbase import Browserbase
 from dotenv import load_dotenv
 import base64
@@ -16,6 +18,11 @@ class BrowserbaseBrowser(BasePlaywrightComputer):
 
     IMPORTANT: This Browserbase computer requires the use of the `goto` tool defined in playwright_with_custom_functions.py.
     Make sure to include this tool in your configuration when using the Browserbase computer.
+
+    With a session pool (passed in, or enabled with BROWSERBASE_POOL_SIZE; see
+    browserbase_pool.py) the computer borrows a pre-created keep-alive session
+    instead of creating one, and on exit clears its cookies, storage and extra
+    tabs and hands it back for the next task.
     """
 
     def get_dimensions(self):
@@ -29,6 +36,8 @@ class BrowserbaseBrowser(BasePlaywrightComputer):
         proxy: bool = False,
         virtual_mouse: bool = True,
         ad_blocker: bool = False,
+        pool: Optional[BrowserbaseSessionPool] = None,
+        start_url: Optional[str] = None,
     ):
         """
         Initialize the Browserbase instance. Additional configuration options for features such as persistent cookies, ad blockers, file downloads and more can be found in the Browserbase API documentation: https://docs.browserbase.com/reference/api/create-a-session
@@ -40,6 +49,9 @@ class BrowserbaseBrowser(BasePlaywrightComputer):
             proxy (bool): Whether to use a proxy for the session. Default is False. Turn on proxies if you're browsing is frequently interrupted. https://docs.browserbase.com/features/proxies
             virtual_mouse (bool): Whether to enable the virtual mouse cursor. Default is True.
             ad_blocker (bool): Whether to enable the built-in ad blocker. Default is False.
+            pool (BrowserbaseSessionPool): Pool to borrow sessions from. Default is the shared
+                pool for these settings, which exists only if BROWSERBASE_POOL_SIZE is set.
+            start_url (str): Page to open once connected. Default is None (stay on the current page).
         """
         super().__init__()
         self.bb = Browserbase(api_key=os.getenv("BROWSERBASE_API_KEY"))
@@ -50,17 +62,14 @@ class BrowserbaseBrowser(BasePlaywrightComputer):
         self.proxy = proxy
         self.virtual_mouse = virtual_mouse
         self.ad_blocker = ad_blocker
+        self.start_url = start_url
+        self.pool = pool if pool is not None else shared_pool(self.bb, self._session_params())
+        self._pooled_session = None
+        self._origins = set()  # origins requested while on a pooled session, cleared on release
 
-    def _get_browser_and_page(self) -> Tuple[Browser, Page]:
-        """
-        Create a Browserbase session and connect to it.
-
-        Returns:
-            Tuple[Browser, Page]: A tuple containing the connected browser and page objects.
-        """
-        # Create a session on Browserbase with specified parameters
+    def _session_params(self) -> Dict:
         width, height = self.dimensions
-        session_params = {
+        return {
             "project_id": self.project_id,
             "browser_settings": {
                 "viewport": {"width": width, "height": height},
@@ -69,7 +78,18 @@ class BrowserbaseBrowser(BasePlaywrightComputer):
             "region": self.region,
             "proxies": self.proxy,
         }
-        self.session = self.bb.sessions.create(**session_params)
+
+    def _get_browser_and_page(self) -> Tuple[Browser, Page]:
+        """
+        Create (or borrow from the pool) a Browserbase session and connect to it.
+
+        Returns:
+            Tuple[Browser, Page]: A tuple containing the connected browser and page objects.
+        """
+        if self.pool is not None:
+            self.session = self._pooled_session = self.pool.acquire()
+        else:
+            self.session = self.bb.sessions.create(**self._session_params())
 
         # Print the live session URL
         print(
@@ -77,9 +97,15 @@ class BrowserbaseBrowser(BasePlaywrightComputer):
         )
 
         # Connect to the remote session
-        browser = self._playwright.chromium.connect_over_cdp(
-            self.session.connect_url, timeout=60000
-        )
+        try:
+            browser = self._playwright.chromium.connect_over_cdp(
+                self.session.connect_url, timeout=60000
+            )
+        except Exception:
+            if self._pooled_session is not None:
+                self.pool.release(self._pooled_session, reusable=False)
+                self._pooled_session = None
+            raise
         context = browser.contexts[0]
 
         # Add event listeners for page creation and closure
@@ -135,10 +161,54 @@ class BrowserbaseBrowser(BasePlaywrightComputer):
         page = context.pages[0]
         page.on("close", self._handle_page_close)
 
-        page.goto("https://bing.com")
+        if self.start_url:
+            page.goto(self.start_url)
 
         return browser, page
 
+    def _setup_context(self, context: BrowserContext) -> None:
+        super()._setup_context(context)
+        if self._pooled_session is not None:
+            context.on("request", self._record_origin)
+
+    def _record_origin(self, request) -> None:
+        parts = urlsplit(request.url)
+        if parts.scheme in ("http", "https"):
+            self._origins.add(f"{parts.scheme}://{parts.netloc}")
+
+    def _clear_session_state(self) -> None:
+        """
+        Leave the pooled session as a fresh one: one blank tab, no cookies, and no
+        storage (local/session storage, IndexedDB, service workers, cache storage)
+        for any origin this task requested. The HTTP cache is kept on purpose.
+        """
+        context = self._browser.contexts[0]
+        pages = context.pages
+        for page in pages[1:]:
+            page.close()
+        if pages:
+            pages[0].goto("about:blank")
+        context.clear_cookies()
+        cdp = self._browser.new_browser_cdp_session()
+        try:
+            for origin in sorted(self._origins):
+                cdp.send("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+        finally:
+            cdp.detach()
+        self._origins.clear()
+
+    def _return_pooled_session(self) -> None:
+        session, self._pooled_session = self._pooled_session, None
+        reusable = self._browser is not None
+        if reusable:
+            try:
+                self._clear_session_state()
+            except Exception as e:
+                print(f"Could not clear pooled session {session.id}, replacing it: {e}")
+                reusable = False
+        self.pool.release(session, reusable=reusable)
+        print(f"Browserbase pool: {self.pool.metrics()}")
+
     def _handle_new_page(self, page: Page):
         """Handle the creation of a new page."""
         print("New page created")
@@ -164,37 +234,21 @@ class BrowserbaseBrowser(BasePlaywrightComputer):
             exc_val: The exception instance that caused the context to be exited.
             exc_tb: A traceback object encapsulating the call stack at the point where the exception occurred.
         """
-        if self._page:
-            self._page.close()
-        if self._browser:
-            self._browser.close()
-        if self._playwright:
-            self._playwright.stop()
+        if self._pooled_session is not None:
+            self.stop_screencast()
+            self._close_har_contexts()
+            self._return_pooled_session()
+            if self._playwright:
+                self._playwright.stop()  # disconnects; the keep-alive session stays up
+        else:
+            if self._page:
+                self._page.close()
+            if self._browser:
+                self._browser.close()
+            if self._playwright:
+                self._playwright.stop()
 
         if self.session:
             print(
                 f"Session completed. View replay at https://browserbase.com/sessions/{self.session.id}"
             )
-
-    def screenshot(self) -> str:
-        """
-        Capture a screenshot of the current viewport using CDP.
-
-        Returns:
-            str: A base64 encoded string of the screenshot.
-        """
-        try:
-            # Get CDP session from the page
-            cdp_session = self._page.context.new_cdp_session(self._page)
-
-            # Capture screenshot using CDP
-            result = cdp_session.send(
-                "Page.captureScreenshot", {"format": "png", "fromSurface": True}
-            )
-
-            return result["data"]
-        except PlaywrightError as error:
-            print(
-                f"CDP screenshot failed, falling back to standard screenshot: {error}"
-            )
-            return super().screenshot()
@@ -0,0 +1,324 @@
+"""
+Browserbase Session Pool
+Pre-created, keep-alive Browserbase sessions shared by successive computers.
+
+Creating a remote session and attaching to it takes seconds per task. The pool
+creates `size` sessions up front with keep_alive, so they survive a CDP
+disconnect; a computer borrows one (acquire()), connects over CDP and gives it
+back when done (release()). The computer clears cookies, storage and extra
+tabs before handing a session back; one that could not be cleaned, is too old
+or has served `max_uses` tasks is released on Browserbase instead and replaced.
+
+A background thread pings idle sessions every `keepalive_interval` seconds
+and replaces the ones that are no longer running. Session creation, pings and
+release are injectable callables, so the pool can be driven by a local stand-in.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+
+@dataclass
+class PooledSession:
+    id: str
+    connect_url: str
+    created_at: float = field(default_factory=time.monotonic)
+    last_ping: float = field(default_factory=time.monotonic)
+    uses: int = 0
+
+
+class BrowserbaseSessionPool:
+    """A pool of reusable remote browser sessions."""
+
+    def __init__(
+        self,
+        create_session: Callable[[], PooledSession],
+        release_session: Callable[[PooledSession], None] = lambda session: None,
+        ping_session: Callable[[PooledSession], bool] | None = None,
+        size: int = 2,
+        max_uses: int = 20,
+        max_age: float = 3000.0,
+        keepalive_interval: float = 60.0,
+        acquire_timeout: float = 120.0,
+    ):
+        """
+        Args:
+            create_session: Creates a remote session and returns it as a PooledSession.
+            release_session: Ends a session on the remote side.
+            ping_session: Returns whether a session is still usable; None skips pings.
+            size: Number of sessions to keep, idle or borrowed. When all are
+                borrowed, acquire() creates extra ones, which are not kept.
+            max_uses: Tasks a session serves before it is replaced.
+            max_age: Seconds after creation a session is replaced; keep it below
+                the session timeout.
+            keepalive_interval: Seconds between pings of idle sessions.
+            acquire_timeout: How long acquire() waits for a session being created.
+        """
+        self._create_session = create_session
+        self._release_session = release_session
+        self._ping_session = ping_session
+        self.size = size
+        self.max_uses = max_uses
+        self.max_age = max_age
+        self.keepalive_interval = keepalive_interval
+        self.acquire_timeout = acquire_timeout
+        self._condition = threading.Condition()
+        self._idle: list[PooledSession] = []
+        self._in_use: dict[str, PooledSession] = {}
+        self._creating = 0  # creations in flight meant for the idle list
+        self._waiters = 0
+        self._stop = threading.Event()
+        self._keepalive_thread = None
+        self.closed = False
+        self.stats = {
+            "created": 0,
+            "create_failures": 0,
+            "acquired": 0,
+            "hits": 0,  # acquires served by an idle session
+            "misses": 0,  # acquires that had to create one
+            "reused": 0,  # acquires of a session that already served a task
+            "retired": 0,
+            "keepalive_pings": 0,
+            "keepalive_failures": 0,
+        }
+        self._wait_total_ms = 0.0
+        self._wait_max_ms = 0.0
+        self._create_total_ms = 0.0
+
+    @classmethod
+    def for_browserbase(cls, client, session_params: dict, **settings):
+        """A pool creating sessions with `client.sessions.create(**session_params, keep_alive=True)`."""
+        project_id = session_params["project_id"]
+
+        def create():
+            session = client.sessions.create(**session_params, keep_alive=True)
+            print(f"Pooled Browserbase session https://www.browserbase.com/sessions/{session.id}")
+            return PooledSession(session.id, session.connect_url)
+
+        def ping(session):
+            return client.sessions.retrieve(session.id).status == "RUNNING"
+
+        def release(session):
+            client.sessions.update(session.id, project_id=project_id, status="REQUEST_RELEASE")
+
+        return cls(create, release, ping, **settings)
+
+    # --- Lifecycle ---
+    def start(self):
+        """Start filling the pool and pinging idle sessions in the background."""
+        self._fill()
+        if self._ping_session is not None and self._keepalive_thread is None:
+            self._keepalive_thread = threading.Thread(target=self._keepalive_loop, daemon=True)
+            self._keepalive_thread.start()
+        return self
+
+    def close(self):
+        """Stop the background work and release every session, idle or not."""
+        self._stop.set()
+        with self._condition:
+            self.closed = True
+            sessions = self._idle + list(self._in_use.values())
+            self._idle, self._in_use = [], {}
+            self._condition.notify_all()
+        for session in sessions:
+            self._terminate(session)
+
+    # --- Borrowing ---
+    def acquire(self) -> PooledSession:
+        """An idle session if there is one, else one being created, else a new one."""
+        started = time.monotonic()
+        with self._condition:
+            if self.closed:
+                raise RuntimeError("Browserbase session pool is closed")
+            self._waiters += 1
+            try:
+                # Wait for a session only if a creation in flight can serve this caller
+                self._condition.wait_for(
+                    lambda: self._idle or self.closed or self._creating < self._waiters,
+                    self.acquire_timeout,
+                )
+                if self.closed:
+                    raise RuntimeError("Browserbase session pool is closed")
+                session = self._idle.pop(0) if self._idle else None
+            finally:
+                self._waiters -= 1
+        hit = session is not None
+        if not hit:
+            session = self._create()
+        waited_ms = (time.monotonic() - started) * 1000
+        with self._condition:
+            self.stats["hits" if hit else "misses"] += 1
+            if session.uses:
+                self.stats["reused"] += 1
+            session.uses += 1
+            self._in_use[session.id] = session
+            self.stats["acquired"] += 1
+            self._wait_total_ms += waited_ms
+            self._wait_max_ms = max(self._wait_max_ms, waited_ms)
+        self._fill()
+        return session
+
+    def release(self, session: PooledSession, reusable: bool = True) -> None:
+        """Give a session back; it is ended instead if it is not reusable or worn out."""
+        with self._condition:
+            if self.closed:
+                return  # close() already released it
+            self._in_use.pop(session.id, None)
+            keep = reusable and len(self._idle) + len(self._in_use) < self.size and not self._worn_out(session)
+            if keep:
+                session.last_ping = time.monotonic()
+                self._idle.append(session)
+                self._condition.notify_all()
+        if not keep:
+            self._retire(session)
+
+    def metrics(self) -> dict:
+        with self._condition:
+            acquired = self.stats["acquired"]
+            return {
+                **self.stats,
+                "size": self.size,
+                "idle": len(self._idle),
+                "in_use": len(self._in_use),
+                "creating": self._creating,
+                "hit_rate": round(self.stats["hits"] / acquired, 3) if acquired else None,
+                "acquire_wait_avg_ms": round(self._wait_total_ms / acquired, 1) if acquired else None,
+                "acquire_wait_max_ms": round(self._wait_max_ms, 1),
+                "create_avg_ms": (round(self._create_total_ms / self.stats["created"], 1)
+                                  if self.stats["created"] else None),
+            }
+
+    # --- Internals ---
+    def _worn_out(self, session: PooledSession) -> bool:
+        return session.uses >= self.max_uses or time.monotonic() - session.created_at >= self.max_age
+
+    def _create(self) -> PooledSession:
+        started = time.monotonic()
+        try:
+            session = self._create_session()
+        except Exception:
+            with self._condition:
+                self.stats["create_failures"] += 1
+            raise
+        with self._condition:
+            self.stats["created"] += 1
+            self._create_total_ms += (time.monotonic() - started) * 1000
+        return session
+
+    def _fill(self):
+        """Create sessions in the background until idle, borrowed and in-flight ones reach `size`."""
+        with self._condition:
+            missing = 0 if self.closed else self.size - len(self._idle) - len(self._in_use) - self._creating
+            self._creating += max(missing, 0)
+        for _ in range(missing):
+            threading.Thread(target=self._fill_one, daemon=True).start()
+
+    def _fill_one(self):
+        session = None
+        try:
+            session = self._create()
+        except Exception as e:
+            print(f"Error creating pooled Browserbase session: {e}")
+        with self._condition:
+            self._creating -= 1
+            if session is not None and not self.closed:
+                self._idle.append(session)
+                session = None
+            self._condition.notify_all()
+        if session is not None:  # the pool closed meanwhile
+            self._terminate(session)
+
+    def _retire(self, session: PooledSession):
+        with self._condition:
+            self.stats["retired"] += 1
+        threading.Thread(target=self._terminate, args=(session,), daemon=True).start()
+        self._fill()
+
+    def _terminate(self, session: PooledSession):
+        try:
+            self._release_session(session)
+        except Exception as e:
+            print(f"Error releasing Browserbase session {session.id}: {e}")
+
+    def ping_idle(self):
+        """Ping idle sessions due for it; replace the dead and the worn out."""
+        now = time.monotonic()
+        with self._condition:
+            due = [s for s in self._idle if now - s.last_ping >= self.keepalive_interval or self._worn_out(s)]
+            # Taken out of the idle list while being pinged, so nobody borrows them meanwhile
+            self._idle = [s for s in self._idle if s not in due]
+        healthy, retired = [], []
+        for session in due:
+            if self._worn_out(session):
+                retired.append(session)
+                continue
+            try:
+                alive = self._ping_session(session)
+            except Exception:
+                alive = False
+            with self._condition:
+                self.stats["keepalive_pings"] += 1
+                if not alive:
+                    self.stats["keepalive_failures"] += 1
+            if alive:
+                session.last_ping = time.monotonic()
+                healthy.append(session)
+            else:
+                retired.append(session)
+        with self._condition:
+            closed = self.closed
+            if not closed:
+                self._idle.extend(healthy)
+                self._condition.notify_all()
+        if closed:
+            for session in healthy:
+                self._terminate(session)
+        # Only now, with the healthy ones back, do the replacements add up
+        for session in retired:
+            self._retire(session)
+
+    def _keepalive_loop(self):
+        while not self._stop.wait(min(self.keepalive_interval, 5.0)):
+            try:
+                self.ping_idle()
+            except Exception as e:
+                print(f"Error in Browserbase pool keep-alive: {e}")
+
+
+_shared_pools: dict[str, BrowserbaseSessionPool] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_pool(client, session_params: dict) -> BrowserbaseSessionPool | None:
+    """
+    The process-wide pool for sessions created with `session_params`, or None
+    unless BROWSERBASE_POOL_SIZE is set. Settings come from the environment:
+    BROWSERBASE_POOL_SIZE, BROWSERBASE_POOL_MAX_USES,
+    BROWSERBASE_POOL_MAX_AGE_SECONDS and BROWSERBASE_POOL_KEEPALIVE_SECONDS.
+    Pooled sessions are created with a BROWSERBASE_POOL_SESSION_TIMEOUT
+    (seconds, default 3600) and released when the process exits.
+    """
+    size = int(os.getenv("BROWSERBASE_POOL_SIZE", "0"))
+    if size <= 0:
+        return None
+    session_params = {**session_params, "api_timeout": int(os.getenv("BROWSERBASE_POOL_SESSION_TIMEOUT", "3600"))}
+    key = json.dumps(session_params, sort_keys=True, default=str)
+    with _shared_lock:
+        pool = _shared_pools.get(key)
+        if pool is None:
+            pool = BrowserbaseSessionPool.for_browserbase(
+                client,
+                session_params,
+                size=size,
+                max_uses=int(os.getenv("BROWSERBASE_POOL_MAX_USES", "20")),
+                max_age=float(os.getenv("BROWSERBASE_POOL_MAX_AGE_SECONDS", "3000")),
+                keepalive_interval=float(os.getenv("BROWSERBASE_POOL_KEEPALIVE_SECONDS", "60")),
+            ).start()
+            atexit.register(pool.close)
+            _shared_pools[key] = pool
+        return pool
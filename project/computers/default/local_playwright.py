@@ -1,15 +1,51 @@
-from playwright.sync_api import Browser, Page
+import os
+from playwright.sync_api import Browser, BrowserContext, Page
 from ..shared.base_playwright import BasePlaywrightComputer
 
+# Chromium flags trading background features and caches for a smaller footprint,
+# so more browsers fit on one host
+LOW_MEMORY_ARGS = [
+    "--disable-dev-shm-usage",  # /dev/shm is tiny in containers; use /tmp instead
+    "--disable-gpu",
+    "--renderer-process-limit=2",
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--disable-component-update",
+    "--disable-sync",
+    "--disable-breakpad",
+    "--metrics-recording-only",
+    "--mute-audio",
+    "--disk-cache-size=33554432",
+    "--disable-features=Translate,BackForwardCache,MediaRouter,OptimizationHints,AcceptCHFrame",
+]
+
+# V8 heap cap per renderer in low-memory mode (MB)
+DEFAULT_JS_HEAP_MB = 384
+
 
 class LocalPlaywrightBrowser(BasePlaywrightComputer):
     """Launches a local Chromium instance using Playwright."""
 
-    def __init__(self, headless: bool = False):
+    def __init__(self, headless: bool = False, low_memory: bool | None = None, js_heap_mb: int | None = None):
+        """
+        Args:
+            headless: Run without a window; no X server / DISPLAY needed.
+            low_memory: Add LOW_MEMORY_ARGS. Defaults to `headless`, the server deployment mode.
+            js_heap_mb: Cap the JavaScript heap of each renderer. Defaults to
+                DEFAULT_JS_HEAP_MB in low-memory mode, otherwise no cap; 0 disables.
+        """
         super().__init__()
         self.headless = headless
+        self.low_memory = headless if low_memory is None else low_memory
+        if js_heap_mb is None:
+            js_heap_mb = DEFAULT_JS_HEAP_MB if self.low_memory else 0
+        self.js_heap_mb = js_heap_mb
+        self._context: BrowserContext | None = None
+        # name -> {"storage_state": cookies + localStorage, "url": page URL when saved}
+        self.state_snapshots: dict[str, dict] = {}
 
-    def _get_browser_and_page(self) -> tuple[Browser, Page]:
+    def launch_options(self) -> dict:
+        """Keyword arguments for `chromium.launch()`."""
         width, height = self.get_dimensions()
         launch_args = [
             f"--window-size={width},{height}",
@@ -21,14 +57,34 @@ class LocalPlaywrightBrowser(BasePlaywrightComputer):
             "--no-sandbox",
             "--disable-setuid-sandbox"
         ]
-        browser = self._playwright.chromium.launch(
-            chromium_sandbox=True,
-            headless=self.headless,
-            args=launch_args,
-            env={"DISPLAY": ":0"},
-        )
+        if self.low_memory:
+            launch_args += LOW_MEMORY_ARGS
+        if self.js_heap_mb:
+            launch_args.append(f"--js-flags=--max-old-space-size={self.js_heap_mb}")
+        options = {
+            "chromium_sandbox": True,
+            "headless": self.headless,
+            "args": launch_args,
+        }
+        if not self.headless:
+            # A headed browser needs an X display; headless ones must not depend on one
+            options["env"] = {**os.environ, "DISPLAY": os.environ.get("DISPLAY", ":0")}
+        return options
 
-        context = browser.new_context()
+    def _get_browser_and_page(self) -> tuple[Browser, Page]:
+        browser = self._playwright.chromium.launch(**self.launch_options())
+        self._browser = browser
+
+        return browser, self._new_context()
+
+    def _new_context(self, storage_state: dict | None = None) -> Page:
+        """Open a new browser context (optionally pre-loaded with a storage state) and return its page."""
+        return self._open_page(self._browser.new_context(storage_state=storage_state))
+
+    def _open_page(self, context: BrowserContext) -> Page:
+        """Make `context` the current context and open the page the agent works in."""
+        width, height = self.get_dimensions()
+        self._context = context
 
         # Add event listeners for page creation and closure
         context.on("page", self._handle_new_page)
@@ -37,12 +93,46 @@ class LocalPlaywrightBrowser(BasePlaywrightComputer):
         page.set_viewport_size({"width": width, "height": height})
         page.on("close", self._handle_page_close)
 
-        return browser, page
+        return page
+
+    # --- Storage state snapshots ---
+    def save_state(self, name: str) -> dict:
+        """Snapshot the cookies and localStorage of the current context under `name`."""
+        snapshot = {"storage_state": self._context.storage_state(), "url": self.get_current_url()}
+        self.state_snapshots[name] = snapshot
+        return snapshot
+
+    def has_state(self, name: str) -> bool:
+        return name in self.state_snapshots
+
+    def restore_state(self, name: str | None = None, url: str | None = None) -> None:
+        """
+        Replace the current context with a fresh one, restored from snapshot `name`.
+
+        With no name the new context starts empty. Navigates to `url`, or to the
+        page the snapshot was taken on.
+        """
+        snapshot = self.state_snapshots[name] if name else {}
+        old_context = self._context
+        self._page = self._new_context(snapshot.get("storage_state"))
+        self._install_page_hooks(self._page)
+        if old_context:
+            self._release_context(old_context)
+            self._pending_requests.clear()  # requests of the closed context never finish
+        url = url or snapshot.get("url")
+        if url:
+            self.goto(url)
+
+    def _release_context(self, context: BrowserContext) -> None:
+        """Dispose of a context that restore_state() replaced."""
+        context.close()
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Override to prevent automatic browser closure."""
         if self._browser and exc_type is None:
-            # Only close if there was an error
+            # Only close if there was an error, but always finish HAR recordings and the screencast
+            self.stop_screencast()
+            self._close_har_contexts()
             return
         super().__exit__(exc_type, exc_val, exc_tb)
 
@@ -56,8 +146,8 @@ class LocalPlaywrightBrowser(BasePlaywrightComputer):
         """Handle the closure of a page."""
         print("Page closed")
         if self._page == page:
-            if self._browser.contexts[0].pages:
-                self._page = self._browser.contexts[0].pages[-1]
+            if self._context is not None and self._context.pages:
+                self._page = self._context.pages[-1]
             else:
                 print("Warning: All pages have been closed.")
                 self._page = None
@@ -1,9 +1,13 @@
+import os
+import re
 import time
 import base64
+from collections import deque
 from typing import List, Dict, Literal
 from playwright.sync_api import sync_playwright, Browser, Page
-from utils import check_blocklisted_url
+from utils import BLOCKLIST
 from .computer_logger import log_action
+from .resource_profiles import ResourcePolicy
 
 # Optional: key mapping if your model uses "CUA" style keys
 CUA_KEY_TO_PLAYWRIGHT_KEY = {
@@ -34,6 +38,81 @@ CUA_KEY_TO_PLAYWRIGHT_KEY = {
     "win": "Meta",
 }
 
+# Finite CSS/Web animations still running, and whether the document finished loading
+PAGE_STATE_JS = """() => ({
+    ready: document.readyState === 'complete',
+    animations: document.getAnimations().filter(a => a.playState === 'running'
+        && a.effect && a.effect.getComputedTiming().iterations !== Infinity).length,
+})"""
+
+# Formats Page.captureScreenshot can return; Playwright's page.screenshot() only does png and jpeg
+SCREENSHOT_FORMATS = ("png", "jpeg", "webp")
+
+# How type() enters text: per-key events, one insertText, or insert where no key listener would miss it
+TYPE_MODES = ("keys", "insert", "auto")
+
+# The focused input, textarea or contenteditable element (through open shadow roots), else null
+FOCUSED_FIELD_JS = """(() => {
+    let el = document.activeElement;
+    while (el && el.shadowRoot && el.shadowRoot.activeElement) el = el.shadowRoot.activeElement;
+    if (!el || !(el.isContentEditable || el.tagName === 'TEXTAREA' || el.tagName === 'INPUT')) return null;
+    return el;
+})()"""
+
+# Events insertText does not fire; a field listening for them needs real key presses
+KEY_EVENTS = {"keydown", "keypress", "keyup"}
+
+# Actions execute_batch() runs; the caller takes one screenshot after the batch
+BATCH_ACTIONS = ("click", "double_click", "scroll", "type", "wait", "move", "keypress", "drag",
+                 "goto", "back", "forward")
+
+# How far (px) drag path points may stray from a straight line and still be sent as one move
+DRAG_TOLERANCE_PX = 1.0
+
+# Network modes for use_har(), and what replay does with requests the HAR has no entry for
+HAR_MODES = ("record", "replay")
+HAR_UNMATCHED_POLICIES = ("abort", "network")
+
+
+def drag_segments(path: List[Dict[str, int]], tolerance: float = DRAG_TOLERANCE_PX) -> list[tuple[int, int, int]]:
+    """
+    Moves (x, y, steps) retracing a drag path from its first point.
+
+    A run of points that lies on one straight line (within `tolerance` px)
+    becomes a single mouse.move with as many steps as it had points, which
+    Playwright interpolates in the driver: same number of mousemove events,
+    one round trip instead of one per point.
+    """
+    segments = []
+    start = 0
+    end = 1
+    while end < len(path):
+        # Grow the run while every point in between stays close to the start-end line
+        while end + 1 < len(path) and _on_line(path, start, end + 1, tolerance):
+            end += 1
+        segments.append((path[end]["x"], path[end]["y"], end - start))
+        start, end = end, end + 1
+    return segments
+
+
+def _on_line(path, start, end, tolerance) -> bool:
+    x0, y0 = path[start]["x"], path[start]["y"]
+    dx, dy = path[end]["x"] - x0, path[end]["y"] - y0
+    length = (dx * dx + dy * dy) ** 0.5
+    previous = 0.0
+    for point in path[start + 1:end]:
+        px, py = point["x"] - x0, point["y"] - y0
+        if length == 0:
+            if px or py:
+                return False
+            continue
+        along = (px * dx + py * dy) / length
+        # Off the line, or going backwards along it
+        if abs(px * dy - py * dx) / length > tolerance or along < previous or along > length:
+            return False
+        previous = along
+    return True
+
 
 class BasePlaywrightComputer:
     """
@@ -44,8 +123,42 @@ class BasePlaywrightComputer:
       - This base class handles context creation (`__enter__`/`__exit__`),
         plus standard "Computer" actions like click, scroll, etc.
       - We also have extra browser actions: `goto(url)` and `back()`.
+      - Screenshots wait for the page to settle (see `settle()`) instead of
+        relying on fixed sleeps, and are taken over one CDP session per page,
+        which returns base64 in the configured format directly (see
+        `set_screenshot_format()`); `page.screenshot()` is the fallback.
+      - A live screencast of the current page can be streamed to a viewer
+        channel (see `screencast`) without extra screenshots.
+      - Network traffic can be recorded to, or replayed from, a HAR file
+        (see `use_har()`).
+      - A resource profile (see `use_resource_profile()`) can skip images,
+        fonts, media and analytics for every context.
+      - `type()` inserts long strings in one call where no key listener
+        would notice the difference (see `set_type_mode()`).
+      - Several actions can run back to back with `execute_batch()`; drags and
+        key combos are sent in as few driver round trips as possible.
+      - Requests to blocklisted domains are aborted by a context-level route.
+        For small static lists its URL regex is matched in the browser driver,
+        so allowed traffic never round-trips into Python.
     """
 
+    # Upper bound on how long a screenshot waits for the page to settle (0 disables)
+    SETTLE_TIMEOUT_MS = 3000
+    # Delay between settle checks, and so between the frames being compared
+    SETTLE_POLL_MS = 100
+    # Requests older than this are treated as long-polling and do not block settling
+    SETTLE_LONG_REQUEST_MS = 1500
+
+    # Screenshot encoding (see SCREENSHOT_FORMATS); quality applies to jpeg/webp
+    SCREENSHOT_FORMAT = "png"
+    SCREENSHOT_QUALITY = 80
+    # Latest screenshot latencies kept for screenshot_stats()
+    SCREENSHOT_STATS_WINDOW = 500
+
+    # Text entry (see TYPE_MODES); in "auto" mode shorter strings are always typed key by key
+    TYPE_MODE = "auto"
+    TYPE_INSERT_MIN_CHARS = 32
+
     def get_environment(self):
         return "browser"
 
@@ -56,27 +169,163 @@ class BasePlaywrightComputer:
         self._playwright = None
         self._browser: Browser | None = None
         self._page: Page | None = None
+        self.settle_timeout_ms = self.SETTLE_TIMEOUT_MS
+        self._pending_requests = {}  # request -> monotonic start time
+        self.last_settle_ms = None
+        self.screenshot_format = self.SCREENSHOT_FORMAT
+        self.screenshot_quality = self.SCREENSHOT_QUALITY
+        self.last_screenshot_format = "png"  # format of the latest frame (the fallback may differ)
+        self.type_mode = self.TYPE_MODE
+        self.type_insert_min_chars = self.TYPE_INSERT_MIN_CHARS
+        self.screenshot_latencies = deque(maxlen=self.SCREENSHOT_STATS_WINDOW)  # (ms, "cdp"/"playwright")
+        self._cdp_sessions = {}  # page -> CDPSession
+        self._cdp_unavailable = False  # e.g. not a Chromium browser
+        # Viewer channel for the live screencast: wanted() -> bool, publish(jpeg_bytes),
+        # and max_fps / quality / max_width / max_height settings (see webui/screencast.py)
+        self.screencast = None
+        self._screencast_page = None
+        self._screencast_handler = None
+        self._screencast_last = 0.0
+        self.screencast_dropped = 0
+        self.har_mode = None
+        self.har_path = None
+        self.har_unmatched = "abort"
+        self.har_url_filter = None
+        self.har_unmatched_urls = []  # replay: requests that were not in the HAR
+        self._har_contexts = []  # record: contexts whose HAR is written on close
+        self.blocklist = BLOCKLIST
+        self.resource_policy = ResourcePolicy()
+        self.resource_blocked = {}  # resource type -> requests skipped by the resource profile
+        self.blocked_requests = 0
 
     def __enter__(self):
         # Start Playwright and call the subclass hook for getting browser/page
         self._playwright = sync_playwright().start()
         self._browser, self._page = self._get_browser_and_page()
+        self._install_page_hooks(self._page)
+        return self
 
-        # Set up network interception to flag URLs matching domains in BLOCKED_DOMAINS
-        def handle_route(route, request):
+    def _install_page_hooks(self, page: Page) -> None:
+        """Context setup for the first page; also used for pages of new contexts."""
+        self._setup_context(page.context)
 
-            url = request.url
-            if check_blocklisted_url(url):
-                print(f"Flagging blocked domain: {url}")
-                route.abort()
-            else:
-                route.continue_()
+    def _setup_context(self, context) -> None:
+        """Hook run once for every browser context: request tracking, HAR and blocklist routing."""
+        self._track_requests(context)
+        if self.har_mode == "record":
+            path = self._har_record_path(len(self._har_contexts))
+            context.route_from_har(
+                path,
+                url=self.har_url_filter,
+                update=True,
+                update_content="attach" if path.endswith(".zip") else "embed",
+            )
+            self._har_contexts.append(context)
+        elif self.har_mode == "replay":
+            # Routes registered later run first: HAR files, then the unmatched policy
+            context.route(self.har_url_filter or "**/*", self._handle_unmatched_request)
+            for path in self._har_replay_paths():
+                context.route_from_har(path, url=self.har_url_filter, not_found="fallback")
+        if self.resource_policy.active:
+            context.route("**/*", self._handle_resource_request)
+        # Registered last so it runs before the other routes; covers popups and new tabs too
+        pattern = self.blocklist.route_pattern()
+        if pattern is not None:
+            context.route(pattern, self._handle_blocked_request)
 
-        self._page.route("**/*", handle_route)
+    def _handle_blocked_request(self, route, request) -> None:
+        if not self.blocklist.is_blocked(request.url):
+            route.fallback()  # allowlisted, or matched by a broad pattern
+            return
+        self.blocked_requests += 1
+        print(f"Flagging blocked domain: {request.url}")
+        route.abort("blockedbyclient")
 
-        return self
+    # --- Resource profiles ---
+    def use_resource_profile(self, profile: str, overrides: dict[str, str] | None = None) -> None:
+        """
+        Choose what sub-resources load: "full", "lean" or "text-only" (see resource_profiles.py).
+        Call before `__enter__`.
+
+        Args:
+            profile: Profile applied to every request by default.
+            overrides: Domain -> profile for requests to those domains and their
+                subdomains, e.g. {"www.saucedemo.com": "full"}.
+        """
+        self.resource_policy = ResourcePolicy(profile, overrides)
+
+    def _handle_resource_request(self, route, request) -> None:
+        resource_type = request.resource_type
+        if self.resource_policy.blocks(request.url, resource_type):
+            self.resource_blocked[resource_type] = self.resource_blocked.get(resource_type, 0) + 1
+            route.abort("blockedbyclient")
+        else:
+            route.fallback()
+
+    # --- HAR record / replay ---
+    def use_har(self, path: str, mode: str = "replay", unmatched: str = "abort", url_filter: str = None) -> None:
+        """
+        Record network traffic to a HAR file, or serve it from one. Call before `__enter__`.
+
+        Args:
+            path: HAR file (.har, or .zip with attached resources). Each extra browser
+                context records to `name.N.har` next to it, and replay serves all of them.
+            mode: "record" to capture a session, "replay" to answer requests from the HAR.
+            unmatched: During replay, what happens to requests the HAR has no entry
+                for: "abort" them (fully offline) or let them through to the "network".
+            url_filter: Glob or regex limiting which requests are recorded/replayed.
+        """
+        if mode not in HAR_MODES:
+            raise ValueError(f"Unknown HAR mode {mode!r}; expected one of {HAR_MODES}")
+        if unmatched not in HAR_UNMATCHED_POLICIES:
+            raise ValueError(f"Unknown unmatched-request policy {unmatched!r}; expected one of {HAR_UNMATCHED_POLICIES}")
+        if mode == "replay" and not os.path.exists(path):
+            raise FileNotFoundError(f"HAR file not found: {path}")
+        if mode == "record":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.har_mode = mode
+        self.har_path = path
+        self.har_unmatched = unmatched
+        self.har_url_filter = url_filter
+
+    def _har_record_path(self, index: int) -> str:
+        if index == 0:
+            return self.har_path
+        stem, ext = os.path.splitext(self.har_path)
+        return f"{stem}.{index}{ext}"
+
+    def _har_replay_paths(self) -> list[str]:
+        stem, ext = os.path.splitext(self.har_path)
+        directory = os.path.dirname(os.path.abspath(self.har_path))
+        extra = re.compile(re.escape(os.path.basename(stem)) + r"\.(\d+)" + re.escape(ext) + "$")
+        numbered = sorted(
+            (int(match.group(1)), os.path.join(directory, name))
+            for name in os.listdir(directory)
+            if (match := extra.match(name))
+        )
+        # Later contexts recorded later traffic; give them the lowest precedence
+        return [path for _, path in reversed(numbered)] + [self.har_path]
+
+    def _handle_unmatched_request(self, route, request) -> None:
+        self.har_unmatched_urls.append(request.url)
+        if self.har_unmatched == "abort":
+            print(f"Not in HAR, aborting: {request.method} {request.url}")
+            route.abort()
+        else:
+            route.continue_()
+
+    def _close_har_contexts(self) -> None:
+        """Close recording contexts; Playwright writes their HAR files on close."""
+        for context in self._har_contexts:
+            try:
+                context.close()
+            except Exception as e:
+                print(f"Error closing recording context: {e}")
+        self._har_contexts = []
 
     def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop_screencast()
+        self._close_har_contexts()
         if self._browser:
             self._browser.close()
         if self._playwright:
@@ -85,11 +334,245 @@ class BasePlaywrightComputer:
     def get_current_url(self) -> str:
         return self._page.url
 
+    # --- Page settling ---
+    def _track_requests(self, context) -> None:
+        """Keep track of in-flight requests for every page of the context (popups included)."""
+        def started(request):
+            self._pending_requests[request] = time.monotonic()
+
+        def ended(request):
+            self._pending_requests.pop(request, None)
+
+        context.on("request", started)
+        context.on("requestfinished", ended)
+        context.on("requestfailed", ended)
+
+    def _network_busy(self) -> bool:
+        cutoff = time.monotonic() - self.SETTLE_LONG_REQUEST_MS / 1000
+        return any(started_at > cutoff for started_at in list(self._pending_requests.values()))
+
+    def _page_busy(self) -> bool:
+        try:
+            state = self._page.evaluate(PAGE_STATE_JS)
+        except Exception:
+            return True  # navigating: the execution context went away
+        return not state["ready"] or state["animations"] > 0
+
+    def settle(self, timeout_ms: int | None = None) -> str | None:
+        """
+        Wait until the page looks finished and return a base64 viewport screenshot of it.
+
+        The page counts as settled once no recent request is in flight, no finite
+        animation is running and two consecutive frames are identical. Stops
+        waiting after `timeout_ms` (default `settle_timeout_ms`) and returns the
+        latest frame. Returns None when there is no page.
+        """
+        if self._page is None:
+            return None
+        self._sync_screencast()
+        timeout_ms = self.settle_timeout_ms if timeout_ms is None else timeout_ms
+        started = time.monotonic()
+        deadline = started + timeout_ms / 1000
+        frame = previous = None
+        while True:
+            if not self._network_busy() and not self._page_busy():
+                frame = self._capture_frame()
+                if frame == previous:
+                    break
+                previous = frame
+            if time.monotonic() >= deadline:
+                break
+            # Lets Playwright deliver request events while we wait (time.sleep would not)
+            self._page.wait_for_timeout(self.SETTLE_POLL_MS)
+        if frame is None:
+            frame = self._capture_frame()
+        self.last_settle_ms = (time.monotonic() - started) * 1000
+        return frame
+
+    # --- Screenshots ---
+    def set_screenshot_format(self, fmt: str, quality: int | None = None) -> None:
+        """Encode screenshots as png, jpeg or webp (quality 0-100 for the lossy ones)."""
+        if fmt not in SCREENSHOT_FORMATS:
+            raise ValueError(f"Unknown screenshot format {fmt!r}; expected one of {SCREENSHOT_FORMATS}")
+        self.screenshot_format = fmt
+        if quality is not None:
+            self.screenshot_quality = quality
+
+    @property
+    def screenshot_mime_type(self) -> str:
+        """MIME type of the latest screenshot, for data URIs."""
+        return f"image/{self.last_screenshot_format}"
+
+    # --- Text entry ---
+    def set_type_mode(self, mode: str, min_chars: int | None = None) -> None:
+        """
+        Choose how `type()` enters text:
+
+          - "keys": keydown/keypress/input/keyup per character (keyboard.type).
+          - "insert": the whole string in one insertText, which fires input
+            events but no key events; fastest, for fields known not to care.
+          - "auto": insert strings of at least `min_chars` into an editable
+            field without key listeners of its own, type everything else.
+        """
+        if mode not in TYPE_MODES:
+            raise ValueError(f"Unknown type mode {mode!r}; expected one of {TYPE_MODES}")
+        self.type_mode = mode
+        if min_chars is not None:
+            self.type_insert_min_chars = min_chars
+
+    def _can_insert(self, text: str) -> bool:
+        """
+        Whether inserting `text` into the focused field looks the same to the page as typing it.
+
+        Asks CDP for the listeners registered on the field itself (DOMDebugger.getEventListeners);
+        handlers delegated to an ancestor are not seen, which is why short strings keep
+        being typed in "auto" mode. Falls back to typing whenever the check fails.
+        """
+        if self._cdp_unavailable:
+            return False
+        try:
+            cdp = self._cdp_session(self._page)
+        except Exception as e:
+            print(f"CDP unavailable, typing key by key: {e}")
+            self._cdp_unavailable = True
+            return False
+        try:
+            result = cdp.send("Runtime.evaluate", {"expression": FOCUSED_FIELD_JS, "objectGroup": "type"})
+            field = result.get("result", {})
+            if not field.get("objectId"):
+                return False  # nothing editable focused, e.g. typing to a page shortcut
+            try:
+                if "\n" in text and field.get("description", "").lower().startswith("input"):
+                    return False  # Enter submits a single-line input; insertText would not
+                listeners = cdp.send("DOMDebugger.getEventListeners", {"objectId": field["objectId"]})
+                return not any(listener["type"] in KEY_EVENTS for listener in listeners.get("listeners", []))
+            finally:
+                cdp.send("Runtime.releaseObjectGroup", {"objectGroup": "type"})
+        except Exception as e:
+            print(f"Key listener check failed, typing instead: {e}")
+            self._cdp_sessions.pop(self._page, None)  # possibly detached; reopened next time
+            return False
+
+    def _cdp_session(self, page):
+        session = self._cdp_sessions.get(page)
+        if session is None:
+            session = page.context.new_cdp_session(page)
+            self._cdp_sessions[page] = session
+            page.on("close", lambda closed: self._cdp_sessions.pop(closed, None))
+        return session
+
+    def _capture_frame(self) -> str:
+        """Base64 viewport screenshot, over the page's CDP session when possible."""
+        started = time.perf_counter()
+        page = self._page
+        frame = None
+        if not self._cdp_unavailable:
+            params = {"format": self.screenshot_format, "fromSurface": True, "captureBeyondViewport": False}
+            if self.screenshot_format != "png":
+                params["quality"] = self.screenshot_quality
+            try:
+                session = self._cdp_session(page)
+            except Exception as e:
+                print(f"CDP sessions unavailable, using standard screenshots: {e}")
+                self._cdp_unavailable = True
+            else:
+                try:
+                    frame = session.send("Page.captureScreenshot", params)["data"]
+                    self.last_screenshot_format, path = self.screenshot_format, "cdp"
+                except Exception as e:
+                    print(f"CDP screenshot failed, falling back to standard screenshot: {e}")
+                    self._cdp_sessions.pop(page, None)  # possibly detached; reopened next time
+        if frame is None:
+            fmt = self.screenshot_format if self.screenshot_format in ("png", "jpeg") else "png"
+            options = {"quality": self.screenshot_quality} if fmt == "jpeg" else {}
+            frame = base64.b64encode(page.screenshot(full_page=False, type=fmt, **options)).decode("utf-8")
+            self.last_screenshot_format, path = fmt, "playwright"
+        self.screenshot_latencies.append(((time.perf_counter() - started) * 1000, path))
+        return frame
+
+    def screenshot_stats(self) -> dict:
+        """Latency summary (ms) of the recent screenshot captures, by path."""
+        stats = {}
+        for path in ("cdp", "playwright"):
+            latencies = sorted(ms for ms, p in self.screenshot_latencies if p == path)
+            if latencies:
+                stats[path] = {
+                    "count": len(latencies),
+                    "mean_ms": round(sum(latencies) / len(latencies), 1),
+                    "p50_ms": round(latencies[len(latencies) // 2], 1),
+                    "p95_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 1),
+                    "max_ms": round(latencies[-1], 1),
+                }
+        return stats
+
+    # --- Live screencast ---
+    def start_screencast(self) -> None:
+        """
+        Stream the current page's screencast frames to `self.screencast`.
+
+        Must run on the thread that drives Playwright; frames are then delivered
+        whenever that thread is inside a Playwright call (actions, settle waits).
+        """
+        channel, page = self.screencast, self._page
+        session = self._cdp_session(page)
+        interval = 1 / channel.max_fps if channel.max_fps else 0
+
+        def on_frame(params):
+            # Chrome sends the next frame only after an ack, so always ack
+            session.send("Page.screencastFrameAck", {"sessionId": params["sessionId"]})
+            now = time.monotonic()
+            if now - self._screencast_last < interval:
+                self.screencast_dropped += 1  # over the frame-rate limit
+                return
+            self._screencast_last = now
+            channel.publish(base64.b64decode(params["data"]))
+
+        session.on("Page.screencastFrame", on_frame)
+        params = {"format": "jpeg", "quality": channel.quality, "everyNthFrame": 1}
+        if channel.max_width:
+            params["maxWidth"] = channel.max_width
+        if channel.max_height:
+            params["maxHeight"] = channel.max_height
+        session.send("Page.startScreencast", params)
+        self._screencast_page, self._screencast_handler = page, on_frame
+
+    def stop_screencast(self) -> None:
+        page, self._screencast_page = self._screencast_page, None
+        session = self._cdp_sessions.get(page)
+        if session is None:
+            return  # page closed, and its screencast with it
+        try:
+            session.remove_listener("Page.screencastFrame", self._screencast_handler)
+            session.send("Page.stopScreencast")
+        except Exception as e:
+            print(f"Error stopping screencast: {e}")
+
+    def _sync_screencast(self) -> None:
+        """Start, move or stop the screencast to match the viewers; called on the Playwright thread."""
+        channel = self.screencast
+        if channel is None or self._cdp_unavailable:
+            return
+        try:
+            if channel.wanted() and self._page is not None:
+                if self._screencast_page is not self._page:  # new viewer, or the agent switched tabs
+                    if self._screencast_page is not None:
+                        self.stop_screencast()
+                    self.start_screencast()
+            elif self._screencast_page is not None:
+                self.stop_screencast()
+        except Exception as e:
+            print(f"Screencast unavailable: {e}")
+            self.screencast = None
+
     # --- Common "Computer" actions ---
     def screenshot(self) -> str:
-        """Capture only the viewport (not full_page)."""
-        png_bytes = self._page.screenshot(full_page=False)
-        return base64.b64encode(png_bytes).decode("utf-8")
+        """Capture only the viewport (not full_page), once the page has settled."""
+        self._sync_screencast()
+        frame = self.settle() if self.settle_timeout_ms else self._capture_frame()
+        capture_ms, path = self.screenshot_latencies[-1]
+        log_action("screenshot", f"{self.last_screenshot_format} via {path}, capture {capture_ms:.0f} ms"
+                   + (f", settled in {self.last_settle_ms:.0f} ms" if self.settle_timeout_ms else ""))
+        return frame
 
     def click(self, x: int, y: int, button: str = "left") -> None:
         log_action("click", f"at coordinates ({x}, {y}) with {button} button")
@@ -113,7 +596,14 @@ class BasePlaywrightComputer:
         self._page.evaluate(f"window.scrollBy({scroll_x}, {scroll_y})")
 
     def type(self, text: str) -> None:
-        self._page.keyboard.type(text)
+        insert = self.type_mode == "insert" or (
+            self.type_mode == "auto" and len(text) >= self.type_insert_min_chars and self._can_insert(text)
+        )
+        if insert:
+            self._page.keyboard.insert_text(text)
+        else:
+            self._page.keyboard.type(text)
+        log_action("type", f"{len(text)} chars via {'insert' if insert else 'keys'}")
 
     def wait(self, ms: int = 1000) -> None:
         time.sleep(ms / 1000)
@@ -123,20 +613,38 @@ class BasePlaywrightComputer:
 
     def keypress(self, keys: List[str]) -> None:
         mapped_keys = [CUA_KEY_TO_PLAYWRIGHT_KEY.get(key.lower(), key) for key in keys]
-        for key in mapped_keys:
-            self._page.keyboard.down(key)
-        for key in reversed(mapped_keys):
-            self._page.keyboard.up(key)
+        if not mapped_keys:
+            return
+        # One round trip: press() holds the keys down in order and releases them in reverse
+        self._page.keyboard.press("+".join(mapped_keys))
 
     def drag(self, path: List[Dict[str, int]]) -> None:
         if not path:
             return
         self._page.mouse.move(path[0]["x"], path[0]["y"])
         self._page.mouse.down()
-        for point in path[1:]:
-            self._page.mouse.move(point["x"], point["y"])
+        for x, y, steps in drag_segments(path):
+            self._page.mouse.move(x, y, steps=steps)
         self._page.mouse.up()
 
+    def execute_batch(self, actions: List[Dict]) -> None:
+        """
+        Run several actions in order, e.g. every computer call of one model
+        response, so the caller can take a single screenshot afterwards.
+
+        Each action is a dict like a computer call's action: {"type": "click", "x": 1, "y": 2}.
+        All of them are checked before the first one runs.
+        """
+        calls = []
+        for action in actions:
+            action_type = action.get("type")
+            if action_type not in BATCH_ACTIONS:
+                raise ValueError(f"Cannot batch action {action_type!r}; expected one of {BATCH_ACTIONS}")
+            calls.append((getattr(self, action_type), {k: v for k, v in action.items() if k != "type"}))
+        log_action("batch", ", ".join(action["type"] for action in actions))
+        for method, args in calls:
+            method(**args)
+
     # --- Extra browser-oriented actions ---
     def goto(self, url: str) -> None:
         try:
@@ -150,6 +658,12 @@ class BasePlaywrightComputer:
     def forward(self) -> None:
         return self._page.go_forward()
 
+    def reload(self) -> None:
+        try:
+            return self._page.reload()
+        except Exception as e:
+            print(f"Error reloading {self._page.url}: {e}")
+
     # --- Subclass hook ---
     def _get_browser_and_page(self) -> tuple[Browser, Page]:
         """Subclasses must implement, returning (Browser, Page)."""
@@ -0,0 +1,132 @@
+"""
+Resource profiles: which sub-resources a browser context loads.
+
+Functional test flows rarely need web fonts, hero images, video or analytics
+beacons. A profile names the resource types to skip; per-domain overrides pick
+a different profile for requests to particular hosts (subdomains included),
+e.g. keep "full" for the site under test while third parties stay "lean".
+Documents are never blocked, and scripts only when they come from analytics domains.
+"""
+
+from dataclasses import dataclass
+
+from blocklist import DomainBlocklist, hostname_of, normalize_domain
+
+
+@dataclass(frozen=True)
+class ResourceProfile:
+    name: str
+    blocked_types: frozenset = frozenset()  # Playwright request.resource_type values
+    block_analytics: bool = False
+    description: str = ""
+
+
+# Third-party analytics, tag managers and ad/tracking beacons
+ANALYTICS_DOMAINS = [
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googleadservices.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "connect.facebook.net",
+    "hotjar.com",
+    "segment.io",
+    "segment.com",
+    "mixpanel.com",
+    "amplitude.com",
+    "fullstory.com",
+    "newrelic.com",
+    "nr-data.net",
+    "clarity.ms",
+    "bat.bing.com",
+    "scorecardresearch.com",
+    "optimizely.com",
+]
+
+RESOURCE_PROFILES = {
+    profile.name: profile
+    for profile in (
+        ResourceProfile("full", description="everything loads"),
+        ResourceProfile(
+            "lean",
+            frozenset({"image", "media", "font"}),
+            block_analytics=True,
+            description="images, media, fonts and analytics blocked",
+        ),
+        ResourceProfile(
+            "text-only",
+            frozenset({"image", "media", "font", "stylesheet", "texttrack", "manifest"}),
+            block_analytics=True,
+            description="only documents, scripts and data requests load; no styling",
+        ),
+    )
+}
+
+DEFAULT_PROFILE = "full"
+
+
+def get_profile(name: str) -> ResourceProfile:
+    try:
+        return RESOURCE_PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown resource profile {name!r}; expected one of {list(RESOURCE_PROFILES)}") from None
+
+
+def parse_overrides(spec: str) -> dict[str, str]:
+    """Parse "www.saucedemo.com=full,cdn.example.com=text-only" into a domain -> profile dict."""
+    overrides = {}
+    for item in (spec or "").split(","):
+        if not item.strip():
+            continue
+        domain, sep, name = item.partition("=")
+        if not sep:
+            raise ValueError(f"Resource profile override {item.strip()!r} is not domain=profile")
+        get_profile(name.strip())
+        overrides[domain.strip().lower()] = name.strip()
+    return overrides
+
+
+class ResourcePolicy:
+    """A default profile plus per-domain overrides; decides per request."""
+
+    def __init__(self, profile: str = DEFAULT_PROFILE, overrides: dict[str, str] | None = None):
+        self.profile = get_profile(profile)
+        self.overrides = {normalize_domain(d): get_profile(n).name for d, n in (overrides or {}).items()}
+        self._analytics = DomainBlocklist(blocked=ANALYTICS_DOMAINS)
+        self._host_profiles = {}  # hostname -> ResourceProfile
+
+    @property
+    def active(self) -> bool:
+        """Whether any request can be blocked (so a route is worth installing)."""
+        return self.profile.name != "full" or any(n != "full" for n in self.overrides.values())
+
+    def profile_for(self, url: str) -> ResourceProfile:
+        """Profile of the most specific overridden domain the URL's host falls under, else the default."""
+        hostname = hostname_of(url)
+        profile = self._host_profiles.get(hostname)
+        if profile is None:
+            profile = self.profile
+            suffix = hostname
+            while suffix:
+                if suffix in self.overrides:
+                    profile = RESOURCE_PROFILES[self.overrides[suffix]]
+                    break
+                suffix = suffix.partition(".")[2]
+            self._host_profiles[hostname] = profile
+        return profile
+
+    def blocks(self, url: str, resource_type: str) -> bool:
+        if resource_type == "document":
+            return False
+        profile = self.profile_for(url)
+        if resource_type in profile.blocked_types:
+            return True
+        return profile.block_analytics and self._analytics.is_blocked(url)
+
+    def describe(self) -> dict:
+        """What the report records about the profile in effect."""
+        return {
+            "name": self.profile.name,
+            "description": self.profile.description,
+            "overrides": dict(self.overrides),
+        }
@@ -38,7 +38,7 @@ def handle_item(item, computer: Computer):
             "acknowledged_safety_checks": pending_checks,
             "output": {
                 "type": "input_image",
-                "image_url": f"data:image/png;base64,{screenshot_base64}",
+                "image_url": f"data:{getattr(computer, 'screenshot_mime_type', 'image/png')};base64,{screenshot_base64}",
             },
         }
 
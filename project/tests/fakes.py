@@ -0,0 +1,243 @@
+"""
+Stand-ins for the Playwright and CDP objects the computers drive, shared by the tests.
+
+They implement just the calls the computers make and record what was asked of
+them. Event handlers are kept per event and fired with emit().
+"""
+
+from computers.shared.base_playwright import BasePlaywrightComputer
+
+
+class FakeCDPSession:
+    """
+    Records every command; `responses` maps a method to its result, or to a
+    callable taking the params. With `fail` every command raises.
+    """
+
+    def __init__(self, responses=None, fail=False):
+        self.responses = dict(responses or {})
+        self.fail = fail
+        self.sent = []
+        self.listeners = {}
+
+    @property
+    def methods(self):
+        return [method for method, _ in self.sent]
+
+    def send(self, method, params=None):
+        self.sent.append((method, params))
+        if self.fail:
+            raise RuntimeError("Target closed")
+        response = self.responses.get(method, {})
+        return response(params) if callable(response) else response
+
+    def on(self, event, handler):
+        self.listeners[event] = handler
+
+    def remove_listener(self, event, handler):
+        assert self.listeners.pop(event) is handler
+
+    def emit(self, event, params):
+        self.listeners[event](params)
+
+    def detach(self):
+        pass
+
+
+class FakeRequest:
+    def __init__(self, url="https://www.saucedemo.com/", resource_type="document", method="GET"):
+        self.url = url
+        self.resource_type = resource_type
+        self.method = method
+
+
+class FakeRoute:
+    """Records how a route handler settled the request in `outcome`."""
+
+    def __init__(self):
+        self.outcome = None
+        self.error_code = None
+
+    def abort(self, error_code=None):
+        self.outcome = "abort"
+        self.error_code = error_code
+
+    def fallback(self):
+        self.outcome = "fallback"
+
+    def continue_(self):
+        self.outcome = "continue"
+
+
+class _EventSource:
+    def on(self, event, handler):
+        self.handlers.setdefault(event, []).append(handler)
+
+    def emit(self, event, *args):
+        for handler in self.handlers.get(event, []):
+            handler(*args)
+
+
+class FakeMouse:
+    def __init__(self, calls):
+        self.calls = calls
+
+    def move(self, x, y, steps=1):
+        self.calls.append(("move", x, y, steps))
+
+    def down(self):
+        self.calls.append(("down",))
+
+    def up(self):
+        self.calls.append(("up",))
+
+    def click(self, x, y, button="left"):
+        self.calls.append(("click", x, y))
+
+
+class FakeKeyboard:
+    def __init__(self, calls):
+        self.calls = calls
+
+    def press(self, key):
+        self.calls.append(("press", key))
+
+    def type(self, text):
+        self.calls.append(("type", text))
+
+    def insert_text(self, text):
+        self.calls.append(("insert", text))
+
+
+class FakePage(_EventSource):
+    """
+    A page whose mouse and keyboard input lands in `calls`, in order.
+
+    Screenshots come from `frames` (the last one repeats) or, without frames,
+    are b"playwright-<type>"; each is recorded as (type, quality).
+    """
+
+    def __init__(self, context=None, frames=None):
+        self.context = context if context is not None else FakeContext()
+        self.frames = list(frames or [])
+        self.url = "about:blank"
+        self.closed = False
+        self.viewport = None
+        self.handlers = {}
+        self.screenshots = []
+        self.calls = []
+        self.mouse = FakeMouse(self.calls)
+        self.keyboard = FakeKeyboard(self.calls)
+
+    def goto(self, url):
+        self.url = url
+
+    def screenshot(self, full_page=False, type="png", quality=None):
+        self.screenshots.append((type, quality))
+        if not self.frames:
+            return b"playwright-" + type.encode()
+        return self.frames.pop(0) if len(self.frames) > 1 else self.frames[0]
+
+    def set_viewport_size(self, size):
+        self.viewport = size
+
+    def is_closed(self):
+        return self.closed
+
+    def close(self):
+        self.closed = True
+        if self in self.context.pages:
+            self.context.pages.remove(self)
+
+
+class FakeContext(_EventSource):
+    """
+    A browser context with `pages` open tabs.
+
+    `cdp_session` creates the CDP session for each new_cdp_session() call
+    (all of them are kept in `cdp_sessions`); None means CDP is unavailable.
+    Routes are kept in `routes` as (url, handler), and in `registered` together
+    with HAR routes, as ("route", url, handler) or ("har", path, options).
+    """
+
+    def __init__(self, cdp_session=FakeCDPSession, pages=0):
+        self.cdp_session = cdp_session
+        self.cdp_sessions = []
+        self.handlers = {}
+        self.routes = []
+        self.registered = []
+        self.closed = False
+        self.cookies_cleared = 0
+        self.pages = [FakePage(self) for _ in range(pages)]
+
+    def new_page(self):
+        self.pages.append(FakePage(self))
+        return self.pages[-1]
+
+    def new_cdp_session(self, page):
+        if self.cdp_session is None:
+            raise RuntimeError("CDP session is only available in Chromium")
+        self.cdp_sessions.append(self.cdp_session())
+        return self.cdp_sessions[-1]
+
+    def route(self, url, handler):
+        self.routes.append((url, handler))
+        self.registered.append(("route", url, handler))
+
+    def route_from_har(self, har, **options):
+        self.registered.append(("har", har, options))
+
+    def add_init_script(self, script):
+        pass
+
+    def clear_cookies(self):
+        self.cookies_cleared += 1
+
+    def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    """A connected browser; its default context has one tab open."""
+
+    def __init__(self):
+        self.contexts = [FakeContext(pages=1)]
+        self.cdp = FakeCDPSession()
+        self.closed = False
+
+    def new_context(self, **options):
+        self.contexts.append(FakeContext())
+        return self.contexts[-1]
+
+    def new_browser_cdp_session(self):
+        return self.cdp
+
+    def close(self):
+        self.closed = True
+
+
+class FakePlaywright:
+    """
+    Stand-in for the CDP endpoints: one browser per URL, kept in `browsers`.
+    Share the dict between instances to reconnect to the same browsers.
+    """
+
+    def __init__(self, browsers=None):
+        self.chromium = self
+        self.browsers = browsers if browsers is not None else {}
+        self.connected_to = None
+        self.stopped = False
+
+    def connect_over_cdp(self, endpoint_url, timeout=None):
+        self.connected_to = endpoint_url
+        return self.browsers.setdefault(endpoint_url, FakeBrowser())
+
+    def stop(self):
+        self.stopped = True
+
+
+def make_computer(page=None):
+    """A BasePlaywrightComputer driving `page` (a new FakePage by default)."""
+    computer = BasePlaywrightComputer()
+    computer._page = page if page is not None else FakePage()
+    return computer
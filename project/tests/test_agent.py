@@ -0,0 +1,259 @@
+import json
+
+from agent import agent as agent_module
+from agent.agent import Agent
+from agent.budget import Budget, sum_usage
+from agent.loop_detector import ABORT, HINT, RELOAD, LoopDetector
+
+
+class FakeComputer:
+    def get_environment(self):
+        return "browser"
+
+    def get_dimensions(self):
+        return (1024, 768)
+
+    def screenshot(self):
+        return "c2NyZWVu"
+
+    def get_current_url(self):
+        return "https://www.saucedemo.com/"
+
+    def click(self, x, y, button="left"):
+        pass
+
+
+def scripted_responses(monkeypatch, responses):
+    """Make the model call return the given responses in order and record the (decoded) requests."""
+    requests = []
+
+    def fake_create_response_from_body(body):
+        requests.append(json.loads(body))
+        return responses[len(requests) - 1]
+
+    monkeypatch.setattr(agent_module, "create_response_from_body", fake_create_response_from_body)
+    return requests
+
+
+def function_call(name, arguments, call_id="call_1"):
+    return {"type": "function_call", "name": name, "arguments": json.dumps(arguments), "call_id": call_id}
+
+
+def test_function_handler_output_and_end_turn(monkeypatch):
+    requests = scripted_responses(monkeypatch, [
+        {"output": [{"type": "computer_call", "call_id": "c1", "action": {"type": "click", "x": 1, "y": 2}}]},
+        {"output": [function_call("report_result", {"verdict": "Pass"})]},
+    ])
+    reported = []
+    agent = Agent(
+        computer=FakeComputer(),
+        functions={"report_result": lambda verdict: reported.append(verdict) or {"status": "recorded"}},
+        end_turn_on={"report_result"},
+    )
+
+    items = agent.run_full_turn([{"role": "user", "content": "run the test"}], print_steps=False)
+
+    assert reported == ["Pass"]
+    assert len(requests) == 2  # no extra model call after report_result
+    assert items[-1] == {"type": "function_call_output", "call_id": "call_1", "output": '{"status": "recorded"}'}
+
+
+def test_rejected_end_turn_call_goes_back_to_the_model(monkeypatch):
+    requests = scripted_responses(monkeypatch, [
+        {"output": [function_call("report_result", {"verdict": "Passed"}, call_id="call_1")]},
+        {"output": [function_call("report_result", {"verdict": "Pass"}, call_id="call_2")]},
+    ])
+
+    def report_result(verdict):
+        if verdict not in ("Pass", "Fail"):
+            return {"status": "error", "message": "verdict must be 'Pass' or 'Fail'"}
+        return {"status": "recorded", "verdict": verdict}
+
+    agent = Agent(computer=FakeComputer(), functions={"report_result": report_result}, end_turn_on={"report_result"})
+
+    items = agent.run_full_turn([{"role": "user", "content": "run the test"}], print_steps=False)
+
+    assert len(requests) == 2  # the error went back and the model retried
+    assert requests[1]["input"][-1]["output"] == '{"status": "error", "message": "verdict must be \'Pass\' or \'Fail\'"}'
+    assert items[-1]["output"] == '{"status": "recorded", "verdict": "Pass"}'
+
+
+def test_default_tools_list_is_not_shared():
+    Agent(computer=FakeComputer())
+    agent = Agent(computer=FakeComputer())
+
+    assert len(agent.tools) == 1
+
+
+def click_response(call_id, input_tokens=100, output_tokens=10):
+    return {
+        "output": [{"type": "computer_call", "call_id": call_id, "action": {"type": "click", "x": 1, "y": 2}}],
+        "usage": {"input_tokens": input_tokens, "output_tokens": output_tokens},
+    }
+
+
+def test_budget_ends_turn_when_model_calls_run_out(monkeypatch):
+    requests = scripted_responses(monkeypatch, [click_response(f"c{i}") for i in range(10)])
+    session = Budget(name="session")
+    case = session.child("test case", model_calls=3)
+    agent = Agent(computer=FakeComputer(), budget=case)
+
+    items = agent.run_full_turn([{"role": "user", "content": "keep clicking"}], print_steps=False)
+
+    assert len(requests) == 3
+    assert case.exceeded == "test case model calls limit reached (3)"
+    assert items[-1]["role"] == "assistant"
+    assert "Budget exceeded" in items[-1]["content"][0]["text"]
+    # Usage is recorded on the case and rolled up into the session
+    assert case.usage()["input_tokens"] == 300
+    assert session.usage()["output_tokens"] == 30
+    assert session.upload_bytes == case.upload_bytes > 0
+
+
+def test_session_budget_stops_every_case(monkeypatch):
+    scripted_responses(monkeypatch, [click_response(f"c{i}", input_tokens=600) for i in range(10)])
+    session = Budget(name="session", input_tokens=1000)
+    agent = Agent(computer=FakeComputer(), budget=session.child("first"))
+    agent.run_full_turn([{"role": "user", "content": "go"}], print_steps=False)
+
+    second = session.child("second")
+    agent.budget = second
+    agent.run_full_turn([{"role": "user", "content": "go"}], print_steps=False)
+
+    assert second.model_calls == 0
+    assert second.exceeded == "session input tokens limit reached (1000)"
+
+
+def test_budget_from_env_and_sum_usage(monkeypatch):
+    monkeypatch.setenv("TEST_CASE_MAX_SECONDS", "30")
+    monkeypatch.setenv("TEST_CASE_MAX_MODEL_CALLS", "none")
+    monkeypatch.setenv("TEST_CASE_MAX_UPLOAD_MB", "1.5")
+    budget = Budget.from_env("case", "TEST_CASE", defaults={"model_calls": 5, "output_tokens": 50})
+
+    assert budget.limits == {
+        "wall_seconds": 30, "model_calls": None, "input_tokens": None,
+        "output_tokens": 50, "upload_bytes": int(1.5 * 1024 * 1024),
+    }
+    assert sum_usage([{"model_calls": 2, "wall_seconds": 1.25}, None, {"model_calls": 1, "wall_seconds": 2}]) == {
+        "wall_seconds": 3.25, "model_calls": 3, "input_tokens": 0, "output_tokens": 0, "upload_bytes": 0,
+    }
+
+
+class ReloadableComputer(FakeComputer):
+    def __init__(self):
+        self.reloads = 0
+
+    def screenshot(self):
+        return f"c2NyZWVu{self.reloads}"
+
+    def reload(self):
+        self.reloads += 1
+
+
+def test_loop_detector_thresholds():
+    detector = LoopDetector(hint_after=2, reload_after=3, abort_after=4)
+    events = [detector.observe("click", {"x": 1, "y": 2}, "c2NyZWVu", "https://a.test/") for _ in range(4)]
+
+    assert events == [None, HINT, RELOAD, ABORT]
+    assert detector.aborted.startswith("stuck: click repeated 4 times")
+    # A different screen or URL is a different step
+    detector.reset()
+    assert detector.observe("click", {"x": 1, "y": 2}, "c2NyZWVu", "https://a.test/") is None
+    assert detector.observe("click", {"x": 1, "y": 2}, "b3RoZXI=", "https://a.test/") is None
+    assert detector.observe("click", {"x": 1, "y": 2}, "c2NyZWVu", "https://b.test/") is None
+
+
+def test_agent_hints_reloads_and_stops_repeated_clicks(monkeypatch, tmp_path):
+    requests = scripted_responses(monkeypatch, [click_response(f"c{i}") for i in range(20)])
+    log_path = tmp_path / "loop_events.jsonl"
+    computer = ReloadableComputer()
+    agent = Agent(computer=computer, loop_detector=LoopDetector(hint_after=2, reload_after=3, abort_after=5,
+                                                                log_path=str(log_path)))
+
+    items = agent.run_full_turn([{"role": "user", "content": "click it"}], print_steps=False)
+
+    hints = [item["content"] for item in items if item.get("role") == "user"]
+    assert len(hints) == 3 and "reloaded" in hints[1]
+    assert computer.reloads == 1
+    # The reload changed the screen, but repeating the click up to the reload
+    # threshold again stops the turn instead of reloading a second time
+    assert len(requests) == 6
+    assert items[-1]["content"][0]["text"].startswith("Stopped: stuck: click repeated 3 times")
+    events = [json.loads(line)["event"] for line in log_path.read_text().splitlines()]
+    assert events == [HINT, RELOAD, HINT, ABORT]
+
+
+class BatchingComputer(FakeComputer):
+    def __init__(self):
+        self.batches = []
+        self.screenshots = 0
+
+    def execute_batch(self, actions):
+        self.batches.append(actions)
+
+    def screenshot(self):
+        self.screenshots += 1
+        return super().screenshot()
+
+
+def test_consecutive_computer_calls_run_as_one_batch(monkeypatch):
+    calls = [
+        {"type": "computer_call", "call_id": "c1", "action": {"type": "click", "x": 1, "y": 2}},
+        {"type": "computer_call", "call_id": "c2", "action": {"type": "type", "text": "standard_user"}},
+        {"type": "computer_call", "call_id": "c3", "action": {"type": "keypress", "keys": ["enter"]}},
+    ]
+    scripted_responses(monkeypatch, [
+        {"output": calls},
+        {"output": [{"type": "message", "content": [{"text": "done"}]}]},
+    ])
+    computer = BatchingComputer()
+    agent = Agent(computer=computer)
+
+    items = agent.run_full_turn([{"role": "user", "content": "log in"}], print_steps=False)
+
+    assert computer.batches == [[call["action"] for call in calls]]
+    assert computer.screenshots == 1
+    outputs = [item for item in items if item.get("type") == "computer_call_output"]
+    assert [output["call_id"] for output in outputs] == ["c1", "c2", "c3"]
+    assert len({output["output"]["image_url"] for output in outputs}) == 1
+
+
+def test_request_body_matches_json_and_encodes_new_items_only(monkeypatch):
+    from agent import request_body as request_body_module
+
+    encoded = []
+    dumps = json.dumps
+    monkeypatch.setattr(request_body_module, "json", type("Json", (), {
+        "dumps": staticmethod(lambda obj: encoded.append(obj) or dumps(obj))}))
+    items = [{"role": "user", "content": "log in"}, {"type": "computer_call", "call_id": "c1"}]
+    body = request_body_module.RequestBody()
+
+    first = body.build(items, model="m", tools=[], truncation="auto")
+    items = items + [{"type": "computer_call_output", "call_id": "c1", "output": {"image_url": "data:é"}}]
+    second = body.build(items, model="m", tools=[], truncation="auto")
+
+    assert second == dumps({"model": "m", "tools": [], "truncation": "auto", "input": items}).encode()
+    assert first.startswith(b'{"model": "m", ') and json.loads(first)["input"] == items[:2]
+    assert [obj for obj in encoded if "type" in obj or "role" in obj] == items  # each item encoded once
+
+
+def test_pipelined_agent_sends_prebuilt_bodies(monkeypatch):
+    responses = [
+        {"output": [{"type": "computer_call", "call_id": "c1", "action": {"type": "click", "x": 1, "y": 2}}],
+         "usage": {"input_tokens": 5}},
+        {"output": [{"type": "message", "content": [{"text": "done"}]}]},
+    ]
+    bodies = []
+    monkeypatch.setattr(agent_module, "create_response_from_body",
+                        lambda body: bodies.append(body) or responses[len(bodies) - 1])
+    budget = Budget(name="case")
+    agent = Agent(computer=FakeComputer(), budget=budget, pipelined=True)
+
+    items = agent.run_full_turn([{"role": "user", "content": "log in"}], print_steps=False)
+
+    assert len(bodies) == 2
+    sent = json.loads(bodies[1])
+    assert sent["model"] == "computer-use-preview" and sent["truncation"] == "auto"
+    assert sent["input"] == [{"role": "user", "content": "log in"}] + items[:2]
+    assert budget.upload_bytes == sum(len(body) for body in bodies)
+    assert agent.step_stats()["steps"] == 2
@@ -0,0 +1,49 @@
+import pytest
+
+from computers.shared.base_playwright import drag_segments
+from tests.fakes import make_computer
+
+
+def points(*coords):
+    return [{"x": x, "y": y} for x, y in coords]
+
+
+def test_straight_runs_become_one_move():
+    path = points(*[(10 + i, 10 + 2 * i) for i in range(50)], (60, 100), (60, 150))
+    assert drag_segments(path) == [(59, 108, 49), (60, 100, 1), (60, 150, 1)]
+
+
+def test_curves_keep_their_points():
+    path = points((0, 0), (10, 0), (10, 10), (0, 10), (0, 0))
+    assert drag_segments(path) == [(10, 0, 1), (10, 10, 1), (0, 10, 1), (0, 0, 1)]
+    # Doubling back along the same line is not a straight run
+    assert drag_segments(points((0, 0), (10, 0), (5, 0))) == [(10, 0, 1), (5, 0, 1)]
+
+
+def test_drag_issues_few_driver_calls():
+    computer = make_computer()
+    computer.drag(points(*[(i, 0) for i in range(100)]))
+    assert computer._page.calls == [("move", 0, 0, 1), ("down",), ("move", 99, 0, 99), ("up",)]
+
+
+def test_keypress_is_a_single_combo():
+    computer = make_computer()
+    computer.keypress(["ctrl", "shift", "t"])
+    assert computer._page.calls == [("press", "Control+Shift+t")]
+
+
+def test_execute_batch_runs_actions_in_order():
+    computer = make_computer()
+    computer.execute_batch([
+        {"type": "click", "x": 5, "y": 6},
+        {"type": "type", "text": "secret_sauce"},
+        {"type": "keypress", "keys": ["enter"]},
+    ])
+    assert computer._page.calls == [("click", 5, 6), ("type", "secret_sauce"), ("press", "Enter")]
+
+
+def test_execute_batch_rejects_unknown_actions_before_running_any():
+    computer = make_computer()
+    with pytest.raises(ValueError):
+        computer.execute_batch([{"type": "click", "x": 5, "y": 6}, {"type": "screenshot"}])
+    assert computer._page.calls == []
@@ -0,0 +1,119 @@
+import os
+import re
+
+import pytest
+
+from blocklist import REGEX_MAX_DOMAINS, DomainBlocklist, url_pattern
+from computers.shared.base_playwright import BasePlaywrightComputer
+from tests.fakes import FakeContext, FakeRequest, FakeRoute
+
+
+def test_pattern_matches_domain_and_subdomains_only():
+    pattern = url_pattern(["evilvideos.com", "shadytok.com"])
+
+    for url in [
+        "https://evilvideos.com",
+        "https://evilvideos.com/watch?v=1",
+        "http://a.b.EvilVideos.com:8080/x",
+        "wss://user:pw@shadytok.com/socket",
+    ]:
+        assert pattern.search(url), url
+    for url in [
+        "https://notevilvideos.com/",
+        "https://evilvideos.com.example.org/",
+        "https://www.saucedemo.com/?next=https://evilvideos.com/",
+        "https://www.saucedemo.com/evilvideos.com",
+    ]:
+        assert not pattern.search(url), url
+
+
+def test_pattern_is_portable_to_the_browser():
+    pattern = url_pattern(["evil-videos.co.uk"])
+    # Playwright ships regexSource/flags to the driver; only IGNORECASE may be set
+    assert pattern.flags & ~(re.IGNORECASE | re.UNICODE) == 0
+    assert "(?P<" not in pattern.pattern
+    assert url_pattern([]) is None
+
+
+def test_context_route_aborts_blocked_requests():
+    computer = BasePlaywrightComputer()
+    context = FakeContext()
+    computer._setup_context(context)
+
+    [(url, handler)] = context.routes
+    assert isinstance(url, re.Pattern)  # matched in the driver, not with a "**/*" glob
+    route = FakeRoute()
+    handler(route, FakeRequest("https://cdn.evilvideos.com/player.js"))
+    assert route.outcome == "abort" and route.error_code == "blockedbyclient"
+    assert computer.blocked_requests == 1
+
+
+def test_hosts_and_plain_files_with_allowlist(tmp_path):
+    hosts = tmp_path / "hosts"
+    hosts.write_text(
+        "# corporate hosts file\n"
+        "127.0.0.1 localhost\n"
+        "0.0.0.0 ads.example.com tracker.example.net  # two names\n"
+        "::1 ip6-localhost\n"
+    )
+    plain = tmp_path / "plain.txt"
+    plain.write_text("example.org\n*.Wild.test.\n\n10.0.0.1\n")
+    allow = tmp_path / "allow.txt"
+    allow.write_text("docs.example.org\n")
+    blocklist = DomainBlocklist(blocked_files=[hosts, plain], allowed_files=[allow])
+
+    assert len(blocklist) == 4
+    assert blocklist.is_blocked("https://ads.example.com/pixel.gif")
+    assert blocklist.is_blocked("tracker.example.net")
+    assert blocklist.is_blocked("https://x.y.wild.test/")
+    assert not blocklist.is_blocked("https://example.com/")
+    assert not blocklist.is_blocked("http://localhost:5001/")
+    # The most specific listed suffix decides
+    assert blocklist.is_blocked("https://www.example.org/")
+    assert not blocklist.is_blocked("https://docs.example.org/guide")
+    with pytest.raises(ValueError):
+        blocklist.check("https://example.org/")
+
+
+def test_more_specific_block_beats_allow():
+    blocklist = DomainBlocklist(blocked=["example.com", "ads.docs.example.com"], allowed=["docs.example.com"])
+    assert not blocklist.is_blocked("https://docs.example.com/")
+    assert blocklist.is_blocked("https://cdn.ads.docs.example.com/")
+
+
+def test_files_are_hot_reloaded(tmp_path):
+    path = tmp_path / "blocked.txt"
+    path.write_text("one.test\n")
+    blocklist = DomainBlocklist(blocked_files=[path], reload_interval=0)
+    assert blocklist.is_blocked("https://one.test/") and not blocklist.is_blocked("https://two.test/")
+
+    path.write_text("two.test\n")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert not blocklist.is_blocked("https://one.test/")  # cached decision dropped on reload
+    assert blocklist.is_blocked("https://two.test/")
+    assert blocklist.version == 2
+    assert blocklist.reload() is False  # unchanged
+
+
+def test_route_pattern_depends_on_list_size_and_files(tmp_path):
+    assert isinstance(DomainBlocklist(blocked=["a.test"]).route_pattern(), re.Pattern)
+    assert DomainBlocklist().route_pattern() is None
+    many = [f"d{i}.test" for i in range(REGEX_MAX_DOMAINS + 1)]
+    assert DomainBlocklist(blocked=many).route_pattern() == "**/*"
+    path = tmp_path / "blocked.txt"
+    path.write_text("a.test\n")
+    assert DomainBlocklist(blocked_files=[path]).route_pattern() == "**/*"
+
+
+def test_broad_route_lets_allowed_requests_through():
+    computer = BasePlaywrightComputer()
+    computer.blocklist = DomainBlocklist(blocked=[f"d{i}.test" for i in range(REGEX_MAX_DOMAINS + 1)])
+    context = FakeContext()
+    computer._setup_context(context)
+
+    [(url, handler)] = context.routes
+    route = FakeRoute()
+    handler(route, FakeRequest("https://www.saucedemo.com/"))
+    assert route.outcome == "fallback"
@@ -0,0 +1,144 @@
+import itertools
+import time
+
+import pytest
+
+from computers.default import BrowserbaseBrowser
+from computers.default.browserbase_pool import BrowserbaseSessionPool, PooledSession
+from tests.fakes import FakePage, FakePlaywright, FakeRequest
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+class FakeSessionsAPI:
+    """Stand-in for the Browserbase sessions API (client.sessions)."""
+
+    class Session:
+        def __init__(self, id, status="RUNNING"):
+            self.id = id
+            self.connect_url = f"wss://connect.example/{id}"
+            self.status = status
+
+    def __init__(self):
+        self.sessions = {}
+        self.created_with = []
+        self._ids = itertools.count(1)
+
+    def create(self, **params):
+        self.created_with.append(params)
+        session = self.Session(f"s{next(self._ids)}")
+        self.sessions[session.id] = session
+        return session
+
+    def retrieve(self, id):
+        return self.sessions[id]
+
+    def update(self, id, project_id, status):
+        self.sessions[id].status = "COMPLETED"
+
+
+class FakeClient:
+    def __init__(self):
+        self.sessions = FakeSessionsAPI()
+
+
+def make_pool(client, **settings):
+    return BrowserbaseSessionPool.for_browserbase(client, {"project_id": "p"}, **settings)
+
+
+def test_prefilled_sessions_are_reused():
+    client = FakeClient()
+    pool = make_pool(client, size=2, keepalive_interval=3600).start()
+    wait_until(lambda: pool.metrics()["idle"] == 2)
+    assert all(params["keep_alive"] for params in client.sessions.created_with)
+
+    for _ in range(3):
+        pool.release(pool.acquire())
+
+    metrics = pool.metrics()
+    assert metrics["hits"] == 3 and metrics["misses"] == 0
+    assert metrics["created"] == 2 and metrics["reused"] == 1 and metrics["idle"] == 2
+    pool.close()
+    assert all(s.status == "COMPLETED" for s in client.sessions.sessions.values())
+
+
+def test_worn_out_and_dirty_sessions_are_released_and_replaced():
+    client = FakeClient()
+    pool = make_pool(client, size=1, max_uses=1)
+    session = pool.acquire()
+    assert pool.metrics()["misses"] == 1
+    pool.release(session)
+    wait_until(lambda: client.sessions.sessions[session.id].status == "COMPLETED")
+
+    other = pool.acquire()
+    pool.release(PooledSession(other.id, other.connect_url, uses=0), reusable=False)
+    wait_until(lambda: client.sessions.sessions[other.id].status == "COMPLETED")
+    assert pool.metrics()["retired"] == 2
+
+
+def test_keepalive_replaces_dead_sessions():
+    client = FakeClient()
+    pool = make_pool(client, size=2, keepalive_interval=3600).start()
+    live, dead = pool.acquire(), pool.acquire()
+    pool.release(live)
+    pool.release(dead)
+    client.sessions.sessions[dead.id].status = "TIMED_OUT"
+    for session in (live, dead):
+        session.last_ping -= 7200  # due for a ping
+
+    pool.ping_idle()
+
+    metrics = pool.metrics()
+    assert metrics["keepalive_pings"] == 2 and metrics["keepalive_failures"] == 1
+    wait_until(lambda: pool.metrics()["idle"] == 2)
+    assert pool.metrics()["created"] == 3 and pool.acquire() is live
+    pool.close()
+
+
+def test_computer_clears_state_and_returns_session(monkeypatch):
+    monkeypatch.setenv("BROWSERBASE_API_KEY", "test")
+    monkeypatch.delenv("BROWSERBASE_POOL_SIZE", raising=False)
+    pool = make_pool(FakeClient(), size=1)
+    browsers = {}
+
+    computer = BrowserbaseBrowser(pool=pool, virtual_mouse=False)
+    computer._playwright = FakePlaywright(browsers)
+    computer._browser, computer._page = computer._get_browser_and_page()
+    computer._install_page_hooks(computer._page)
+    browser = computer._browser
+    context = browser.contexts[0]
+    assert computer._page.url == "about:blank"  # no start page unless asked for
+
+    computer._page.goto("https://www.saucedemo.com/inventory.html")
+    context.emit("request", FakeRequest("https://www.saucedemo.com/inventory.html"))
+    context.emit("request", FakeRequest("https://cdn.example.com/app.js"))
+    context.emit("request", FakeRequest("data:image/png;base64,AAAA"))
+    context.pages.append(FakePage(context))  # a popup
+
+    playwright = computer._playwright
+    computer.__exit__(None, None, None)
+
+    assert len(context.pages) == 1 and context.pages[0].url == "about:blank"
+    assert context.cookies_cleared == 1
+    assert [params["origin"] for _, params in browser.cdp.sent] == [
+        "https://cdn.example.com", "https://www.saucedemo.com"]
+    assert playwright.stopped and not browser.closed
+    assert pool.metrics()["idle"] == 1
+
+    # The next computer gets the same remote browser back
+    computer = BrowserbaseBrowser(pool=pool, virtual_mouse=False)
+    computer._playwright = FakePlaywright(browsers)
+    computer._browser, computer._page = computer._get_browser_and_page()
+    assert computer._browser is browser and pool.metrics()["reused"] == 1
+
+
+def test_closed_pool_refuses_sessions():
+    pool = make_pool(FakeClient(), size=0)
+    pool.close()
+    with pytest.raises(RuntimeError):
+        pool.acquire()
@@ -0,0 +1,65 @@
+import pytest
+
+from computers.shared.base_playwright import BasePlaywrightComputer
+from tests.fakes import FakeContext, FakeRequest, FakeRoute
+
+UNRECORDED_URL = "https://www.saucedemo.com/static/new.js"
+
+
+def test_record_writes_one_har_per_context(tmp_path):
+    computer = BasePlaywrightComputer()
+    computer.use_har(str(tmp_path / "hars" / "session.har"), mode="record")
+    first, second = FakeContext(), FakeContext()
+
+    computer._setup_context(first)
+    computer._setup_context(second)
+
+    assert first.registered[0] == ("har", str(tmp_path / "hars" / "session.har"),
+                             {"url": None, "update": True, "update_content": "embed"})
+    assert second.registered[0][1] == str(tmp_path / "hars" / "session.1.har")
+    computer._close_har_contexts()
+    assert first.closed and second.closed
+
+
+def test_replay_serves_every_recording_then_applies_policy(tmp_path):
+    for name in ("session.har", "session.1.har", "session.2.har", "other.1.har"):
+        (tmp_path / name).write_text("{}")
+    computer = BasePlaywrightComputer()
+    computer.use_har(str(tmp_path / "session.har"), mode="replay", unmatched="abort")
+    context = FakeContext()
+
+    computer._setup_context(context)
+
+    kinds = [route[0] for route in context.registered]
+    assert kinds == ["route", "har", "har", "har", "route"]  # the blocklist route comes last
+    # The last registered route runs first: the main recording, then the extra ones
+    assert [route[1] for route in context.registered[1:4]] == [
+        str(tmp_path / "session.2.har"), str(tmp_path / "session.1.har"), str(tmp_path / "session.har")]
+    assert all(route[2]["not_found"] == "fallback" for route in context.registered[1:4])
+
+    route = FakeRoute()
+    context.registered[0][2](route, FakeRequest(UNRECORDED_URL))
+    assert route.outcome == "abort"
+    assert computer.har_unmatched_urls == [UNRECORDED_URL]
+
+
+def test_replay_can_let_unmatched_requests_through(tmp_path):
+    (tmp_path / "session.har").write_text("{}")
+    computer = BasePlaywrightComputer()
+    computer.use_har(str(tmp_path / "session.har"), mode="replay", unmatched="network")
+    context = FakeContext()
+    computer._setup_context(context)
+
+    route = FakeRoute()
+    context.registered[0][2](route, FakeRequest(UNRECORDED_URL))
+    assert route.outcome == "continue"
+
+
+def test_invalid_har_settings(tmp_path):
+    computer = BasePlaywrightComputer()
+    with pytest.raises(ValueError):
+        computer.use_har(str(tmp_path / "a.har"), mode="stream")
+    with pytest.raises(ValueError):
+        computer.use_har(str(tmp_path / "a.har"), mode="record", unmatched="retry")
+    with pytest.raises(FileNotFoundError):
+        computer.use_har(str(tmp_path / "missing.har"), mode="replay")
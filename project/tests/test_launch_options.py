@@ -0,0 +1,30 @@
+from computers.default.local_playwright import DEFAULT_JS_HEAP_MB, LOW_MEMORY_ARGS, LocalPlaywrightBrowser
+
+
+def test_headed_keeps_display_and_default_flags(monkeypatch):
+    monkeypatch.delenv("DISPLAY", raising=False)
+    options = LocalPlaywrightBrowser().launch_options()
+
+    assert options["headless"] is False
+    assert options["env"]["DISPLAY"] == ":0"
+    assert not set(LOW_MEMORY_ARGS) & set(options["args"])
+    assert not any(arg.startswith("--js-flags") for arg in options["args"])
+
+
+def test_headless_needs_no_display_and_is_lean():
+    options = LocalPlaywrightBrowser(headless=True).launch_options()
+
+    assert options["headless"] is True
+    assert "env" not in options
+    assert set(LOW_MEMORY_ARGS) <= set(options["args"])
+    assert f"--js-flags=--max-old-space-size={DEFAULT_JS_HEAP_MB}" in options["args"]
+
+
+def test_memory_settings_can_be_overridden():
+    options = LocalPlaywrightBrowser(headless=True, low_memory=False, js_heap_mb=0).launch_options()
+    assert not set(LOW_MEMORY_ARGS) & set(options["args"])
+    assert not any(arg.startswith("--js-flags") for arg in options["args"])
+
+    options = LocalPlaywrightBrowser(low_memory=True, js_heap_mb=128).launch_options()
+    assert options["headless"] is False and "--disable-dev-shm-usage" in options["args"]
+    assert "--js-flags=--max-old-space-size=128" in options["args"]
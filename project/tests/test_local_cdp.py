@@ -0,0 +1,44 @@
+from computers import computers_config
+from computers.contrib import LocalCDPBrowser
+from tests.fakes import FakePlaywright
+
+
+def attach(computer):
+    computer._playwright = FakePlaywright()
+    computer._browser, computer._page = computer._get_browser_and_page()
+    return computer._browser
+
+
+def test_registered_as_local_cdp():
+    assert computers_config["local-cdp"] is LocalCDPBrowser
+
+
+def test_no_launch_settings_for_an_attached_browser():
+    computer = LocalCDPBrowser()
+    assert not computer.headless and not computer.low_memory and computer.js_heap_mb == 0
+
+
+def test_isolated_context_is_closed_but_browser_kept(monkeypatch):
+    monkeypatch.setenv("CDP_URL", "http://chrome:9333")
+    computer = LocalCDPBrowser()
+    browser = attach(computer)
+
+    assert computer._playwright.connected_to == "http://chrome:9333"
+    own_context = browser.contexts[1]
+    assert computer._page.context is own_context and computer._page.viewport == {"width": 1024, "height": 768}
+
+    playwright = computer._playwright
+    computer.__exit__(None, None, None)
+    assert own_context.closed and not browser.contexts[0].closed
+    assert playwright.stopped and not browser.closed
+
+
+def test_reused_default_context_only_loses_our_tabs():
+    computer = LocalCDPBrowser(cdp_url="ws://chrome/devtools/browser/1", reuse_context=True)
+    browser = attach(computer)
+    default_context = browser.contexts[0]
+    user_tab, our_tab = default_context.pages
+
+    assert computer._page is our_tab and len(browser.contexts) == 1
+    computer.__exit__(None, None, None)
+    assert our_tab.closed and not user_tab.closed and not default_context.closed
@@ -0,0 +1,63 @@
+import pytest
+
+from blocklist import DomainBlocklist
+from computers.shared.base_playwright import BasePlaywrightComputer
+from computers.shared.resource_profiles import ResourcePolicy, parse_overrides
+from tests.fakes import FakeContext, FakeRequest, FakeRoute
+
+
+def test_lean_blocks_heavy_types_and_analytics():
+    policy = ResourcePolicy("lean")
+    assert policy.blocks("https://www.saucedemo.com/static/media/backpack.jpg", "image")
+    assert policy.blocks("https://fonts.gstatic.com/s/roboto.woff2", "font")
+    assert policy.blocks("https://www.googletagmanager.com/gtm.js", "script")
+    assert not policy.blocks("https://www.saucedemo.com/static/js/main.js", "script")
+    assert not policy.blocks("https://www.saucedemo.com/static/css/main.css", "stylesheet")
+    assert not policy.blocks("https://www.saucedemo.com/", "document")
+
+    text_only = ResourcePolicy("text-only")
+    assert text_only.blocks("https://www.saucedemo.com/static/css/main.css", "stylesheet")
+    assert not text_only.blocks("https://www.saucedemo.com/api/cart", "fetch")
+
+
+def test_most_specific_override_wins():
+    policy = ResourcePolicy("text-only", {"saucedemo.com": "full", "cdn.saucedemo.com": "lean"})
+    assert not policy.blocks("https://www.saucedemo.com/static/css/main.css", "stylesheet")
+    assert not policy.blocks("https://www.saucedemo.com/img/backpack.jpg", "image")
+    assert policy.blocks("https://img.cdn.saucedemo.com/backpack.jpg", "image")
+    assert not policy.blocks("https://img.cdn.saucedemo.com/main.css", "stylesheet")
+    assert policy.blocks("https://example.com/main.css", "stylesheet")
+    assert policy.describe() == {
+        "name": "text-only",
+        "description": policy.profile.description,
+        "overrides": {"saucedemo.com": "full", "cdn.saucedemo.com": "lean"},
+    }
+
+
+def test_parse_overrides():
+    assert parse_overrides(" WWW.SauceDemo.com = full , cdn.example.com=text-only,") == {
+        "www.saucedemo.com": "full", "cdn.example.com": "text-only"}
+    with pytest.raises(ValueError):
+        parse_overrides("www.saucedemo.com")
+    with pytest.raises(ValueError):
+        parse_overrides("www.saucedemo.com=minimal")
+
+
+def test_route_is_installed_only_when_something_can_be_skipped():
+    computer = BasePlaywrightComputer()
+    computer.blocklist = DomainBlocklist()  # leave only the resource route
+    context = FakeContext()
+    computer._setup_context(context)
+    assert context.routes == []
+
+    computer.use_resource_profile("lean", {"www.saucedemo.com": "full"})
+    context = FakeContext()
+    computer._setup_context(context)
+    [(url, handler)] = context.routes
+    assert url == "**/*"
+
+    image, page_image = FakeRoute(), FakeRoute()
+    handler(image, FakeRequest("https://images.example.com/hero.png", "image"))
+    handler(page_image, FakeRequest("https://www.saucedemo.com/img/backpack.jpg", "image"))
+    assert (image.outcome, page_image.outcome) == ("abort", "fallback")
+    assert computer.resource_blocked == {"image": 1}
@@ -0,0 +1,74 @@
+import base64
+
+from tests.fakes import FakePage
+from tests.fakes import make_computer as make_fake_computer
+
+
+def emit_frame(session, data, session_id):
+    session.emit("Page.screencastFrame", {"data": base64.b64encode(data).decode(), "sessionId": session_id})
+
+
+class FakeChannel:
+    max_fps = 0
+    quality = 50
+    max_width = 800
+    max_height = None
+
+    def __init__(self):
+        self.viewers = 0
+        self.frames = []
+
+    def wanted(self):
+        return self.viewers > 0
+
+    def publish(self, frame):
+        self.frames.append(frame)
+
+
+def make_computer():
+    computer = make_fake_computer()
+    computer.screencast = FakeChannel()
+    return computer
+
+
+def test_screencast_follows_viewers_and_pages():
+    computer = make_computer()
+    computer._sync_screencast()
+    assert computer._cdp_sessions == {}  # nobody watching: no CDP traffic at all
+
+    computer.screencast.viewers = 1
+    computer._sync_screencast()
+    session = computer._cdp_sessions[computer._page]
+    assert session.sent == [("Page.startScreencast", {"format": "jpeg", "quality": 50, "everyNthFrame": 1, "maxWidth": 800})]
+
+    emit_frame(session, b"jpeg", 7)
+    assert computer.screencast.frames == [b"jpeg"]
+    assert session.sent[-1] == ("Page.screencastFrameAck", {"sessionId": 7})
+
+    # The agent switched tabs: the stream moves to the new page
+    old_page, computer._page = computer._page, FakePage()
+    computer._sync_screencast()
+    assert session.sent[-1] == ("Page.stopScreencast", None) and session.listeners == {}
+    new_session = computer._cdp_sessions[computer._page]
+    assert new_session.sent[0][0] == "Page.startScreencast"
+
+    computer.screencast.viewers = 0
+    computer._sync_screencast()
+    assert new_session.sent[-1] == ("Page.stopScreencast", None)
+    assert computer._screencast_page is None
+
+
+def test_frame_rate_limit_drops_but_acks_frames():
+    computer = make_computer()
+    computer.screencast.max_fps = 1
+    computer.screencast.viewers = 1
+    computer._sync_screencast()
+    session = computer._cdp_sessions[computer._page]
+
+    for i in range(5):
+        emit_frame(session, f"jpeg-{i}".encode(), i)
+
+    assert computer.screencast.frames == [b"jpeg-0"]
+    assert computer.screencast_dropped == 4
+    acks = [params["sessionId"] for method, params in session.sent if method == "Page.screencastFrameAck"]
+    assert acks == [0, 1, 2, 3, 4]
@@ -0,0 +1,67 @@
+import base64
+
+import pytest
+
+from agent import Agent
+from tests.fakes import FakeCDPSession, FakeContext, FakePage
+from tests.fakes import make_computer as make_fake_computer
+
+
+def capturing_session():
+    return FakeCDPSession({"Page.captureScreenshot": lambda params: {"data": f"cdp-{params['format']}"}})
+
+
+def make_computer(cdp=True):
+    computer = make_fake_computer(FakePage(FakeContext(capturing_session if cdp else None)))
+    computer.settle_timeout_ms = 0
+    return computer
+
+
+def test_one_cdp_session_per_page_returns_base64_as_is():
+    computer = make_computer()
+    computer.set_screenshot_format("jpeg", quality=60)
+
+    assert computer.screenshot() == "cdp-jpeg"
+    assert computer.screenshot() == "cdp-jpeg"
+
+    [session] = computer._page.context.cdp_sessions
+    assert session.sent[0] == ("Page.captureScreenshot", {
+        "format": "jpeg", "quality": 60, "fromSurface": True, "captureBeyondViewport": False})
+    assert computer.screenshot_mime_type == "image/jpeg"
+    assert computer._page.screenshots == []
+    assert computer.screenshot_stats()["cdp"]["count"] == 2
+
+    # A closed page drops its session
+    computer._page.emit("close", computer._page)
+    assert computer._cdp_sessions == {}
+
+
+def test_failed_capture_falls_back_and_reopens_the_session():
+    computer = make_computer()
+    computer._cdp_session(computer._page).fail = True
+
+    assert computer.screenshot() == base64.b64encode(b"playwright-png").decode()
+    assert computer.screenshot() == "cdp-png"
+    assert len(computer._page.context.cdp_sessions) == 2
+    assert set(computer.screenshot_stats()) == {"cdp", "playwright"}
+
+
+def test_without_cdp_webp_falls_back_to_png():
+    computer = make_computer(cdp=False)
+    computer.set_screenshot_format("webp")
+
+    assert computer.screenshot() == base64.b64encode(b"playwright-png").decode()
+    assert computer.screenshot_mime_type == "image/png"
+    computer.screenshot()
+    assert computer._cdp_unavailable and computer._page.screenshots == [("png", None), ("png", None)]
+
+    with pytest.raises(ValueError):
+        computer.set_screenshot_format("gif")
+
+
+def test_agent_data_uri_follows_the_screenshot_format():
+    computer = make_computer()
+    computer.set_screenshot_format("webp")
+    agent = Agent(computer=computer)
+
+    assert agent.image_url(computer.screenshot()) == "data:image/webp;base64,cdp-webp"
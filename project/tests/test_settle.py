@@ -0,0 +1,82 @@
+import base64
+import time
+
+from tests.fakes import FakePage
+from tests.fakes import make_computer as make_fake_computer
+
+
+class SettlingPage(FakePage):
+    """Returns scripted frames and page states; each wait runs the scheduled callbacks."""
+
+    def __init__(self, frames, states=None, on_wait=None):
+        super().__init__(frames=frames)
+        self.states = list(states or [])
+        self.on_wait = on_wait or (lambda waits: None)
+        self.waits = 0
+
+    def evaluate(self, script):
+        if self.states:
+            return self.states.pop(0)
+        return {"ready": True, "animations": 0}
+
+    def wait_for_timeout(self, ms):
+        self.waits += 1
+        time.sleep(ms / 1000)
+        self.on_wait(self.waits)
+
+
+def make_computer(page):
+    computer = make_fake_computer(page)
+    computer.SETTLE_POLL_MS = 5
+    computer._cdp_unavailable = True  # frames come from page.screenshot()
+    computer._track_requests(page.context)
+    return computer
+
+
+def b64(frame):
+    return base64.b64encode(frame).decode("utf-8")
+
+
+def test_settles_on_two_identical_frames():
+    page = SettlingPage([b"loading", b"half", b"done", b"done"])
+    computer = make_computer(page)
+
+    assert computer.screenshot() == b64(b"done")
+    assert len(page.screenshots) == 4
+
+
+def test_waits_for_requests_and_animations():
+    request = object()
+    page = SettlingPage(
+        [b"done"],
+        states=[{"ready": False, "animations": 0}, {"ready": True, "animations": 2}],
+        on_wait=lambda waits: waits == 2 and page.context.emit("requestfinished", request),
+    )
+    computer = make_computer(page)
+    page.context.emit("request", request)
+
+    assert computer.settle() == b64(b"done")
+    # No frames are taken while the request is pending or the page is busy
+    assert len(page.screenshots) == 2
+    assert page.waits == 5
+
+
+def test_gives_up_after_timeout_with_latest_frame():
+    page = SettlingPage([str(i).encode() for i in range(1000)])
+    computer = make_computer(page)
+
+    started = time.monotonic()
+    frame = computer.settle(timeout_ms=50)
+
+    assert time.monotonic() - started < 1
+    assert frame == b64(str(len(page.screenshots) - 1).encode())
+
+
+def test_long_polling_requests_do_not_block():
+    page = SettlingPage([b"done"])
+    computer = make_computer(page)
+    page.context.emit("request", "long-poll")
+    computer._pending_requests["long-poll"] -= 10  # started ten seconds ago
+
+    assert computer.settle(timeout_ms=1000) == b64(b"done")
+    assert len(page.screenshots) == 2
@@ -0,0 +1,78 @@
+import pytest
+
+from tests.fakes import FakeCDPSession, FakeContext, FakePage
+from tests.fakes import make_computer as make_fake_computer
+
+LONG_TEXT = "The quick brown fox jumps over the lazy dog. " * 4
+
+TEXTAREA = {"type": "object", "subtype": "node", "objectId": "1", "description": "textarea#comments"}
+INPUT = {"type": "object", "subtype": "node", "objectId": "2", "description": "input#user-name"}
+NOTHING = {"type": "object", "subtype": "null", "value": None}
+
+
+def make_computer(field=TEXTAREA, listeners=(), cdp=True):
+    session = FakeCDPSession({
+        "Runtime.evaluate": {"result": field},
+        "DOMDebugger.getEventListeners": {"listeners": [{"type": t} for t in listeners]},
+    })
+    return make_fake_computer(FakePage(FakeContext((lambda: session) if cdp else None)))
+
+
+def cdp_methods(computer):
+    return [method for session in computer._page.context.cdp_sessions for method in session.methods]
+
+
+def entered(computer):
+    return computer._page.calls
+
+
+def test_auto_inserts_long_text_into_plain_fields():
+    computer = make_computer(listeners=["input", "change", "focus"])
+    computer.type(LONG_TEXT)
+    assert entered(computer) == [("insert", LONG_TEXT)]
+    assert cdp_methods(computer)[-1] == "Runtime.releaseObjectGroup"
+
+
+def test_auto_types_into_fields_with_key_listeners():
+    computer = make_computer(listeners=["input", "keydown"])
+    computer.type(LONG_TEXT)
+    assert entered(computer) == [("type", LONG_TEXT)]
+
+
+def test_auto_types_short_text_without_checking():
+    computer = make_computer()
+    computer.type("standard_user")
+    assert entered(computer) == [("type", "standard_user")]
+    assert cdp_methods(computer) == []
+
+
+@pytest.mark.parametrize("field, text", [
+    (NOTHING, LONG_TEXT),  # no editable element focused
+    (INPUT, LONG_TEXT + "\n"),  # Enter would submit the form
+])
+def test_auto_types_when_insert_would_differ(field, text):
+    computer = make_computer(field=field)
+    computer.type(text)
+    assert entered(computer) == [("type", text)]
+
+
+def test_auto_types_without_cdp():
+    computer = make_computer(cdp=False)
+    computer.type(LONG_TEXT)
+    assert entered(computer) == [("type", LONG_TEXT)]
+
+
+def test_configured_per_computer():
+    computer = make_computer(listeners=["keydown"])
+    computer.set_type_mode("insert")
+    computer.type("hi")
+    computer.set_type_mode("keys")
+    computer.type(LONG_TEXT)
+    assert entered(computer) == [("insert", "hi"), ("type", LONG_TEXT)]
+
+    computer = make_computer()
+    computer.set_type_mode("auto", min_chars=1)
+    computer.type("hi")
+    assert entered(computer) == [("insert", "hi")]
+    with pytest.raises(ValueError):
+        computer.set_type_mode("paste")
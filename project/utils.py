@@ -6,7 +6,7 @@ import base64
 from PIL import Image
 from io import BytesIO
 import io
-from urllib.parse import urlparse
+from blocklist import DomainBlocklist
 
 load_dotenv(override=True)
 
@@ -19,6 +19,9 @@ BLOCKED_DOMAINS = [
     "ilanbigio.com",
 ]
 
+# BLOCKED_DOMAINS plus any lists named by BLOCKLIST_FILES / BLOCKLIST_ALLOW_FILES / BLOCKLIST_ALLOW
+BLOCKLIST = DomainBlocklist.from_env(BLOCKED_DOMAINS)
+
 
 def pp(obj):
     print(json.dumps(obj, indent=4))
@@ -47,8 +50,10 @@ def sanitize_message(msg: dict) -> dict:
     return msg
 
 
-def create_response(**kwargs):
-    url = "https://api.openai.com/v1/responses"
+RESPONSES_URL = "https://api.openai.com/v1/responses"
+
+
+def _responses_headers():
     headers = {
         "Authorization": f"Bearer {os.getenv('OPENAI_API_KEY')}",
         "Content-Type": "application/json"
@@ -57,8 +62,21 @@ def create_response(**kwargs):
     openai_org = os.getenv("OPENAI_ORG")
     if openai_org:
         headers["Openai-Organization"] = openai_org
+    return headers
+
+
+def create_response(**kwargs):
+    response = requests.post(RESPONSES_URL, headers=_responses_headers(), json=kwargs)
+
+    if response.status_code != 200:
+        print(f"Error: {response.status_code} {response.text}")
+
+    return response.json()
+
 
-    response = requests.post(url, headers=headers, json=kwargs)
+def create_response_from_body(body: bytes):
+    """create_response() for a request already encoded as JSON (see agent/request_body.py)."""
+    response = requests.post(RESPONSES_URL, headers=_responses_headers(), data=body)
 
     if response.status_code != 200:
         print(f"Error: {response.status_code} {response.text}")
@@ -68,9 +86,4 @@ def create_response(**kwargs):
 
 def check_blocklisted_url(url: str) -> None:
     """Raise ValueError if the given URL (including subdomains) is in the blocklist."""
-    hostname = urlparse(url).hostname or ""
-    if any(
-        hostname == blocked or hostname.endswith(f".{blocked}")
-        for blocked in BLOCKED_DOMAINS
-    ):
-        raise ValueError(f"Blocked URL: {url}")
+    BLOCKLIST.check(url)
@@ -1,12 +1,24 @@
 """
 Extract Screenshots from Test Case Report
 Saves all screenshots from the JSON report to individual PNG files
+Files that already exist with identical content are left untouched
 """
 
-import json
+import itertools
 import os
-import base64
-from datetime import datetime
+
+from report_reader import DEFER, ReportReader
+
+from screenshot_export import (
+    DEFAULT_WORKERS,
+    ERROR,
+    MISSING,
+    TRUNCATED,
+    UNCHANGED,
+    WRITTEN,
+    ExportStats,
+    iter_export_screenshots,
+)
 
 REPORT_FILE = os.path.join(os.path.dirname(__file__), 'test_reports', 'test_case_report.json')
 SCREENSHOTS_DIR = os.path.join(os.path.dirname(__file__), 'test_reports', 'screenshots')
@@ -17,21 +29,20 @@ def ensure_screenshots_directory():
         os.makedirs(SCREENSHOTS_DIR)
         print(f"✅ Created directory: {SCREENSHOTS_DIR}")
 
-def extract_screenshots():
-    """Extract all screenshots from the JSON report."""
+def extract_screenshots(max_workers=DEFAULT_WORKERS):
+    """Extract all screenshots from the JSON report using a pool of `max_workers` threads."""
     if not os.path.exists(REPORT_FILE):
         print(f"❌ Report file not found: {REPORT_FILE}")
         return
     
-    # Load report
-    with open(REPORT_FILE, 'r', encoding='utf-8') as f:
-        report = json.load(f)
-    
-    test_cases = report.get('test_cases', [])
+    # Stream the report; screenshots are only read back from disk by the export workers
+    test_cases = ReportReader(REPORT_FILE).iter_test_cases(screenshots=DEFER)
+    first_test_case = next(test_cases, None)
     
-    if not test_cases:
+    if first_test_case is None:
         print("❌ No test cases found in report")
         return
+    test_cases = itertools.chain([first_test_case], test_cases)
     
     ensure_screenshots_directory()
     
@@ -39,48 +50,29 @@ def extract_screenshots():
     print(f"  EXTRACTING SCREENSHOTS FROM TEST REPORT")
     print(f"{'='*70}\n")
     
-    success_count = 0
-    error_count = 0
+    stats = ExportStats()
     
-    for i, tc in enumerate(test_cases, 1):
+    for i, (tc, outcome) in enumerate(iter_export_screenshots(test_cases, SCREENSHOTS_DIR, max_workers), 1):
         test_number = tc.get('test_case_number', 'Unknown')
         test_name = tc.get('test_case_name', 'Unknown')
-        executed_at = tc.get('executed_at', datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-        screenshot_data = tc.get('screenshot', '')
+        stats.add(outcome)
         
         print(f"{i}. Processing Test Case {test_number} - {test_name}")
         
-        if not screenshot_data:
+        status = outcome['status']
+        if status == MISSING:
             print(f"   ⚠️  No screenshot data available")
-            error_count += 1
-            continue
-        
-        try:
-            # Handle truncated screenshots (backward compatibility)
-            if screenshot_data.endswith('...'):
-                print(f"   ⚠️  Screenshot is truncated (old format), skipping")
-                error_count += 1
-                continue
-            
-            # Create safe filename
-            safe_tc_number = test_number.replace('.', '_')
-            safe_timestamp = executed_at.replace(':', '-').replace(' ', '_')
-            screenshot_filename = f"TC_{safe_tc_number}_{safe_timestamp}.png"
-            screenshot_path = os.path.join(SCREENSHOTS_DIR, screenshot_filename)
-            
-            # Decode and save
-            screenshot_bytes = base64.b64decode(screenshot_data)
-            
-            with open(screenshot_path, 'wb') as img_file:
-                img_file.write(screenshot_bytes)
-            
-            file_size_kb = len(screenshot_bytes) / 1024
-            print(f"   ✅ Saved: {screenshot_filename} ({file_size_kb:.1f} KB)")
-            success_count += 1
-            
-        except Exception as e:
-            print(f"   ❌ Error: {str(e)}")
-            error_count += 1
+        elif status == TRUNCATED:
+            print(f"   ⚠️  Screenshot is truncated (old format), skipping")
+        elif status == ERROR:
+            print(f"   ❌ Error: {outcome['error']}")
+        elif status == UNCHANGED:
+            print(f"   ⏭️  Unchanged: {outcome['filename']} ({outcome['bytes'] / 1024:.1f} KB)")
+        else:
+            print(f"   ✅ Saved: {outcome['filename']} ({outcome['bytes'] / 1024:.1f} KB)")
+    
+    success_count = stats.counts[WRITTEN] + stats.counts[UNCHANGED]
+    error_count = stats.counts[MISSING] + stats.counts[TRUNCATED] + stats.counts[ERROR]
     
     print(f"\n{'='*70}")
     print(f"  EXTRACTION COMPLETE")
@@ -90,6 +82,7 @@ def extract_screenshots():
     if error_count > 0:
         print(f"⚠️  Errors/Skipped: {error_count} screenshots")
     
+    stats.print_summary()
     print(f"\n📁 Screenshots location: {SCREENSHOTS_DIR}")
 
 if __name__ == '__main__':
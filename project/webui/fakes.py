@@ -0,0 +1,49 @@
+"""
+Stand-ins for the computer and agent that session setups drive, shared by the tests.
+"""
+
+
+class FakeComputer:
+    """Keeps the current URL; a saved state is just the URL it was saved at."""
+
+    def __init__(self):
+        self.url = "about:blank"
+        self.snapshots = {}
+        self.restored = []
+
+    def get_current_url(self):
+        return self.url
+
+    def settle(self):
+        pass
+
+    def has_state(self, name):
+        return name in self.snapshots
+
+    def save_state(self, name):
+        self.snapshots[name] = self.url
+
+    def restore_state(self, name=None, url=None):
+        self.restored.append(name)
+        self.url = url or self.snapshots.get(name) or "about:blank"
+
+
+class FakeAgent:
+    """
+    Records each prompt and answers DONE. After turn n the computer is at
+    `navigate(n)`; without `navigate` it stays where it is.
+    """
+
+    budget = None
+    loop_detector = None
+
+    def __init__(self, computer, navigate=None):
+        self.computer = computer
+        self.navigate = navigate
+        self.prompts = []
+
+    def run_full_turn(self, input_items, print_steps=True):
+        self.prompts.append(input_items[-1]["content"])
+        if self.navigate:
+            self.computer.url = self.navigate(len(self.prompts))
+        return [{"type": "message", "role": "assistant", "content": [{"type": "output_text", "text": "DONE"}]}]
@@ -2,192 +2,197 @@
 """
 Generate HTML Report for Last Test Session
 Creates a professional, presentable HTML report showing ALL test cases from the most recent test execution session.
+
+The page is streamed to disk one test case at a time. By default screenshots are
+written next to the report as full-size PNGs plus small JPEG thumbnails, and the
+page only references them (`loading="lazy"`), so the HTML stays small no matter
+how many test cases the session has. Pass `single_file=True` (or `--single-file`)
+to inline the screenshots instead and get one self-contained file.
 """
 
-import json
+import argparse
+import base64
+import html
+import io
+import itertools
 import os
+import re
+import time
+import tracemalloc
 from datetime import datetime
 
-def generate_html_report(json_file_path, output_html_path=None):
-    """
-    Generate HTML report for all test cases from the last session in the JSON report file.
-    
-    Args:
-        json_file_path: Path to test_case_report.json
-        output_html_path: Optional path for output HTML file (default: last_session_report.html)
-    """
-    # Read the JSON report
-    with open(json_file_path, 'r', encoding='utf-8') as f:
-        report_data = json.load(f)
-    
-    # Get all test cases from the current session
-    if not report_data.get('test_cases'):
-        print("No test cases found in the report.")
-        return
-    
-    test_cases = report_data['test_cases']
-    session_id = report_data.get('session_id', 'Unknown')
-    execution_date = report_data.get('execution_date', 'Unknown')
-    summary = report_data.get('summary', {})
-    
-    # Determine output path
-    if output_html_path is None:
-        output_html_path = os.path.join(
-            os.path.dirname(json_file_path),
-            'last_session_report.html'
-        )
-    
-    # Generate HTML
-    html_content = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Test Session Report - {session_id}</title>
-    <style>
-        * {{
+from PIL import Image
+
+from report_reader import ReportReader
+
+# Bounding box for the thumbnails embedded in the page (full images are linked)
+THUMBNAIL_SIZE = (480, 360)
+THUMBNAIL_QUALITY = 80
+
+# Directory (relative to the HTML file) holding the externalised screenshots
+ASSETS_DIRNAME = 'report_assets'
+
+# Characters replaced in the screenshot file names derived from test case fields
+UNSAFE_FILENAME_CHARS = re.compile(r'[^A-Za-z0-9_-]')
+
+# Bytes reserved for the summary cards so they can be rewritten in place
+SUMMARY_BLOCK_BYTES = 2048
+
+# Longest resource override list shown on the summary card, in bytes of HTML,
+# so the largest summary still fits SUMMARY_BLOCK_BYTES
+OVERRIDES_MAX_BYTES = 200
+
+REPORT_CSS = """
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             padding: 20px;
             min-height: 100vh;
-        }}
+        }
         
-        .container {{
+        .container {
             max-width: 1400px;
             margin: 0 auto;
             background: white;
             border-radius: 12px;
             box-shadow: 0 20px 60px rgba(0, 0, 0, 0.3);
             overflow: hidden;
-        }}
+        }
         
-        .header {{
+        .header {
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: white;
             padding: 40px;
             text-align: center;
-        }}
+        }
         
-        .header h1 {{
+        .header h1 {
             font-size: 2.5em;
             margin-bottom: 10px;
             font-weight: 700;
-        }}
+        }
         
-        .header .session-info {{
+        .header .session-info {
             font-size: 1em;
             opacity: 0.9;
             margin-top: 15px;
-        }}
+        }
         
-        .summary {{
+        .summary {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
             gap: 20px;
             padding: 30px 40px;
             background: #f8f9fa;
             border-bottom: 2px solid #e9ecef;
-        }}
+        }
         
-        .summary-card {{
+        .summary-card {
             background: white;
             padding: 20px;
             border-radius: 8px;
             text-align: center;
             box-shadow: 0 2px 8px rgba(0,0,0,0.1);
             transition: transform 0.2s;
-        }}
+        }
         
-        .summary-card:hover {{
+        .summary-card:hover {
             transform: translateY(-2px);
             box-shadow: 0 4px 12px rgba(0,0,0,0.15);
-        }}
+        }
         
-        .summary-card .label {{
+        .summary-card .label {
             font-size: 0.9em;
             color: #6c757d;
             text-transform: uppercase;
             letter-spacing: 1px;
             margin-bottom: 8px;
-        }}
+        }
         
-        .summary-card .value {{
+        .summary-card .value {
             font-size: 2em;
             font-weight: 700;
             color: #212529;
-        }}
+        }
         
-        .summary-card.passed .value {{
+        .summary-card.passed .value {
             color: #10b981;
-        }}
+        }
         
-        .summary-card.failed .value {{
+        .summary-card.failed .value {
             color: #ef4444;
-        }}
+        }
         
-        .summary-card.unknown .value {{
+        .summary-card.unknown .value {
             color: #f59e0b;
-        }}
+        }
+        
+        .summary-card.usage .value,
+        .summary-card.resources .value {
+            font-size: 0.95em;
+            font-weight: 500;
+            line-height: 1.6;
+        }
         
-        .test-cases {{
+        .test-cases {
             padding: 40px;
-        }}
+        }
         
-        .test-case {{
+        .test-case {
             background: #ffffff;
             border: 2px solid #e5e7eb;
             border-radius: 8px;
             margin-bottom: 30px;
             overflow: hidden;
             transition: all 0.3s;
-        }}
+        }
         
-        .test-case:hover {{
+        .test-case:hover {
             box-shadow: 0 4px 20px rgba(0,0,0,0.1);
             transform: translateY(-2px);
-        }}
+        }
         
-        .test-case-header {{
+        .test-case-header {
             padding: 20px 30px;
             display: flex;
             justify-content: space-between;
             align-items: center;
             border-bottom: 2px solid #e5e7eb;
             cursor: pointer;
-        }}
+        }
         
-        .test-case-header:hover {{
+        .test-case-header:hover {
             background: #f9fafb;
-        }}
+        }
         
-        .test-case-title {{
+        .test-case-title {
             display: flex;
             align-items: center;
             gap: 15px;
-        }}
+        }
         
-        .test-case-number {{
+        .test-case-number {
             background: #667eea;
             color: white;
             padding: 8px 16px;
             border-radius: 6px;
             font-weight: 600;
             font-size: 0.9em;
-        }}
+        }
         
-        .test-case-name {{
+        .test-case-name {
             font-size: 1.2em;
             font-weight: 600;
             color: #1f2937;
-        }}
+        }
         
-        .status-badge {{
+        .status-badge {
             padding: 8px 20px;
             border-radius: 20px;
             font-weight: 600;
@@ -195,72 +200,72 @@ def generate_html_report(json_file_path, output_html_path=None):
             display: inline-flex;
             align-items: center;
             gap: 8px;
-        }}
+        }
         
-        .status-badge.pass {{
+        .status-badge.pass {
             background: #d1fae5;
             color: #065f46;
-        }}
+        }
         
-        .status-badge.fail {{
+        .status-badge.fail {
             background: #fee2e2;
             color: #991b1b;
-        }}
+        }
         
-        .status-badge.unknown {{
+        .status-badge.unknown {
             background: #fef3c7;
             color: #92400e;
-        }}
+        }
         
-        .test-case-body {{
+        .test-case-body {
             padding: 30px;
             display: none;
-        }}
+        }
         
-        .test-case-body.expanded {{
+        .test-case-body.expanded {
             display: block;
-        }}
+        }
         
-        .section {{
+        .section {
             margin-bottom: 30px;
-        }}
+        }
         
-        .section-title {{
+        .section-title {
             font-size: 1.1em;
             font-weight: 600;
             color: #374151;
             margin-bottom: 15px;
             padding-bottom: 8px;
             border-bottom: 2px solid #e5e7eb;
-        }}
+        }
         
-        .meta-info {{
+        .meta-info {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
             gap: 15px;
             margin-bottom: 25px;
-        }}
+        }
         
-        .meta-item {{
+        .meta-item {
             display: flex;
             flex-direction: column;
-        }}
+        }
         
-        .meta-label {{
+        .meta-label {
             font-size: 0.85em;
             color: #6b7280;
             text-transform: uppercase;
             letter-spacing: 0.5px;
             margin-bottom: 5px;
-        }}
+        }
         
-        .meta-value {{
+        .meta-value {
             font-size: 1em;
             color: #1f2937;
             font-weight: 500;
-        }}
+        }
         
-        .instructions {{
+        .instructions {
             background: #f9fafb;
             border-left: 4px solid #667eea;
             padding: 20px;
@@ -270,9 +275,9 @@ def generate_html_report(json_file_path, output_html_path=None):
             font-size: 0.9em;
             line-height: 1.6;
             color: #374151;
-        }}
+        }
         
-        .terminal-output {{
+        .terminal-output {
             background: #1f2937;
             color: #10b981;
             padding: 20px;
@@ -284,52 +289,72 @@ def generate_html_report(json_file_path, output_html_path=None):
             overflow-y: auto;
             white-space: pre-wrap;
             word-wrap: break-word;
-        }}
+        }
         
-        .screenshot {{
+        .screenshot {
             text-align: center;
             margin-top: 20px;
-        }}
+        }
         
-        .screenshot img {{
+        .screenshot img {
             max-width: 100%;
             border-radius: 8px;
             box-shadow: 0 4px 12px rgba(0,0,0,0.2);
             border: 1px solid #e5e7eb;
-        }}
+        }
         
-        .expand-icon {{
+        .expand-icon {
             transition: transform 0.3s;
             font-size: 1.2em;
             color: #6b7280;
-        }}
+        }
         
-        .test-case-header.expanded .expand-icon {{
+        .test-case-header.expanded .expand-icon {
             transform: rotate(180deg);
-        }}
+        }
         
-        .footer {{
+        .footer {
             text-align: center;
             padding: 30px;
             background: #f9fafb;
             color: #6b7280;
             font-size: 0.9em;
             border-top: 2px solid #e5e7eb;
-        }}
+        }
         
-        @media print {{
-            body {{
+        @media print {
+            body {
                 background: white;
                 padding: 0;
-            }}
-            .container {{
+            }
+            .container {
                 box-shadow: none;
-            }}
-            .test-case {{
+            }
+            .test-case {
                 page-break-inside: avoid;
-            }}
-        }}
-    </style>
+            }
+        }
+        
+        .screenshot .full-link {
+            display: block;
+            margin-top: 10px;
+            font-size: 0.9em;
+            color: #667eea;
+        }
+"""
+
+
+def render_page_head(session_id, execution_date):
+    """Render everything from the doctype up to (not including) the summary cards."""
+    session_id = html.escape(str(session_id))
+    execution_date = html.escape(str(execution_date))
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Test Session Report - {session_id}</title>
+    <style>{REPORT_CSS}    </style>
 </head>
 <body>
     <div class="container">
@@ -341,10 +366,46 @@ def generate_html_report(json_file_path, output_html_path=None):
             </div>
         </div>
         
-        <div class="summary">
+"""
+
+
+def render_usage(usage):
+    """Render the model usage totals card (empty for reports without usage)."""
+    if not usage:
+        return ''
+    return f"""            <div class="summary-card usage">
+                <div class="label">Usage</div>
+                <div class="value">{usage.get('model_calls', 0)} model calls<br>
+                    {usage.get('input_tokens', 0):,} in / {usage.get('output_tokens', 0):,} out tokens<br>
+                    {usage.get('upload_bytes', 0) / (1024 * 1024):.1f} MB sent &middot; {usage.get('wall_seconds', 0):.0f}s</div>
+            </div>
+"""
+
+
+def render_resource_profile(profile):
+    """Render the resource profile card; nothing for "full" sessions or older reports."""
+    if not profile or (profile.get('name') == 'full' and not profile.get('overrides')):
+        return ''
+    overrides = ', '.join(f"{domain}: {name}" for domain, name in sorted(profile.get('overrides', {}).items()))
+    escaped = html.escape(overrides)
+    # Cut the text, not the escaped HTML, so no entity is split
+    while len(escaped.encode('utf-8')) > OVERRIDES_MAX_BYTES:
+        overrides = overrides[:-1]
+        escaped = html.escape(overrides) + '…'
+    overrides_html = f"<br>\n                    Overrides: {escaped}" if overrides else ''
+    return f"""            <div class="summary-card resources">
+                <div class="label">Resources: {html.escape(str(profile.get('name')))}</div>
+                <div class="value">{html.escape(str(profile.get('description', '')))}{overrides_html}</div>
+            </div>
+"""
+
+
+def render_summary(summary, total_tests):
+    """Render the summary cards block."""
+    return f"""        <div class="summary">
             <div class="summary-card">
                 <div class="label">Total Tests</div>
-                <div class="value">{summary.get('total_tests', len(test_cases))}</div>
+                <div class="value">{summary.get('total_tests', total_tests)}</div>
             </div>
             <div class="summary-card passed">
                 <div class="label">Passed</div>
@@ -362,26 +423,61 @@ def generate_html_report(json_file_path, output_html_path=None):
                 <div class="label">Pass Rate</div>
                 <div class="value">{summary.get('pass_rate', '0%')}</div>
             </div>
-        </div>
-        
+{render_usage(summary.get('usage'))}{render_resource_profile(summary.get('resource_profile'))}        </div>
+"""
+
+
+def render_summary_block(summary, total_tests):
+    """
+    Render the summary cards as UTF-8 bytes padded to SUMMARY_BLOCK_BYTES.
+
+    The fixed size lets a writer reserve the block up front and overwrite it in
+    place once the final numbers are known.
+    """
+    block = render_summary(summary, total_tests).encode('utf-8')
+    if len(block) > SUMMARY_BLOCK_BYTES:
+        raise ValueError(f"Summary block is {len(block)} bytes, exceeds {SUMMARY_BLOCK_BYTES}")
+    return block.ljust(SUMMARY_BLOCK_BYTES)
+
+
+def render_test_cases_open():
+    return """        
         <div class="test-cases">
 """
-    
-    # Add each test case
-    for idx, test_case in enumerate(test_cases, 1):
-        test_number = test_case.get('test_case_number', f'TC-{idx}')
-        test_name = test_case.get('test_case_name', 'Unnamed Test')
-        result = test_case.get('result', 'Unknown')
-        executed_at = test_case.get('executed_at', 'Unknown')
-        instructions = test_case.get('instructions', 'No instructions provided')
-        terminal_output = test_case.get('terminal_output', 'No output available')
-        screenshot = test_case.get('screenshot', '')
-        
-        # Determine status styling
-        status_class = result.lower()
-        status_icon = '✓' if result == 'Pass' else '✗' if result == 'Fail' else '?'
-        
-        html_content += f"""
+
+
+def render_test_case(test_case, idx, screenshot_html=''):
+    """
+    Render one collapsible test case block.
+
+    Args:
+        test_case: Test case entry from the JSON report
+        idx: 1-based position of the test case in the session
+        screenshot_html: Pre-rendered screenshot section (see render_screenshot)
+    """
+    test_number = html.escape(str(test_case.get('test_case_number') or f'TC-{idx}'))
+    test_name = html.escape(str(test_case.get('test_case_name') or 'Unnamed Test'))
+    result = test_case.get('result') or 'Unknown'
+    executed_at = html.escape(str(test_case.get('executed_at', 'Unknown')))
+    instructions = html.escape(test_case.get('instructions') or 'No instructions provided')
+    terminal_output = html.escape(test_case.get('terminal_output') or 'No output available')
+
+    # Determine status styling
+    status_class = html.escape(result.lower())
+    status_icon = '✓' if result == 'Pass' else '✗' if result == 'Fail' else '?'
+    result_color = '#10b981' if result == 'Pass' else '#ef4444' if result == 'Fail' else '#f59e0b'
+    result = html.escape(result)
+
+    # Why the run stopped early (budget, max turns, error), when it did
+    stop_reason_html = ''
+    if test_case.get('stop_reason'):
+        stop_reason_html = f"""
+                        <div class="meta-item">
+                            <span class="meta-label">Stopped</span>
+                            <span class="meta-value">{html.escape(str(test_case['stop_reason']))}</span>
+                        </div>"""
+
+    return f"""
             <div class="test-case">
                 <div class="test-case-header" onclick="toggleTestCase(this)">
                     <div class="test-case-title">
@@ -409,8 +505,8 @@ def generate_html_report(json_file_path, output_html_path=None):
                         </div>
                         <div class="meta-item">
                             <span class="meta-label">Result</span>
-                            <span class="meta-value" style="color: {'#10b981' if result == 'Pass' else '#ef4444' if result == 'Fail' else '#f59e0b'};">{result}</span>
-                        </div>
+                            <span class="meta-value" style="color: {result_color};">{result}</span>
+                        </div>{stop_reason_html}
                     </div>
                     
                     <div class="section">
@@ -422,30 +518,40 @@ def generate_html_report(json_file_path, output_html_path=None):
                         <div class="section-title">💻 Terminal Output</div>
                         <div class="terminal-output">{terminal_output}</div>
                     </div>
+{screenshot_html}
+                </div>
+            </div>
 """
-        
-        if screenshot:
-            html_content += f"""
+
+
+def render_screenshot(src, full_src=None):
+    """Render the screenshot section; `full_src` links the thumbnail to the full image."""
+    img = f'<img src="{html.escape(src)}" alt="Test Screenshot" loading="lazy">'
+    if full_src:
+        full_src = html.escape(full_src)
+        img = (
+            f'<a href="{full_src}" target="_blank">{img}</a>\n'
+            f'                            <a class="full-link" href="{full_src}" target="_blank">Open full-size screenshot</a>'
+        )
+    return f"""
                     <div class="section">
                         <div class="section-title">📸 Screenshot</div>
                         <div class="screenshot">
-                            <img src="data:image/png;base64,{screenshot}" alt="Test Screenshot">
+                            {img}
                         </div>
                     </div>
 """
-        
-        html_content += """
-                </div>
-            </div>
-"""
-    
-    # Close HTML
-    html_content += f"""
+
+
+def render_page_tail(session_id, total_tests):
+    """Render the footer, the toggle script and the closing tags."""
+    session_id = html.escape(str(session_id))
+    return f"""
         </div>
         
         <div class="footer">
             Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} | 
-            Total Test Cases: {len(test_cases)} | 
+            Total Test Cases: {total_tests} | 
             Session: {session_id}
         </div>
     </div>
@@ -468,15 +574,157 @@ def generate_html_report(json_file_path, output_html_path=None):
 </body>
 </html>
 """
+
+
+def screenshot_basename(test_case, idx):
+    """Build a filesystem-safe base name for a test case's screenshot files."""
+    test_number = str(test_case.get('test_case_number') or f'TC-{idx}')
+    executed_at = str(test_case.get('executed_at') or '')
+    # Only [A-Za-z0-9_-] is kept, so no path separator or ".." reaches the file name
+    safe_tc_number = UNSAFE_FILENAME_CHARS.sub('_', test_number.replace('.', '_'))
+    safe_timestamp = UNSAFE_FILENAME_CHARS.sub('_', executed_at.replace(':', '-').replace(' ', '_'))
+    return f"TC_{safe_tc_number}_{safe_timestamp}" if safe_timestamp else f"TC_{safe_tc_number}"
+
+
+def to_png_base64(screenshot_b64):
+    """Re-encode a base64 JPEG/WebP screenshot as PNG; PNGs are returned unchanged."""
+    if screenshot_b64.startswith('iVBORw0KGgo'):  # base64 of the PNG signature
+        return screenshot_b64
+    with Image.open(io.BytesIO(base64.b64decode(screenshot_b64))) as image:
+        buffer = io.BytesIO()
+        image.save(buffer, 'PNG')
+    return base64.b64encode(buffer.getvalue()).decode('ascii')
+
+
+def write_screenshot_assets(screenshot_b64, assets_dir, basename, thumbnail_size=THUMBNAIL_SIZE):
+    """
+    Write the full PNG and a JPEG thumbnail for one screenshot.
+
+    Returns:
+        (thumbnail_filename, full_filename), both relative to `assets_dir`.
+    """
+    png_bytes = base64.b64decode(screenshot_b64)
+    full_name = f"{basename}.png"
+    thumb_name = f"{basename}_thumb.jpg"
+
+    with open(os.path.join(assets_dir, full_name), 'wb') as f:
+        f.write(png_bytes)
+
+    with Image.open(io.BytesIO(png_bytes)) as image:
+        image = image.convert('RGB')
+        image.thumbnail(thumbnail_size)
+        image.save(os.path.join(assets_dir, thumb_name), 'JPEG', quality=THUMBNAIL_QUALITY, optimize=True)
+
+    return thumb_name, full_name
+
+
+def generate_html_report(json_file_path, output_html_path=None, single_file=False,
+                         thumbnail_size=THUMBNAIL_SIZE, measure_memory=False):
+    """
+    Generate HTML report for all test cases from the last session in the JSON report file.
     
-    # Write the HTML file
-    with open(output_html_path, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    Args:
+        json_file_path: Path to test_case_report.json
+        output_html_path: Optional path for output HTML file (default: last_session_report.html)
+        single_file: Inline screenshots as data URIs instead of writing thumbnail/full image files
+        thumbnail_size: Bounding box (width, height) for generated thumbnails
+        measure_memory: Track peak Python memory with tracemalloc while generating
+    """
+    start_time = time.perf_counter()
+    if measure_memory:
+        tracemalloc.start()
+
+    # Stream the JSON report: only one test case is decoded at a time
+    reader = ReportReader(json_file_path)
+    test_cases = reader.iter_test_cases()
+    first_test_case = next(test_cases, None)
     
+    # Get all test cases from the current session
+    if first_test_case is None:
+        print("No test cases found in the report.")
+        if measure_memory:
+            tracemalloc.stop()
+        return
+    
+    # Fields written before `test_cases` in the report are already known
+    session_id = reader.metadata.get('session_id', 'Unknown')
+    execution_date = reader.metadata.get('execution_date', 'Unknown')
+    counts = {'Pass': 0, 'Fail': 0, 'Unknown': 0}
+    
+    # Determine output path
+    if output_html_path is None:
+        output_html_path = os.path.join(
+            os.path.dirname(json_file_path),
+            'last_session_report.html'
+        )
+
+    assets_dir = os.path.join(os.path.dirname(os.path.abspath(output_html_path)), ASSETS_DIRNAME)
+    if not single_file:
+        os.makedirs(assets_dir, exist_ok=True)
+
+    # Stream the page to disk: only one test case is rendered in memory at a time.
+    # The summary follows the test cases in the JSON, so a fixed-size placeholder
+    # is written first and overwritten once every test case has been seen.
+    total = 0
+    with open(output_html_path, 'wb') as f:
+        f.write(render_page_head(session_id, execution_date).encode('utf-8'))
+        summary_offset = f.tell()
+        f.write(render_summary_block({}, 0))
+        f.write(render_test_cases_open().encode('utf-8'))
+
+        for idx, test_case in enumerate(itertools.chain([first_test_case], test_cases), 1):
+            total = idx
+            result = test_case.get('result')
+            counts[result if result in counts else 'Unknown'] += 1
+
+            screenshot_html = ''
+            screenshot = test_case.get('screenshot')
+            if screenshot and not screenshot.endswith('...'):
+                if single_file:
+                    screenshot_html = render_screenshot(f"data:image/png;base64,{screenshot}")
+                else:
+                    try:
+                        thumb_name, full_name = write_screenshot_assets(
+                            screenshot, assets_dir, screenshot_basename(test_case, idx), thumbnail_size
+                        )
+                        screenshot_html = render_screenshot(
+                            f"{ASSETS_DIRNAME}/{thumb_name}", f"{ASSETS_DIRNAME}/{full_name}"
+                        )
+                    except Exception as e:
+                        print(f"⚠️  Could not write screenshot for test case {idx}: {e}")
+
+            f.write(render_test_case(test_case, idx, screenshot_html).encode('utf-8'))
+            del test_case, screenshot, screenshot_html
+
+        f.write(render_page_tail(session_id, total).encode('utf-8'))
+
+        # Prefer the summary stored in the report; fall back to the streamed counts
+        summary = reader.metadata.get('summary') or {
+            'total_tests': total,
+            'passed': counts['Pass'],
+            'failed': counts['Fail'],
+            'unknown': counts['Unknown'],
+            'pass_rate': f"{(counts['Pass'] / total * 100):.2f}%",
+        }
+        f.seek(summary_offset)
+        f.write(render_summary_block(summary, total))
+
+    elapsed = time.perf_counter() - start_time
+    peak_bytes = None
+    if measure_memory:
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
     print(f"✓ HTML report generated successfully!")
     print(f"  Session: {session_id}")
-    print(f"  Test Cases: {len(test_cases)}")
+    print(f"  Test Cases: {total}")
     print(f"  Output: {output_html_path}")
+    if not single_file:
+        print(f"  Screenshots: {assets_dir}")
+    print(f"  Size: {os.path.getsize(output_html_path) / 1024:.1f} KB")
+    print(f"  Generation time: {elapsed:.2f}s")
+    if peak_bytes is not None:
+        print(f"  Peak memory: {peak_bytes / (1024 * 1024):.1f} MB")
     
     return output_html_path
 
@@ -485,14 +733,29 @@ def main():
     """Main function to generate the report."""
     # Default paths
     script_dir = os.path.dirname(os.path.abspath(__file__))
-    json_file = os.path.join(script_dir, 'test_reports', 'test_case_report.json')
+    default_json = os.path.join(script_dir, 'test_reports', 'test_case_report.json')
+
+    parser = argparse.ArgumentParser(description="Generate the HTML report for the last test session.")
+    parser.add_argument('--report', default=default_json, help="Path to test_case_report.json")
+    parser.add_argument('--output', default=None, help="Output HTML path (default: next to the report)")
+    parser.add_argument('--single-file', action='store_true',
+                        help="Inline screenshots into the HTML instead of writing thumbnail files")
+    parser.add_argument('--measure', action='store_true',
+                        help="Report peak memory usage (tracemalloc) along with generation time")
+    parser.add_argument('--no-open', action='store_true', help="Do not open the report in a browser")
+    args = parser.parse_args()
+    json_file = args.report
     
     if not os.path.exists(json_file):
         print(f"Error: Test report file not found at {json_file}")
         return
     
     # Generate the report
-    output_file = generate_html_report(json_file)
+    output_file = generate_html_report(
+        json_file, args.output, single_file=args.single_file, measure_memory=args.measure
+    )
+    if not output_file or args.no_open:
+        return
     
     # Open in browser (optional)
     try:
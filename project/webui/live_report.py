@@ -0,0 +1,112 @@
+"""
+Live Session Report
+Maintains the HTML report of the running session incrementally, one test case at a time.
+
+The file on disk is laid out as: page head, a fixed-size summary block, then one
+rendered fragment per completed test case. Appending a test case writes its
+fragment at the end of the file and overwrites the summary block in place, so
+the document is never regenerated. The closing footer/script is only written by
+`finish()`; while the session is running it is added when the page is served.
+"""
+
+import os
+import threading
+from datetime import datetime
+
+from generate_session_report import (
+    ASSETS_DIRNAME,
+    render_page_head,
+    render_page_tail,
+    render_screenshot,
+    render_summary_block,
+    render_test_case,
+    render_test_cases_open,
+    screenshot_basename,
+    write_screenshot_assets,
+)
+
+# Seconds between automatic reloads of the in-progress page
+LIVE_REFRESH_SECONDS = 5
+
+
+class LiveSessionReport:
+    """Incrementally written HTML report for a single test session."""
+
+    def __init__(self, html_path):
+        self.html_path = html_path
+        self.assets_dir = os.path.join(os.path.dirname(html_path), ASSETS_DIRNAME)
+        self.session_id = None
+        self.test_case_count = 0
+        self.finished = False
+        self._summary_offset = None
+        self._lock = threading.Lock()
+
+    def start(self, session_id, execution_date=None):
+        """Begin a new session, discarding any previous live report."""
+        execution_date = execution_date or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self._lock:
+            os.makedirs(self.assets_dir, exist_ok=True)
+            head = render_page_head(session_id, execution_date).encode('utf-8')
+            with open(self.html_path, 'wb') as f:
+                f.write(head)
+                self._summary_offset = f.tell()
+                f.write(render_summary_block({}, 0))
+                f.write(render_test_cases_open().encode('utf-8'))
+            self.session_id = session_id
+            self.test_case_count = 0
+            self.finished = False
+
+    def append(self, test_case, summary):
+        """
+        Add a completed test case and refresh the summary cards.
+
+        Args:
+            test_case: Test case entry as stored in the JSON report
+            summary: Up-to-date summary dict for the session
+        """
+        with self._lock:
+            if self._summary_offset is None or self.finished:
+                return
+            idx = self.test_case_count + 1
+            fragment = render_test_case(test_case, idx, self._render_screenshot(test_case, idx))
+            with open(self.html_path, 'r+b') as f:
+                f.seek(0, os.SEEK_END)
+                f.write(fragment.encode('utf-8'))
+                f.seek(self._summary_offset)
+                f.write(render_summary_block(summary, idx))
+            self.test_case_count = idx
+
+    def finish(self):
+        """Write the closing footer so the file on disk is a complete document."""
+        with self._lock:
+            if self._summary_offset is None or self.finished:
+                return
+            with open(self.html_path, 'ab') as f:
+                f.write(render_page_tail(self.session_id, self.test_case_count).encode('utf-8'))
+            self.finished = True
+
+    def read_page(self):
+        """Return the current page, closing it off (with auto-refresh) if still in progress."""
+        with self._lock:
+            if not os.path.exists(self.html_path):
+                return None
+            with open(self.html_path, 'rb') as f:
+                page = f.read()
+            if self.finished or self._summary_offset is None:
+                return page
+            tail = render_page_tail(self.session_id, self.test_case_count)
+            refresh = f"<script>setTimeout(function() {{ location.reload(); }}, {LIVE_REFRESH_SECONDS * 1000});</script>\n"
+            return page + tail.replace('</body>', refresh + '</body>').encode('utf-8')
+
+    def _render_screenshot(self, test_case, idx):
+        screenshot = test_case.get('screenshot')
+        if not screenshot:
+            return ''
+        try:
+            thumb_name, full_name = write_screenshot_assets(
+                screenshot, self.assets_dir, screenshot_basename(test_case, idx)
+            )
+        except Exception as e:
+            print(f"⚠️  Could not write live report screenshot: {e}")
+            return ''
+        return render_screenshot(f"{ASSETS_DIRNAME}/{thumb_name}", f"{ASSETS_DIRNAME}/{full_name}")
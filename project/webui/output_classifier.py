@@ -0,0 +1,208 @@
+"""
+Agent Output Classifier
+Derives the verdict, question type and auto-response for agent output in one pass.
+
+All keyword phrases are compiled once into a single prefix-tree shaped regex,
+which the regex engine matches in one left-to-right scan over the lowercased
+tail of the output. The regex sits in a lookahead, so it is tried at every
+position and overlapping phrases are all found: "result: failed" yields both
+"result: fail" and "failed". At one position only the longest phrase is
+reported, so each phrase also maps to the categories of the phrases it
+contains ("completed successfully" also counts as "completed"). Precedence is
+the same as the keyword checks this replaced: an explicit verdict at the end,
+then explicit statements, then failure indicators, then success indicators.
+"""
+
+import re
+from dataclasses import dataclass
+
+# Only the end of the output is scanned; verdicts and questions live there
+TAIL_WINDOW = 8192
+
+# Explicit "result: pass" style statements only count near the very end
+VERDICT_WINDOW = 500
+
+EXPLICIT_PASS = 'explicit_pass'
+EXPLICIT_FAIL = 'explicit_fail'
+FAIL_INDICATOR = 'fail_indicator'
+SUCCESS_INDICATOR = 'success_indicator'
+PROCEDURAL_QUESTION = 'procedural'
+CONFIRMATION_QUESTION = 'confirmation'
+COMPLETED_SIGNAL = 'completed'
+
+PHRASES = {
+    EXPLICIT_PASS: ['test case is passed', 'result: pass'],
+    EXPLICIT_FAIL: ['test case is failed', 'result: fail'],
+    FAIL_INDICATOR: [
+        'unable to', 'cannot', 'error', 'failed', 'failure',
+        'incorrect', 'does not match', 'not found', 'not visible',
+        'blocked', 'denied', 'locked out',
+    ],
+    SUCCESS_INDICATOR: [
+        'passed', 'successful', 'verified', 'correct', 'appears correctly',
+        'displayed', 'loaded', 'visible', 'confirmation', 'completed successfully',
+    ],
+    PROCEDURAL_QUESTION: ['should i', 'proceed', 'shall i', 'go ahead'],
+    CONFIRMATION_QUESTION: ['do you want', 'would you like'],
+    COMPLETED_SIGNAL: ['completed'],
+}
+
+# Replies sent automatically for each question type
+AUTO_RESPONSES = {
+    PROCEDURAL_QUESTION: 'yes, proceed',
+    CONFIRMATION_QUESTION: 'yes',
+}
+
+# A last message consisting only of one of these is a final verdict
+BARE_VERDICTS = {'pass': 'Pass', 'passed': 'Pass', 'fail': 'Fail', 'failed': 'Fail'}
+
+
+def _trie_pattern(phrases):
+    """
+    Regex matching any of the phrases, shaped as a prefix tree.
+
+    Alternatives that share a prefix are merged (e.g. "fail(?:ed|ure)"), so at
+    each position the engine only follows the branch for the next character
+    instead of trying every phrase in turn. Longer phrases win over their prefixes.
+    """
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for ch in phrase:
+            node = node.setdefault(ch, {})
+        node[''] = None
+
+    def build(node):
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"(?:{body})?" if '' in node else body
+
+    return build(trie)
+
+
+def _compile(phrases):
+    categories = {}
+    for category, words in phrases.items():
+        for word in words:
+            categories.setdefault(word, set()).add(category)
+    # A phrase implies every phrase it contains
+    for phrase in categories:
+        for other, other_categories in list(categories.items()):
+            if other != phrase and other in phrase:
+                categories[phrase] = categories[phrase] | other_categories
+    # Zero-width, so the scan moves on by one character instead of past the match
+    pattern = re.compile(f"(?=({_trie_pattern(categories)}))")
+    return pattern, {phrase: frozenset(cats) for phrase, cats in categories.items()}
+
+
+@dataclass
+class Classification:
+    """What the runner needs to know about the latest agent output."""
+
+    verdict: str  # 'Pass', 'Fail' or 'Unknown'
+    complete: bool  # the last message states a final verdict
+    question_type: str | None = None  # 'procedural', 'confirmation', 'open' or None
+    auto_response: str | None = None
+    completed_signal: bool = False  # the last message says the task is completed
+
+    @property
+    def needs_input(self):
+        return self.question_type == 'open'
+
+
+class OutputClassifier:
+    """Precompiled multi-phrase classifier; instances are immutable and thread-safe."""
+
+    def __init__(self, phrases=PHRASES, tail_window=TAIL_WINDOW, verdict_window=VERDICT_WINDOW):
+        self.pattern, self.categories = _compile(phrases)
+        self.tail_window = tail_window
+        self.verdict_window = verdict_window
+
+    def classify(self, output_text, last_output=None):
+        """
+        Classify agent output.
+
+        Args:
+            output_text: All text the agent produced in the turn
+            last_output: The agent's last message; defaults to the end of output_text
+        """
+        window = output_text[-self.tail_window:].lower()
+        output_end = len(window)
+        if last_output is None:
+            last_lower = window
+            last_start = 0
+        else:
+            last_lower = last_output[-self.tail_window:].lower()
+            # The last message normally closes the output; scan it as well if not
+            if not window.endswith(last_lower):
+                window = f"{window}\n{last_lower}"
+            last_start = len(window) - len(last_lower)
+        verdict_start = output_end - min(self.verdict_window, output_end)
+
+        found = set()
+        found_in_last = set()
+        found_near_end = set()
+        for match in self.pattern.finditer(window):
+            start = match.start()
+            categories = self.categories[match.group(1)]
+            if start >= last_start:
+                found_in_last |= categories
+            if start < output_end:
+                found |= categories
+                if start >= verdict_start:
+                    found_near_end |= categories
+
+        verdict = self._verdict(window[verdict_start:output_end].strip(), found, found_near_end)
+
+        last_stripped = last_lower.strip()
+        complete = (
+            last_stripped in BARE_VERDICTS
+            or EXPLICIT_PASS in found_in_last
+            or EXPLICIT_FAIL in found_in_last
+        )
+
+        question_type = None
+        if '?' in last_lower:
+            if PROCEDURAL_QUESTION in found_in_last:
+                question_type = PROCEDURAL_QUESTION
+            elif CONFIRMATION_QUESTION in found_in_last:
+                question_type = CONFIRMATION_QUESTION
+            else:
+                question_type = 'open'
+
+        return Classification(
+            verdict=verdict,
+            complete=complete,
+            question_type=question_type,
+            auto_response=AUTO_RESPONSES.get(question_type),
+            completed_signal=COMPLETED_SIGNAL in found_in_last,
+        )
+
+    @staticmethod
+    def _verdict(tail, found, found_near_end):
+        # Look for explicit Pass/Fail at the end (highest priority)
+        if tail.endswith('pass') or tail.endswith('passed'):
+            return 'Pass'
+        if tail.endswith('fail') or tail.endswith('failed'):
+            return 'Fail'
+        # Then explicit statements near the end
+        if EXPLICIT_PASS in found_near_end:
+            return 'Pass'
+        if EXPLICIT_FAIL in found_near_end:
+            return 'Fail'
+        # Failure indicators are more critical than success indicators
+        if FAIL_INDICATOR in found:
+            return 'Fail'
+        if SUCCESS_INDICATOR in found:
+            return 'Pass'
+        return 'Unknown'
+
+
+# Shared instance used by the server
+DEFAULT_CLASSIFIER = OutputClassifier()
+
+
+def classify_output(output_text, last_output=None):
+    return DEFAULT_CLASSIFIER.classify(output_text, last_output)
@@ -0,0 +1,137 @@
+"""
+Shared-Prefix Execution Plan
+Finds the step prefixes test cases have in common so each can be run once and checkpointed.
+
+The steps of every parsed test case are inserted into a trie. A node visited by
+two or more test cases is a shared prefix; it becomes a checkpoint where the
+cases passing through it part ways (some continue differently or stop sharing).
+Each test case gets the deepest checkpoint on its path as a SetupPreamble,
+chained through `parent` to the shallower checkpoints, so e.g. "login" is run
+once, "login, add backpack, open cart" continues from it, and every case under
+that branch starts from a fresh context forked from the deepest checkpoint.
+
+Capturing a checkpoint costs an agent turn of its own, so steps that only load
+the start URL (the runner navigates there anyway) do not count, and a prefix
+needs at least `min_steps` real agent steps to be checkpointed.
+"""
+
+import hashlib
+import re
+
+from session_setup import LOGIN_STEP_PATTERN, LOAD_STEP_PATTERN, SetupPreamble
+
+# Minimum number of test cases that must share a prefix for it to be checkpointed
+MIN_SHARED_CASES = 2
+
+# Minimum number of agent steps (start-URL loads excluded) in a checkpointed prefix
+MIN_PREFIX_STEPS = 1
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_step(step):
+    """Key used to decide whether two steps are the same."""
+    return _WHITESPACE.sub(' ', step).strip().rstrip('.').lower()
+
+
+def is_start_url_load(step, url):
+    """Whether a step only loads `url`, which the runner has already navigated to."""
+    load = LOAD_STEP_PATTERN.match(step.strip())
+    return bool(load and url and load.group('url').rstrip('/') == url.rstrip('/'))
+
+
+def agent_steps(steps, url):
+    """Number of steps the agent actually has to perform."""
+    return sum(1 for step in steps if not is_start_url_load(step, url))
+
+
+class _Node:
+    __slots__ = ('children', 'count', 'step')
+
+    def __init__(self, step=None):
+        self.children = {}
+        self.count = 0  # test cases whose steps pass through this node
+        self.step = step
+
+
+def build_prefix_tree(test_cases):
+    """Insert the steps of every test case into a trie; returns (root, path of nodes per case)."""
+    root = _Node()
+    paths = []
+    for test_case in test_cases:
+        node = root
+        path = []
+        for step in (test_case.steps if test_case else []):
+            key = normalize_step(step)
+            child = node.children.get(key)
+            if child is None:
+                child = node.children[key] = _Node(step)
+            child.count += 1
+            path.append(child)
+            node = child
+        paths.append(path)
+    return root, paths
+
+
+def _preamble_for(steps, url, parent):
+    digest = hashlib.sha256('\n'.join(normalize_step(s) for s in steps).encode('utf-8')).hexdigest()[:12]
+    username = parent.username if parent else None
+    for step in steps:
+        login = LOGIN_STEP_PATTERN.search(step)
+        if login:
+            username = login.group('username')
+    return SetupPreamble(
+        name=f"prefix:{len(steps)}:{digest}",
+        steps=list(steps),
+        url=url,
+        username=username,
+        parent=parent,
+    )
+
+
+def plan_shared_prefixes(test_cases, default_url=None, min_shared=MIN_SHARED_CASES, min_steps=MIN_PREFIX_STEPS):
+    """
+    Return, for each test case, the SetupPreamble of the deepest shared prefix it
+    can start from (or None).
+
+    A checkpoint is placed after step i of a case's path when at least
+    `min_shared` cases reach that step and fewer continue with the next one,
+    and the prefix up to it has at least `min_steps` agent steps.
+    A case always keeps at least its last step to run itself.
+    """
+    _, paths = build_prefix_tree(test_cases)
+    preambles = {}  # id(node) -> SetupPreamble, so cases sharing a node share the object
+    plan = []
+    for test_case, path in zip(test_cases, paths):
+        url = (test_case.start_url if test_case else None) or default_url
+        if path:
+            load = LOAD_STEP_PATTERN.match(path[0].step.strip())
+            if load:
+                url = load.group('url')
+        parent = None
+        real_steps = 0
+        for i, node in enumerate(path[:-1]):
+            if not is_start_url_load(node.step, url):
+                real_steps += 1
+            if node.count >= min_shared and node.count > path[i + 1].count and url and real_steps >= min_steps:
+                preamble = preambles.get(id(node))
+                if preamble is None:
+                    preamble = preambles[id(node)] = _preamble_for([n.step for n in path[:i + 1]], url, parent)
+                parent = preamble
+        plan.append(parent)
+    return plan
+
+
+def count_saved_steps(plan):
+    """
+    Agent steps covered by checkpoints: (without, with) the plan, i.e. run by
+    every case versus run once per checkpoint. Start-URL loads are not counted.
+    """
+    without = sum(agent_steps(p.steps, p.url) for p in plan if p)
+    unique = {}
+    for preamble in plan:
+        while preamble is not None and preamble.name not in unique:
+            parent_steps = agent_steps(preamble.parent.steps, preamble.url) if preamble.parent else 0
+            unique[preamble.name] = agent_steps(preamble.steps, preamble.url) - parent_steps
+            preamble = preamble.parent
+    return without, sum(unique.values())
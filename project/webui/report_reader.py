@@ -0,0 +1,252 @@
+"""
+Streaming Test Report Reader
+Iterates the test cases of test_case_report.json lazily instead of json.load-ing the whole file.
+
+Only one test case is decoded at a time, so memory use depends on the largest
+single entry rather than on the size of the report. Screenshot fields can be
+kept, dropped, or replaced by a `DeferredScreenshot` that re-reads just that
+string from disk when (and if) the image is actually needed. When they are
+dropped or deferred the screenshot string is only scanned for its closing
+quote, never decoded.
+"""
+
+import codecs
+import json
+
+# Bytes read from disk per refill of the parse buffer
+CHUNK_SIZE = 256 * 1024
+
+# Screenshot handling modes for iter_test_cases
+INCLUDE = 'include'
+SKIP = 'skip'
+DEFER = 'defer'
+
+_WHITESPACE = ' \t\n\r'
+
+
+class DeferredScreenshot:
+    """Lazy handle to the screenshot of one test case: the byte range of its JSON string in the report."""
+
+    __slots__ = ('path', 'start', 'end')
+
+    def __init__(self, path, start, end):
+        self.path = path
+        self.start = start
+        self.end = end
+
+    def load(self):
+        """Read the screenshot string back from disk and return the base64 data."""
+        with open(self.path, 'rb') as f:
+            f.seek(self.start)
+            raw = f.read(self.end - self.start)
+        return json.loads(raw.decode('utf-8'))
+
+    def __repr__(self):
+        return f"DeferredScreenshot({self.path!r}, {self.start}, {self.end})"
+
+
+def load_screenshot(value):
+    """Return the base64 screenshot for a value that may be a DeferredScreenshot."""
+    if isinstance(value, DeferredScreenshot):
+        return value.load()
+    return value
+
+
+class _JsonStream:
+    """Minimal pull parser over a UTF-8 file, built on JSONDecoder.raw_decode."""
+
+    def __init__(self, f):
+        self._file = f
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._json = json.JSONDecoder()
+        self.buf = ''
+        self.pos = 0
+        self.base = 0  # byte offset of buf[0] in the file
+        self.eof = False
+
+    def _fill(self, min_chars=1):
+        """Read until at least `min_chars` more characters are buffered (or EOF)."""
+        wanted = len(self.buf) + min_chars
+        while len(self.buf) < wanted and not self.eof:
+            chunk = self._file.read(max(CHUNK_SIZE, min_chars))
+            if not chunk:
+                self.buf += self._decoder.decode(b'', final=True)
+                self.eof = True
+            else:
+                self.buf += self._decoder.decode(chunk)
+
+    def compact(self):
+        """Drop consumed characters so the buffer only holds unread data."""
+        if self.pos:
+            self.base += len(self.buf[:self.pos].encode('utf-8'))
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+
+    def byte_offset(self, pos=None):
+        pos = self.pos if pos is None else pos
+        return self.base + len(self.buf[:pos].encode('utf-8'))
+
+    def peek(self):
+        """Skip whitespace and return the next character ('' at EOF)."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf) or self.eof:
+                break
+            self.compact()
+            self._fill()
+        return self.buf[self.pos] if self.pos < len(self.buf) else ''
+
+    def expect(self, chars):
+        ch = self.peek()
+        if ch == '' or ch not in chars:
+            raise ValueError(f"Malformed report: expected one of {chars!r} at byte {self.byte_offset()}, got {ch!r}")
+        self.pos += 1
+        return ch
+
+    def skip_string(self):
+        """Move past the next JSON string without decoding it."""
+        self.expect('"')
+        while True:
+            end = self.buf.find('"', self.pos)
+            while end != -1:
+                backslashes = 0
+                while end - backslashes - 1 >= self.pos and self.buf[end - backslashes - 1] == '\\':
+                    backslashes += 1
+                if backslashes % 2 == 0:
+                    self.pos = end + 1
+                    return
+                end = self.buf.find('"', end + 1)
+            if self.eof:
+                raise ValueError(f"Malformed report: unterminated string at byte {self.byte_offset()}")
+            # Keep a trailing run of backslashes: it may escape the next chunk's first quote
+            keep = 0
+            while keep < len(self.buf) - self.pos and self.buf[-keep - 1] == '\\':
+                keep += 1
+            self.pos = len(self.buf) - keep
+            self.compact()
+            self._fill(CHUNK_SIZE)
+
+    def value(self):
+        """Decode the next complete JSON value, reading more of the file as needed."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self.buf, self.pos)
+                # A number at the very end of the buffer may continue in the next chunk
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.compact()
+            # Grow geometrically so a large entry is not re-scanned once per chunk
+            self._fill(max(CHUNK_SIZE, len(self.buf)))
+
+
+class ReportReader:
+    """
+    Streaming reader for a test_case_report.json file.
+
+    `metadata` holds the top-level fields other than `test_cases`. Fields written
+    after the test case list (e.g. `summary`) only appear once iteration is done;
+    use `read_metadata()` to get all of them in one cheap pass.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.metadata = {}
+        self.test_case_count = None
+
+    def iter_test_cases(self, screenshots=INCLUDE):
+        """
+        Yield the test cases one at a time.
+
+        Args:
+            screenshots: INCLUDE to keep the base64 data, SKIP to drop it, or
+                DEFER to replace it with a DeferredScreenshot handle
+        """
+        if screenshots not in (INCLUDE, SKIP, DEFER):
+            raise ValueError(f"Unknown screenshots mode: {screenshots!r}")
+
+        with open(self.path, 'rb') as f:
+            stream = _JsonStream(f)
+            stream.expect('{')
+            count = 0
+            if stream.peek() == '}':
+                stream.pos += 1
+            else:
+                while True:
+                    key = stream.value()
+                    stream.expect(':')
+                    if key == 'test_cases':
+                        for test_case in self._iter_array(stream, screenshots):
+                            count += 1
+                            yield test_case
+                    else:
+                        self.metadata[key] = stream.value()
+                    if stream.expect(',}') == '}':
+                        break
+            self.test_case_count = count
+
+    def _iter_array(self, stream, screenshots):
+        stream.expect('[')
+        if stream.peek() == ']':
+            stream.pos += 1
+            return
+        while True:
+            if screenshots != INCLUDE and stream.peek() == '{':
+                test_case = self._test_case_without_screenshot(stream, screenshots)
+            else:
+                test_case = stream.value()
+            stream.compact()
+            yield test_case
+            if stream.expect(',]') == ']':
+                return
+
+    def _test_case_without_screenshot(self, stream, screenshots):
+        """Decode one test case object field by field, skipping over its screenshot string."""
+        test_case = {}
+        stream.expect('{')
+        if stream.peek() == '}':
+            stream.pos += 1
+            return test_case
+        while True:
+            key = stream.value()
+            stream.expect(':')
+            if key != 'screenshot':
+                test_case[key] = stream.value()
+            elif stream.peek() != '"':
+                value = stream.value()  # null
+                if screenshots == DEFER:
+                    test_case[key] = value
+            else:
+                start = stream.byte_offset()
+                stream.skip_string()
+                if screenshots == DEFER:
+                    end = stream.byte_offset()
+                    test_case[key] = DeferredScreenshot(self.path, start, end) if end - start > 2 else ''
+            if stream.expect(',}') == '}':
+                return test_case
+
+    def read_metadata(self):
+        """Read the whole file once (without screenshots) and return the top-level fields."""
+        if self.test_case_count is None:
+            for _ in self.iter_test_cases(screenshots=SKIP):
+                pass
+        return self.metadata
+
+
+def report_metadata(report):
+    """Top-level report fields from either a ReportReader or an already-loaded report dict."""
+    if isinstance(report, ReportReader):
+        return report.read_metadata()
+    return report
+
+
+def iter_test_cases(report, screenshots=INCLUDE):
+    """Iterate test cases from either a ReportReader or an already-loaded report dict."""
+    if isinstance(report, ReportReader):
+        return report.iter_test_cases(screenshots=screenshots)
+    return iter(report.get('test_cases', []))
@@ -0,0 +1,137 @@
+"""
+Live Screencast
+Relays the browser's screencast frames to dashboard viewers as an MJPEG stream.
+
+The computer (see BasePlaywrightComputer.start_screencast) publishes JPEG frames
+into a per-task ScreencastChannel, and only while the channel has viewers, so
+an unwatched run pays nothing. The channel keeps just the newest frame: each
+viewer is sent the latest frame whenever it is ready for one, so a slow client
+skips frames instead of building up a backlog or slowing the others down.
+"""
+
+import threading
+import time
+
+BOUNDARY = 'frame'
+MJPEG_MIMETYPE = f'multipart/x-mixed-replace; boundary={BOUNDARY}'
+
+# Frame-rate cap, JPEG quality and size of the streamed frames
+MAX_FPS = 5
+QUALITY = 60
+MAX_WIDTH = 1024
+MAX_HEIGHT = 768
+
+# Re-send the current frame this often when nothing changes, so disconnected
+# viewers are noticed (a write fails) and proxies don't time the stream out
+KEEPALIVE_SECONDS = 5.0
+
+
+class ScreencastChannel:
+    """The newest frame of one task's browser and the viewers waiting for it."""
+
+    def __init__(self, max_fps=MAX_FPS, quality=QUALITY, max_width=MAX_WIDTH, max_height=MAX_HEIGHT):
+        self.max_fps = max_fps
+        self.quality = quality
+        self.max_width = max_width
+        self.max_height = max_height
+        self._condition = threading.Condition()
+        self._frame = None
+        self._frame_id = 0
+        self._viewers = 0
+        self.closed = False
+
+    # --- Publisher side (the Playwright thread) ---
+    def wanted(self):
+        """Whether anyone is watching, i.e. whether frames should be produced."""
+        return self._viewers > 0 and not self.closed
+
+    def publish(self, jpeg_bytes):
+        with self._condition:
+            self._frame = jpeg_bytes
+            self._frame_id += 1
+            self._condition.notify_all()
+
+    def close(self):
+        """End every viewer's stream; the task is over."""
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+
+    # --- Viewer side (request threads) ---
+    @property
+    def viewers(self):
+        return self._viewers
+
+    def next_frame(self, last_id, timeout):
+        """
+        Wait for a frame newer than `last_id`; returns (frame_id, jpeg_bytes).
+
+        Frames published in between are skipped. On timeout the current frame
+        is returned again (or (last_id, None) if there is none yet); after
+        close() returns (last_id, None) straight away.
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self.closed or self._frame_id > last_id, timeout)
+            if self.closed:
+                return last_id, None
+            return self._frame_id, self._frame
+
+    def stream(self, keepalive=KEEPALIVE_SECONDS):
+        """Generate multipart MJPEG chunks until the channel closes or the viewer goes away."""
+        with self._condition:
+            self._viewers += 1
+        try:
+            last_id = 0
+            while not self.closed:
+                last_id, frame = self.next_frame(last_id, keepalive)
+                if frame is None:
+                    continue
+                yield (f'--{BOUNDARY}\r\nContent-Type: image/jpeg\r\n'
+                       f'Content-Length: {len(frame)}\r\n\r\n').encode('ascii') + frame + b'\r\n'
+        finally:
+            # Runs on close, and when the server fails to write to a disconnected viewer
+            with self._condition:
+                self._viewers -= 1
+
+
+class ScreencastHub:
+    """Screencast channels by task id."""
+
+    def __init__(self, **settings):
+        self.settings = settings
+        self._channels = {}
+        self._live = set()  # tasks between open() and close(); only running ones are kept
+        self._lock = threading.Lock()
+
+    def open(self, task_id):
+        """Mark a task as running; call before its runner starts so early viewers can wait for it."""
+        with self._lock:
+            self._live.add(task_id)
+
+    def is_live(self, task_id):
+        """Whether the task's run is going on; set by open() and close(), not by the task's status."""
+        with self._lock:
+            return task_id in self._live
+
+    def channel(self, task_id):
+        """
+        The task's channel, created on first use (viewers may connect before the
+        browser starts). For a task that is not live this is an already closed channel.
+        """
+        with self._lock:
+            channel = self._channels.get(task_id)
+            if channel is None:
+                channel = ScreencastChannel(**self.settings)
+                if task_id in self._live:
+                    self._channels[task_id] = channel
+                else:
+                    channel.close()
+            return channel
+
+    def close(self, task_id):
+        """End the task's run and every viewer's stream."""
+        with self._lock:
+            channel = self._channels.pop(task_id, None)
+            self._live.discard(task_id)
+        if channel is not None:
+            channel.close()
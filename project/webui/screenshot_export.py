@@ -0,0 +1,165 @@
+"""
+Parallel Screenshot Exporter
+Decodes and writes report screenshots on a thread pool, skipping files that are already up to date.
+
+Test cases are consumed lazily (typically from ReportReader with deferred
+screenshots) and only a bounded window of them is in flight at once, so the
+exporter never needs the whole report in memory. Results are
+yielded in input order, which lets callers (CSV export) stream their own output.
+"""
+
+import base64
+import hashlib
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from generate_session_report import screenshot_basename
+from report_reader import load_screenshot
+
+# Default number of decode/write workers
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# In-flight test cases per worker; bounds how many screenshots are held in memory
+WINDOW_PER_WORKER = 4
+
+# Result statuses
+WRITTEN = 'written'
+UNCHANGED = 'unchanged'
+MISSING = 'missing'
+TRUNCATED = 'truncated'
+ERROR = 'error'
+
+
+def screenshot_filename(test_case, idx):
+    """File name used for a test case's exported screenshot."""
+    return f"{screenshot_basename(test_case, idx)}.png"
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_screenshot(screenshot_b64, path):
+    """
+    Decode a base64 screenshot and write it to `path` unless an identical file exists.
+
+    Returns:
+        (status, size_in_bytes) where status is WRITTEN or UNCHANGED.
+    """
+    png_bytes = base64.b64decode(screenshot_b64)
+    size = len(png_bytes)
+
+    if os.path.exists(path) and os.path.getsize(path) == size:
+        if _file_sha256(path) == hashlib.sha256(png_bytes).hexdigest():
+            return UNCHANGED, size
+
+    # Write to a temporary file first so readers never see a half-written image
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(png_bytes)
+    os.replace(tmp_path, path)
+    return WRITTEN, size
+
+
+def _export_one(screenshot, path):
+    try:
+        # Deferred screenshots are read back from the report on the worker thread
+        screenshot_b64 = load_screenshot(screenshot)
+        if not screenshot_b64:
+            return {'status': MISSING, 'bytes': 0, 'error': None}
+        if screenshot_b64.endswith('...'):
+            # Truncated screenshots (old report format) cannot be decoded
+            return {'status': TRUNCATED, 'bytes': 0, 'error': None}
+        status, size = write_screenshot(screenshot_b64, path)
+        return {'status': status, 'bytes': size, 'error': None}
+    except Exception as e:
+        return {'status': ERROR, 'bytes': 0, 'error': str(e)}
+
+
+def iter_export_screenshots(test_cases, output_dir, max_workers=DEFAULT_WORKERS):
+    """
+    Export screenshots for an iterable of test cases.
+
+    Args:
+        test_cases: Iterable of test case dicts (consumed lazily); screenshots
+            may be base64 strings or DeferredScreenshot handles
+        output_dir: Directory the PNG files are written to
+        max_workers: Size of the decode/write thread pool
+
+    Yields:
+        (test_case, result) in input order. `test_case` has its screenshot field
+        removed; `result` has 'status', 'filename', 'bytes' and 'error' keys.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    window = max(1, max_workers * WINDOW_PER_WORKER)
+    pending = deque()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for idx, test_case in enumerate(test_cases, 1):
+            screenshot_data = test_case.get('screenshot')
+            meta = {k: v for k, v in test_case.items() if k != 'screenshot'}
+            filename = screenshot_filename(meta, idx)
+
+            if not screenshot_data:
+                pending.append((meta, {'status': MISSING, 'filename': None, 'bytes': 0, 'error': None}))
+            else:
+                future = executor.submit(_export_one, screenshot_data, os.path.join(output_dir, filename))
+                pending.append((meta, (filename, future)))
+            del screenshot_data
+
+            while len(pending) >= window:
+                yield _resolve(pending.popleft())
+
+        while pending:
+            yield _resolve(pending.popleft())
+
+
+def _resolve(entry):
+    meta, result = entry
+    if isinstance(result, tuple):
+        filename, future = result
+        result = future.result()
+        result['filename'] = filename if result['status'] in (WRITTEN, UNCHANGED) else None
+    return meta, result
+
+
+class ExportStats:
+    """Running totals for an export, printed as a throughput summary."""
+
+    def __init__(self):
+        self.counts = {WRITTEN: 0, UNCHANGED: 0, MISSING: 0, TRUNCATED: 0, ERROR: 0}
+        self.bytes_written = 0
+        self.bytes_unchanged = 0
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def add(self, result):
+        self.counts[result['status']] += 1
+        if result['status'] == WRITTEN:
+            self.bytes_written += result['bytes']
+        elif result['status'] == UNCHANGED:
+            self.bytes_unchanged += result['bytes']
+        self.elapsed = time.perf_counter() - self.started
+
+    @property
+    def total(self):
+        return sum(self.counts.values())
+
+    def print_summary(self):
+        elapsed = max(self.elapsed, 1e-9)
+        processed = self.counts[WRITTEN] + self.counts[UNCHANGED]
+        megabytes = (self.bytes_written + self.bytes_unchanged) / (1024 * 1024)
+        print(f"\n📈 Throughput:")
+        print(f"   Test cases: {self.total} in {self.elapsed:.2f}s ({self.total / elapsed:.1f}/s)")
+        print(f"   Screenshots: {processed} ({processed / elapsed:.1f}/s, {megabytes / elapsed:.1f} MB/s)")
+        print(f"   Written: {self.counts[WRITTEN]} ({self.bytes_written / (1024 * 1024):.1f} MB)")
+        print(f"   Unchanged (skipped): {self.counts[UNCHANGED]}")
+        if self.counts[MISSING] or self.counts[TRUNCATED] or self.counts[ERROR]:
+            print(f"   Missing: {self.counts[MISSING]}  Truncated: {self.counts[TRUNCATED]}  Errors: {self.counts[ERROR]}")
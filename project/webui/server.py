@@ -1,16 +1,27 @@
-from flask import Flask, render_template, request, jsonify, Response
+from flask import Flask, render_template, request, jsonify, Response, send_from_directory
 import os
 import sys
 import json
 from threading import Thread
 import time
-import re
 from datetime import datetime
 
 # Add parent directory to path so we can import agent
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from agent.agent import Agent
+from agent.budget import Budget, BudgetExceeded, sum_usage
+from agent.loop_detector import LoopDetector
+from computers.contrib.local_cdp import LocalCDPBrowser
 from computers.default.local_playwright import LocalPlaywrightBrowser
+from computers.shared.resource_profiles import parse_overrides
+from generate_session_report import to_png_base64
+from live_report import LiveSessionReport
+from output_classifier import classify_output
+from prefix_tree import count_saved_steps, plan_shared_prefixes
+from screencast import MJPEG_MIMETYPE, ScreencastHub
+from session_setup import SessionSetups, detect_login_preamble
+from suite_cache import SuiteCache
+from testcase_parser import ONE_LINE_PATTERN, URL_PATTERN
 
 app = Flask(__name__, template_folder='templates', static_folder='static')
 
@@ -20,9 +31,68 @@ tasks = {}
 # Track current test session ID
 current_session_id = None
 
+# Resource profile of the current session, recorded in its report
+current_resource_profile = None
+
 # Test case report file path
 REPORT_FILE = os.path.join(os.path.dirname(__file__), 'test_reports', 'test_case_report.json')
 
+# HTML report of the running session, updated as each test case completes
+LIVE_REPORT_FILE = os.path.join(os.path.dirname(__file__), 'test_reports', 'live_session_report.html')
+live_report = LiveSessionReport(LIVE_REPORT_FILE)
+
+# Live browser views, streamed only while someone watches (frame rate via WEBUI_SCREENCAST_FPS)
+screencasts = ScreencastHub(max_fps=float(os.environ.get('WEBUI_SCREENCAST_FPS', '5')))
+
+# Per-test-case limits unless overridden by WEBUI_CASE_MAX_* environment variables;
+# the session has no limits unless WEBUI_SESSION_MAX_* are set (see agent/budget.py)
+CASE_BUDGET_DEFAULTS = {"wall_seconds": 900, "model_calls": 150}
+
+# Start test cases from checkpoints of the login and step prefixes they share (set to 0 to disable)
+REUSE_SETUP_SNAPSHOTS = os.environ.get('WEBUI_REUSE_SETUP', '1') != '0'
+
+# Attach to an already-running Chromium (started with --remote-debugging-port) instead of
+# launching one per session, e.g. "http://localhost:9222"
+CDP_URL = os.environ.get('WEBUI_CDP_URL')
+
+# Run the browser without a window (no X server needed); headless implies the low-memory
+# Chromium flags and a JS heap cap unless WEBUI_LOW_MEMORY / WEBUI_JS_HEAP_MB say otherwise
+HEADLESS = os.environ.get('WEBUI_HEADLESS', '0') == '1'
+LOW_MEMORY = {'1': True, '0': False}.get(os.environ.get('WEBUI_LOW_MEMORY', ''))
+JS_HEAP_MB = int(os.environ['WEBUI_JS_HEAP_MB']) if os.environ.get('WEBUI_JS_HEAP_MB') else None
+
+# Screenshot encoding sent to the model: png, jpeg or webp (quality 0-100 for the lossy formats)
+SCREENSHOT_FORMAT = os.environ.get('WEBUI_SCREENSHOT_FORMAT', 'png')
+SCREENSHOT_QUALITY = int(os.environ.get('WEBUI_SCREENSHOT_QUALITY', '80'))
+
+# Text entry: "keys" (per-key events), "insert" (whole string at once) or "auto" (insert
+# strings of WEBUI_TYPE_INSERT_MIN_CHARS or more into fields without key listeners)
+TYPE_MODE = os.environ.get('WEBUI_TYPE_MODE', 'auto')
+TYPE_INSERT_MIN_CHARS = int(os.environ.get('WEBUI_TYPE_INSERT_MIN_CHARS', '32'))
+
+# Encode each model request's history on a worker thread while the browser acts and
+# takes the screenshot, instead of re-encoding the whole conversation every turn
+PIPELINED = os.environ.get('WEBUI_PIPELINED', '0') == '1'
+
+# Record the session's network traffic to a HAR file, or replay it offline from one
+HAR_MODE = os.environ.get('WEBUI_HAR_MODE')  # "record" or "replay"
+HAR_PATH = os.environ.get('WEBUI_HAR_PATH', os.path.join(os.path.dirname(__file__), 'test_reports', 'session.har'))
+HAR_UNMATCHED = os.environ.get('WEBUI_HAR_UNMATCHED', 'abort')  # replay: "abort" or "network"
+
+# Sub-resources the browser loads: "full", "lean" (no images, media, fonts or analytics) or "text-only",
+# with per-domain overrides such as "www.saucedemo.com=full,cdn.example.com=text-only"
+RESOURCE_PROFILE = os.environ.get('WEBUI_RESOURCE_PROFILE', 'full')
+RESOURCE_OVERRIDES = parse_overrides(os.environ.get('WEBUI_RESOURCE_OVERRIDES', ''))
+
+# Repeated-action events (hints, reloads, aborts) appended as JSON lines for analysis
+LOOP_EVENTS_FILE = os.path.join(os.path.dirname(__file__), 'test_reports', 'loop_events.jsonl')
+
+# Parsed test suites, keyed by content hash (memory LRU + JSON files on disk)
+SUITE_CACHE_DIR = os.path.join(os.path.dirname(__file__), 'suite_cache')
+# Directory /api/suites may load suite files from by path; unset disables loading by path
+SUITES_DIR = os.environ.get('WEBUI_SUITES_DIR')
+suite_cache = SuiteCache(SUITE_CACHE_DIR, suites_dir=SUITES_DIR)
+
 def ensure_report_directory():
     """Ensure the test_reports directory exists."""
     report_dir = os.path.dirname(REPORT_FILE)
@@ -31,14 +101,13 @@ def ensure_report_directory():
 
 def extract_url_from_instructions(instructions):
     """Extract URL from instructions if present."""
-    urls = re.findall(r'(?P<url>https?://[^\s]+)', instructions)
-    return urls[0] if urls else None
+    match = URL_PATTERN.search(instructions)
+    return match.group(0) if match else None
 
 def extract_testcase_info(instructions):
     """Extract test case number and description from instructions."""
     # Pattern: TestCase Number - 1001.1.1.1, Description
-    pattern = r'TestCase Number\s*-\s*([0-9.]+)\s*,\s*([^:]+):'
-    match = re.search(pattern, instructions, re.IGNORECASE)
+    match = ONE_LINE_PATTERN.search(instructions)
     
     if match:
         test_case_number = match.group(1).strip()
@@ -46,104 +115,57 @@ def extract_testcase_info(instructions):
         return test_case_number, test_case_name
     return None, None
 
-def extract_all_testcases(instructions):
-    """Extract all test case numbers and descriptions from instructions."""
-    pattern = r'TestCase Number\s*-\s*([0-9.]+)\s*,\s*([^:]+):'
-    matches = re.finditer(pattern, instructions, re.IGNORECASE)
-    
-    test_cases = []
-    for match in matches:
-        test_case_number = match.group(1).strip()
-        test_case_name = match.group(2).strip()
-        test_cases.append({
-            'number': test_case_number,
-            'name': test_case_name,
-            'start_pos': match.start()
-        })
-    
-    return test_cases
-
-def split_instructions_by_testcase(instructions):
-    """Split instructions into separate test case blocks."""
-    test_cases = extract_all_testcases(instructions)
-    
-    if not test_cases:
-        return [(None, None, instructions)]
-    
-    result = []
-    for i, tc in enumerate(test_cases):
-        start = tc['start_pos']
-        # Find the start of this test case block (go backwards to find beginning)
-        block_start = 0
-        if i > 0:
-            # Start after the previous test case
-            prev_end = test_cases[i-1]['start_pos']
-            # Find where previous test case validation ends
-            validation_pattern = r'Update the result in one word \(Pass/Fail\) in report against this test case number\.'
-            prev_section = instructions[:start]
-            validation_matches = list(re.finditer(validation_pattern, prev_section, re.IGNORECASE))
-            if validation_matches:
-                block_start = validation_matches[-1].end()
-        
-        # Find the end of this test case block
-        if i < len(test_cases) - 1:
-            block_end = test_cases[i + 1]['start_pos']
-            # Find the validation statement end
-            section = instructions[start:block_end]
-            validation_match = re.search(r'Update the result in one word \(Pass/Fail\) in report against this test case number\.', section, re.IGNORECASE)
-            if validation_match:
-                block_end = start + validation_match.end()
-        else:
-            block_end = len(instructions)
-        
-        block_text = instructions[block_start:block_end].strip()
-        result.append((tc['number'], tc['name'], block_text))
-    
-    return result
-
 def parse_pass_fail_from_output(output_text):
     """Parse Pass/Fail result from agent output."""
-    output_lower = output_text.lower()
-    
-    # Get the last 500 characters for final verdict analysis
-    last_part = output_text[-500:].lower() if len(output_text) > 500 else output_lower
-    
-    # Look for explicit Pass/Fail at the end (highest priority)
-    if last_part.strip().endswith('pass') or last_part.strip().endswith('passed'):
-        return 'Pass'
-    if last_part.strip().endswith('fail') or last_part.strip().endswith('failed'):
-        return 'Fail'
-    
-    # Check for explicit statements
-    if 'test case is passed' in last_part or 'result: pass' in last_part:
-        return 'Pass'
-    if 'test case is failed' in last_part or 'result: fail' in last_part:
-        return 'Fail'
-    
-    # Failure indicators (check first as they're more critical)
-    fail_indicators = [
-        'unable to', 'cannot', 'error', 'failed', 'failure', 
-        'incorrect', 'does not match', 'not found', 'not visible',
-        'blocked', 'denied', 'locked out'
-    ]
-    
-    for indicator in fail_indicators:
-        if indicator in output_lower:
-            return 'Fail'
-    
-    # Success indicators
-    success_indicators = [
-        'passed', 'successful', 'verified', 'correct', 'appears correctly',
-        'displayed', 'loaded', 'visible', 'confirmation', 'completed successfully'
-    ]
-    
-    for indicator in success_indicators:
-        if indicator in output_lower:
-            return 'Pass'
-    
-    return 'Unknown'
+    return classify_output(output_text).verdict
+
+# Function tool the agent calls to end a test case with a structured verdict
+REPORT_RESULT_TOOL = {
+    "type": "function",
+    "name": "report_result",
+    "description": "Report the final verdict of the current test case. Call this exactly once, after all verification steps are done.",
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "test_case_number": {
+                "type": "string",
+                "description": "The test case number, e.g. 1001.1.1.1.",
+            },
+            "verdict": {
+                "type": "string",
+                "enum": ["Pass", "Fail"],
+                "description": "Pass if every verification step succeeded, otherwise Fail.",
+            },
+            "reason": {
+                "type": "string",
+                "description": "One sentence explaining the verdict.",
+            },
+        },
+        "additionalProperties": False,
+        "required": ["test_case_number", "verdict", "reason"],
+    },
+}
 
-def save_test_case_result(test_case_number, test_case_name, result, screenshot_b64, terminal_output, instructions, session_id):
+def make_report_result_handler(task_id):
+    """Build the report_result handler; verdicts are stored on the task for run_single_testcase."""
+    def report_result(test_case_number, verdict, reason=""):
+        verdict = str(verdict).strip().capitalize()
+        if verdict not in ("Pass", "Fail"):
+            return {"status": "error", "message": "verdict must be 'Pass' or 'Fail'"}
+        expected = tasks[task_id].get("test_case_number")
+        if expected and str(test_case_number).strip() != expected:
+            print(f"Warning: report_result for {test_case_number} while running {expected}")
+        tasks[task_id]["reported_result"] = {
+            "test_case_number": str(test_case_number).strip(),
+            "verdict": verdict,
+            "reason": str(reason).strip(),
+        }
+        print(f"report_result: {test_case_number} -> {verdict} ({reason})")
+        return {"status": "recorded", "verdict": verdict}
+    return report_result
+
+def save_test_case_result(test_case_number, test_case_name, result, screenshot_b64, terminal_output, instructions, session_id,
+                          usage=None, stop_reason=None):
     """Save test case result to JSON report file."""
     ensure_report_directory()
     
@@ -162,6 +184,7 @@ def save_test_case_result(test_case_number, test_case_name, result, screenshot_b
             "test_suite": "Sauce Demo Automation Test Suite",
             "session_id": session_id,
             "execution_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "resource_profile": current_resource_profile,
             "test_cases": []
         }
     
@@ -173,8 +196,12 @@ def save_test_case_result(test_case_number, test_case_name, result, screenshot_b
         "executed_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         "instructions": instructions.strip(),
         "terminal_output": terminal_output,
-        "screenshot": screenshot_b64 if screenshot_b64 else None  # Store full screenshot for export
+        # Store full screenshot for export; report assets are PNG whatever the capture format
+        "screenshot": to_png_base64(screenshot_b64) if screenshot_b64 else None,
+        "usage": usage
     }
+    if stop_reason:
+        test_case_entry["stop_reason"] = stop_reason
     
     # Append to report
     report["test_cases"].append(test_case_entry)
@@ -190,19 +217,31 @@ def save_test_case_result(test_case_number, test_case_name, result, screenshot_b
         "passed": passed,
         "failed": failed,
         "unknown": unknown,
-        "pass_rate": f"{(passed/total*100):.2f}%" if total > 0 else "0%"
+        "pass_rate": f"{(passed/total*100):.2f}%" if total > 0 else "0%",
+        "usage": sum_usage(tc.get("usage") for tc in report["test_cases"]),
+        # Screenshots of a session without images or styling must be judged accordingly
+        "resource_profile": report.get("resource_profile")
     }
     
     # Save report
     with open(REPORT_FILE, 'w', encoding='utf-8') as f:
         json.dump(report, f, indent=2, ensure_ascii=False)
     
+    # Append the rendered test case to the live HTML report
+    try:
+        if live_report.session_id != session_id:
+            live_report.start(session_id, report["execution_date"])
+        live_report.append(test_case_entry, report["summary"])
+    except Exception as e:
+        print(f"⚠️  Could not update live report: {e}")
+    
     print(f"✓ Test Case {test_case_number} - {result} - Saved to report")
     return report
 
-def run_cua_task(task_id, instructions):
-    global current_session_id
+def run_cua_task(task_id, suite):
+    global current_session_id, current_resource_profile
     computer = None
+    agent = None
     
     try:
         # Create a new session ID for this test run
@@ -214,8 +253,8 @@ def run_cua_task(task_id, instructions):
         print(f"Previous test results will be cleared")
         print(f"{'='*70}\n")
         
-        # Split instructions into separate test cases
-        test_case_blocks = split_instructions_by_testcase(instructions)
+        # Test cases were parsed (or fetched from the cache) when the task was submitted
+        test_case_blocks = suite.blocks()
         
         if len(test_case_blocks) > 1:
             print(f"\n{'='*70}")
@@ -223,23 +262,66 @@ def run_cua_task(task_id, instructions):
             print(f"{'='*70}\n")
         
         # Initialize the computer and agent once for all test cases
-        computer = LocalPlaywrightBrowser(headless=False)
+        if CDP_URL:
+            computer = LocalCDPBrowser(cdp_url=CDP_URL)
+        else:
+            computer = LocalPlaywrightBrowser(headless=HEADLESS, low_memory=LOW_MEMORY, js_heap_mb=JS_HEAP_MB)
+        if HAR_MODE:
+            computer.use_har(HAR_PATH, mode=HAR_MODE, unmatched=HAR_UNMATCHED)
+            print(f"Network {HAR_MODE} mode using {HAR_PATH}")
+        computer.use_resource_profile(RESOURCE_PROFILE, RESOURCE_OVERRIDES)
+        computer.set_screenshot_format(SCREENSHOT_FORMAT, SCREENSHOT_QUALITY)
+        computer.set_type_mode(TYPE_MODE, TYPE_INSERT_MIN_CHARS)
+        computer.screencast = screencasts.channel(task_id)
+        current_resource_profile = computer.resource_policy.describe()
+        if computer.resource_policy.active:
+            print(f"Resource profile: {RESOURCE_PROFILE} ({computer.resource_policy.profile.description})")
         computer.__enter__()  # This ensures the browser is properly initialized
         
         # Extract URL from instructions if present and navigate to it
-        start_url = extract_url_from_instructions(instructions)
+        start_url = extract_url_from_instructions(suite.instructions)
         if start_url:
             computer.goto(start_url)
             
-        agent = Agent(computer=computer)
+        agent = Agent(
+            computer=computer,
+            tools=[REPORT_RESULT_TOOL],
+            functions={"report_result": make_report_result_handler(task_id)},
+            end_turn_on={"report_result"},
+            loop_detector=LoopDetector(log_path=LOOP_EVENTS_FILE),
+            pipelined=PIPELINED,
+        )
+        session_budget = Budget.from_env("session", "WEBUI_SESSION")
+        setups = None
+        test_cases = suite.test_cases or [None]
+        if REUSE_SETUP_SNAPSHOTS:
+            setups = SessionSetups(computer, agent, session_budget)
+            prefix_plan = plan_shared_prefixes(test_cases, start_url)
+            per_case, once = count_saved_steps(prefix_plan)
+            if per_case:
+                print(f"Shared step prefixes: {per_case} step executions reduced to {once}")
         
         # Process each test case
-        for test_case_number, test_case_name, test_case_instructions in test_case_blocks:
+        for index, (test_case_number, test_case_name, test_case_instructions) in enumerate(test_case_blocks):
+            try:
+                session_budget.check()
+            except BudgetExceeded as e:
+                skipped = len(test_case_blocks) - index
+                print(f"Stopping session: {e.reason}; {skipped} test case(s) not run")
+                tasks[task_id]["message"] = f"Stopped: {e.reason}. {skipped} test case(s) not run"
+                break
+            
             if test_case_number:
                 print(f"\n{'='*70}")
                 print(f"Starting Test Case: {test_case_number} - {test_case_name}")
                 print(f"{'='*70}\n")
             
+            # Skip shared setup steps by forking from the session's checkpoint of them
+            setup = None
+            if setups:
+                preamble = prefix_plan[index] or detect_login_preamble(test_cases[index], start_url)
+                setup = setups.prepare(preamble)
+            
             # Run single test case
             run_single_testcase(
                 task_id=task_id,
@@ -248,16 +330,19 @@ def run_cua_task(task_id, instructions):
                 instructions=test_case_instructions,
                 computer=computer,
                 agent=agent,
-                session_id=session_id
+                session_id=session_id,
+                session_budget=session_budget,
+                setup=setup
             )
             
-            # Brief pause between test cases
+            # Let the page finish whatever the last test case started
             if test_case_number and len(test_case_blocks) > 1:
-                time.sleep(2)
+                computer.settle()
         
         # Mark overall task as completed
         tasks[task_id]["status"] = "completed"
-        tasks[task_id]["message"] = f"All test cases completed. Total: {len(test_case_blocks)}"
+        if not session_budget.exceeded:
+            tasks[task_id]["message"] = f"All test cases completed. Total: {len(test_case_blocks)}"
         
     except Exception as e:
         # Update task status with error
@@ -266,15 +351,43 @@ def run_cua_task(task_id, instructions):
         tasks[task_id]["status"] = "error"
         tasks[task_id]["message"] = f"Error: {error_msg}"
     finally:
+        # End any live views of this task
+        screencasts.close(task_id)
+        
+        # Close off the live HTML report for this session
+        if live_report.session_id == current_session_id:
+            live_report.finish()
+        
+        if agent and agent.step_timings:
+            stats = agent.step_stats()
+            print(f"Agent overhead per model call ({'pipelined' if stats['pipelined'] else 'sequential'}): "
+                  f"{stats['overhead_ms']} ms ({stats['handle_ms']} ms handling actions, "
+                  f"{stats['build_ms']} ms building requests)")
+
         # Make sure we clean up the computer/browser
         if computer:
+            if computer.har_mode == "replay" and computer.har_unmatched_urls:
+                print(f"{len(computer.har_unmatched_urls)} request(s) were not in the HAR ({HAR_UNMATCHED})")
+            if computer.resource_blocked:
+                print(f"Skipped by the resource profile: {computer.resource_blocked}")
+            if computer.screencast_dropped:
+                print(f"Screencast frames dropped by the frame-rate limit: {computer.screencast_dropped}")
+            for path, stats in computer.screenshot_stats().items():
+                print(f"Screenshots via {path}: {stats['count']} taken, mean {stats['mean_ms']} ms, "
+                      f"p95 {stats['p95_ms']} ms, max {stats['max_ms']} ms")
             try:
                 computer.__exit__(None, None, None)
             except:
                 pass
 
-def run_single_testcase(task_id, test_case_number, test_case_name, instructions, computer, agent, session_id):
-    """Run a single test case and save results."""
+def run_single_testcase(task_id, test_case_number, test_case_name, instructions, computer, agent, session_id,
+                        session_budget=None, setup=None):
+    """
+    Run a single test case and save results.
+
+    `setup` is a PreparedSetup when the browser was restored from a checkpoint
+    of the test case's leading steps (see session_setup.py).
+    """
     # Update task status
     tasks[task_id]["status"] = "running"
     tasks[task_id]["message"] = f"Running test case {test_case_number}" if test_case_number else "Task started"
@@ -282,25 +395,36 @@ def run_single_testcase(task_id, test_case_number, test_case_name, instructions,
     tasks[task_id]["prompt"] = None
     tasks[task_id]["test_case_number"] = test_case_number
     tasks[task_id]["test_case_name"] = test_case_name
+    tasks[task_id]["reported_result"] = None
+    
+    # Every model call of this test case counts against its budget (and the session's)
+    case_budget = Budget.from_env("test case", "WEBUI_CASE", CASE_BUDGET_DEFAULTS, parent=session_budget)
+    agent.budget = case_budget
+    if agent.loop_detector:
+        agent.loop_detector.reset(context=f"{session_id} {test_case_number or task_id}")
     
     try:
         # Check if we need to navigate to a URL for this test
+        # (a restored setup snapshot already put the browser on the right page)
         start_url = extract_url_from_instructions(instructions)
-        if start_url:
+        if start_url and not setup:
             print(f"Navigating to: {start_url}")
             computer.goto(start_url)
-            computer.wait(2000)  # Wait for page load
+            computer.settle()  # Wait for the page to finish loading and rendering
         
         # Convert instructions into properly formatted input items with roles
         # Add context about being in browser automation mode
+        setup_section = f"\n{setup.note}\n" if setup else ""
         enhanced_instructions = f"""You are controlling a real browser for automated testing.
-Execute the following test case step by step.
-After completing all verification steps, provide a clear final verdict.
-State either "Pass" or "Fail" as your final answer.
-
+Execute the following test case step by step without asking for confirmation.
+After completing all verification steps, call the report_result function with the
+test case number, your verdict ("Pass" or "Fail") and a one-sentence reason.
+If you cannot call functions, state either "Pass" or "Fail" as your final answer.
+{setup_section}
 {instructions}"""
         
-        input_items = [
+        # Continue the conversation that led to a restored checkpoint, if any
+        input_items = (list(setup.history) if setup else []) + [
             {
                 "role": "user",
                 "content": enhanced_instructions
@@ -331,6 +455,9 @@ State either "Pass" or "Fail" as your final answer.
             output_items = agent.run_full_turn(input_items, print_steps=True)
             print(f"Agent turn {turn_count} completed")
             
+            # Keep the conversation so follow-up turns continue where the agent stopped
+            input_items = input_items + output_items
+            
             # Process output items to separate terminal output from agent messages
             terminal_output = []
             last_output = ""
@@ -347,10 +474,11 @@ State either "Pass" or "Fail" as your final answer.
                             print(f"DEBUG: Output data type: {output_data.get('type')}")
                             if output_data.get("type") == "input_image":
                                 image_url = output_data.get("image_url", "")
-                                # Extract base64 data from data:image/png;base64,<data>
-                                if image_url.startswith("data:image/png;base64,"):
-                                    screenshot_b64 = image_url.split(",", 1)[1]
+                                # Extract base64 data from data:image/<format>;base64,<data>
+                                header, _, screenshot_b64 = image_url.partition(",")
+                                if header.startswith("data:image/") and header.endswith(";base64"):
                                     tasks[task_id]["screenshot"] = screenshot_b64
+                                    tasks[task_id]["screenshot_mime"] = header[len("data:"):-len(";base64")]
                                     print(f"DEBUG: Screenshot captured, length: {len(screenshot_b64)}")
                         
                         # Capture ALL message content (including reasoning and regular messages)
@@ -375,44 +503,76 @@ State either "Pass" or "Fail" as your final answer.
             
             print(f"Last output: {last_output}")
             
-            # Convert to lowercase for checking
-            last_output_lower = last_output.lower()
+            # A report_result call ends the test case with a structured verdict
+            reported = tasks[task_id].get("reported_result")
+            if reported and test_case_number:
+                result = reported["verdict"]
+                terminal_output.append(f"Verdict: {result} - {reported['reason']}")
+                terminal_output_str = "\n".join(terminal_output)
+                tasks[task_id]["terminal_output"] = terminal_output_str
+                
+                save_test_case_result(
+                    test_case_number=test_case_number,
+                    test_case_name=test_case_name,
+                    result=result,
+                    screenshot_b64=tasks[task_id].get("screenshot", ""),
+                    terminal_output=terminal_output_str,
+                    instructions=instructions,
+                    session_id=session_id,
+                    usage=case_budget.usage()
+                )
+                
+                print(f"\n{'='*70}")
+                print(f"Test Case {test_case_number} - Result: {result} (reported in turn {turn_count})")
+                print(f"{'='*70}\n")
+                
+                tasks[task_id]["message"] = f"Test Case {test_case_number} completed - {result}"
+                tasks[task_id]["test_result"] = result
+                return
+            
+            # A budget ran out or the agent got stuck: end the test case with what we have
+            stuck_reason = agent.loop_detector.aborted if agent.loop_detector else None
+            if case_budget.exceeded or stuck_reason:
+                reason = case_budget.exceeded or stuck_reason
+                print(f"Stopping test case {test_case_number}: {reason}")
+                tasks[task_id]["message"] = f"Stopped: {reason}"
+                if test_case_number:
+                    terminal_output_str = "\n".join(terminal_output)
+                    result = parse_pass_fail_from_output(terminal_output_str)
+                    if result == 'Unknown':
+                        result = 'Fail'  # Default to Fail if unclear when stopped early
+                    terminal_output_str += f"\n\n[Test stopped: {reason}]"
+                    save_test_case_result(
+                        test_case_number=test_case_number,
+                        test_case_name=test_case_name,
+                        result=result,
+                        screenshot_b64=tasks[task_id].get("screenshot", ""),
+                        terminal_output=terminal_output_str,
+                        instructions=instructions,
+                        session_id=session_id,
+                        usage=case_budget.usage(),
+                        stop_reason=reason
+                    )
+                    tasks[task_id]["test_result"] = result
+                return
             
             # Check if this is a test case completion (looking for Pass/Fail indication)
-            is_test_case_complete = False
             terminal_output_str = "\n".join(terminal_output)
+            classification = classify_output(terminal_output_str, last_output)
             
-            # Check if the agent explicitly states pass/fail at the END of output
-            if test_case_number:
-                # Look for pass/fail in last output or if "tell us" question was answered
-                if (last_output.strip().lower() in ['pass', 'fail', 'passed', 'failed'] or
-                    "test case is passed" in last_output_lower or
-                    "test case is failed" in last_output_lower or
-                    "result: pass" in last_output_lower or
-                    "result: fail" in last_output_lower):
-                    is_test_case_complete = True
-            
-            # Check for various types of prompts that need user input
-            # But auto-respond to procedural questions during test execution
-            needs_input = False
-            auto_response = None
+            # Only an explicit pass/fail at the END of output completes a test case
+            is_test_case_complete = bool(test_case_number) and classification.complete
             
-            if "?" in last_output:
-                # Auto-respond to procedural questions
-                if ("should i" in last_output_lower or "proceed" in last_output_lower or
-                    "shall i" in last_output_lower or "go ahead" in last_output_lower):
-                    auto_response = "yes, proceed"
-                    print(f"Auto-responding to procedural question: '{last_output}' with 'yes, proceed'")
-                elif "do you want" in last_output_lower or "would you like" in last_output_lower:
-                    auto_response = "yes"
-                    print(f"Auto-responding to question: '{last_output}' with 'yes'")
-                else:
-                    # For non-procedural questions, mark as needing input
-                    needs_input = True
+            # Auto-respond to procedural questions during test execution;
+            # any other question needs user input
+            auto_response = classification.auto_response
+            needs_input = classification.needs_input
+            if auto_response:
+                print(f"Auto-responding to {classification.question_type} question: '{last_output}' with '{auto_response}'")
             
             # If test case is complete, save the result
             if is_test_case_complete and test_case_number:
-                result = parse_pass_fail_from_output(terminal_output_str)
+                result = classification.verdict
                 screenshot_b64 = tasks[task_id].get("screenshot", "")
                 
                 # Save test case result to JSON report
@@ -423,7 +583,8 @@ State either "Pass" or "Fail" as your final answer.
                     screenshot_b64=screenshot_b64,
                     terminal_output=terminal_output_str,
                     instructions=instructions,
-                    session_id=session_id
+                    session_id=session_id,
+                    usage=case_budget.usage()
                 )
                 
                 print(f"\n{'='*70}")
@@ -454,7 +615,7 @@ State either "Pass" or "Fail" as your final answer.
                 # Check for various completion signals
                 print(f"Processing agent output: {last_output}")
                 
-                if not needs_input and "completed" in last_output_lower:
+                if not needs_input and classification.completed_signal:
                     # Only ask for next steps if the task appears to be completed
                     print("Task completed, prompting for next steps")
                     tasks[task_id]["needs_input"] = True
@@ -486,7 +647,9 @@ State either "Pass" or "Fail" as your final answer.
                 screenshot_b64=screenshot_b64,
                 terminal_output=terminal_output_str,
                 instructions=instructions,
-                session_id=session_id
+                session_id=session_id,
+                usage=case_budget.usage(),
+                stop_reason="max turns reached"
             )
             
             print(f"\n{'='*70}")
@@ -509,19 +672,71 @@ State either "Pass" or "Fail" as your final answer.
                 screenshot_b64=tasks[task_id].get("screenshot", ""),
                 terminal_output=f"Error: {error_msg}",
                 instructions=instructions,
-                session_id=session_id
+                session_id=session_id,
+                usage=case_budget.usage(),
+                stop_reason=f"error: {error_msg}"
             )
 
 @app.route('/')
 def index():
     return render_template('index.html')
 
+@app.route('/api/suites', methods=['POST'])
+def register_suite():
+    """Parse and cache a suite given as text, or as a file/directory path inside WEBUI_SUITES_DIR."""
+    data = request.get_json() or {}
+    instructions = data.get('instructions', '')
+    path = data.get('path', '')
+    
+    try:
+        if instructions:
+            suite = suite_cache.get_or_parse(instructions)
+        elif path:
+            if not SUITES_DIR:
+                return jsonify({
+                    'status': 'error',
+                    'message': 'Loading suites by path is disabled; set WEBUI_SUITES_DIR'
+                }), 403
+            suite = suite_cache.load_path(path)
+        else:
+            return jsonify({
+                'status': 'error',
+                'message': 'No instructions or path provided'
+            }), 400
+    except (OSError, ValueError) as e:
+        return jsonify({
+            'status': 'error',
+            'message': f'Could not load suite: {e}'
+        }), 400
+    
+    return jsonify({'status': 'ok', **suite.describe()})
+
+@app.route('/api/suites/<suite_id>')
+def get_suite(suite_id):
+    suite = suite_cache.get(suite_id)
+    if suite is None:
+        return jsonify({
+            'status': 'error',
+            'message': 'Suite not found'
+        }), 404
+    return jsonify({'status': 'ok', **suite.describe()})
+
 @app.route('/api/send-task', methods=['POST'])
 def send_task():
     data = request.get_json() or {}
     instructions = data.get('instructions', '')
-    
-    if not instructions:
+    suite_id = data.get('suite_id', '')
+    
+    if suite_id:
+        suite = suite_cache.get(suite_id)
+        if suite is None:
+            return jsonify({
+                'status': 'error',
+                'message': 'Suite not found; register it via /api/suites first'
+            }), 404
+    elif instructions:
+        suite = suite_cache.get_or_parse(instructions)
+    else:
         return jsonify({
             'status': 'error',
             'message': 'No instructions provided'
@@ -532,18 +747,20 @@ def send_task():
     tasks[task_id] = {
         "status": "pending",
         "message": "Task queued",
-        "instructions": instructions
+        "suite_id": suite.suite_id
     }
     
-    # Start task in background
-    thread = Thread(target=run_cua_task, args=(task_id, instructions))
+    # Start task in background; the screencast is live until run_cua_task closes it
+    screencasts.open(task_id)
+    thread = Thread(target=run_cua_task, args=(task_id, suite))
     thread.daemon = True
     thread.start()
     
     return jsonify({
         'status': 'ok',
         'message': 'Task started',
-        'task_id': task_id
+        'task_id': task_id,
+        'suite_id': suite.suite_id
     })
 
 @app.route('/api/task-status/<task_id>')
@@ -556,6 +773,27 @@ def task_status(task_id):
     
     return jsonify(tasks[task_id])
 
+@app.route('/api/screencast/<task_id>')
+def task_screencast(task_id):
+    """Live MJPEG view of a task's browser; frames are only produced while a viewer is connected."""
+    if task_id not in tasks:
+        return jsonify({
+            'status': 'error',
+            'message': 'Task not found'
+        }), 404
+    # A test case can report "completed" or "error" while the run goes on, so
+    # only the end of the runner thread ends the stream
+    if not screencasts.is_live(task_id):
+        return jsonify({
+            'status': 'error',
+            'message': 'Task has finished'
+        }), 410
+    return Response(
+        screencasts.channel(task_id).stream(),
+        mimetype=MJPEG_MIMETYPE,
+        headers={'Cache-Control': 'no-cache, no-store', 'X-Accel-Buffering': 'no'}
+    )
+
 @app.route('/api/respond-to-prompt/<task_id>', methods=['POST'])
 def respond_to_prompt(task_id):
     if task_id not in tasks:
@@ -608,6 +846,22 @@ def clear_test_report():
         'message': 'No report to clear'
     })
 
+@app.route('/report/live')
+def live_session_report():
+    """Serve the HTML report of the current session as it is being built."""
+    page = live_report.read_page()
+    if page is None:
+        return jsonify({
+            'status': 'error',
+            'message': 'No live report available yet'
+        }), 404
+    return Response(page, mimetype='text/html')
+
+@app.route('/report/report_assets/<path:filename>')
+def live_report_asset(filename):
+    """Serve screenshot thumbnails and full images referenced by the live report."""
+    return send_from_directory(live_report.assets_dir, filename)
+
 if __name__ == '__main__':
     port = int(os.environ.get('WEBUI_PORT', 5001))
     app.run(host='0.0.0.0', port=port, debug=True)
@@ -0,0 +1,197 @@
+"""
+Session Setup Snapshots
+Runs shared setup steps once per session and starts later test cases from a checkpoint of them.
+
+Most test cases begin with "Login using 'standard_user' as username and
+'secret_sauce' as password", and many share longer prefixes still (see
+prefix_tree.py). The first time a setup is needed, the agent performs just
+those steps and the browser state (cookies, localStorage and URL) is saved as
+a named snapshot together with the agent conversation. Every test case with
+the same setup then starts in a fresh context restored from that checkpoint,
+continues the saved conversation, and is told to skip the steps already done.
+
+Setups can be nested: a setup with a `parent` is captured by restoring the
+parent's checkpoint and performing only the remaining steps.
+"""
+
+import re
+from dataclasses import dataclass, field
+from urllib.parse import urlparse
+
+# "Login using 'standard_user' as username and 'secret_sauce' as password",
+# "Login with 'standard_user' and 'secret_sauce'"
+LOGIN_STEP_PATTERN = re.compile(
+    r"\blog\s*in\s+(?:using|with|as)\s+'(?P<username>[^']+)'(?:\s+as\s+(?:the\s+)?username)?"
+    r"\s+and\s+'(?P<password>[^']+)'",
+    re.IGNORECASE,
+)
+
+# "Load https://www.saucedemo.com/" before the login step
+LOAD_STEP_PATTERN = re.compile(r'^(?:load|open|navigate to|go to)\s+(?P<url>https?://\S+?)\.?$', re.IGNORECASE)
+
+# Turns the agent gets to perform a setup preamble
+SETUP_MAX_TURNS = 3
+
+# Word the agent replies with once the setup steps are done
+DONE_WORD = 'DONE'
+
+
+@dataclass
+class SetupPreamble:
+    """Leading steps shared by test cases that can be run once and checkpointed."""
+
+    name: str  # snapshot name, e.g. "login:standard_user@www.saucedemo.com"
+    steps: list[str]
+    url: str
+    username: str | None = None  # set for login preambles
+    parent: "SetupPreamble | None" = None  # checkpoint these steps continue from
+    verify_url_change: bool = False  # capture only counts if the browser left `url`
+
+
+@dataclass
+class PreparedSetup:
+    """What a test case needs to continue from a restored checkpoint."""
+
+    note: str
+    history: list = field(default_factory=list)
+
+
+def detect_login_preamble(test_case, default_url=None):
+    """
+    Return the SetupPreamble a test case starts with, or None.
+
+    Only a login that is the first step (optionally after loading the start
+    page) and is followed by more steps counts; test cases that exercise the
+    login form itself spell it out in separate steps and are left alone.
+    """
+    if test_case is None or not test_case.steps:
+        return None
+    steps = test_case.steps
+    url = test_case.start_url or default_url
+    index = 0
+    load = LOAD_STEP_PATTERN.match(steps[0].strip())
+    if load:
+        url = load.group('url')
+        index = 1
+    if index >= len(steps) - 1 or not url:
+        return None
+    login = LOGIN_STEP_PATTERN.search(steps[index])
+    if not login:
+        return None
+    username = login.group('username')
+    host = urlparse(url).hostname or url
+    return SetupPreamble(
+        name=f"login:{username}@{host}",
+        steps=steps[:index + 1],
+        url=url,
+        username=username,
+        verify_url_change=True,
+    )
+
+
+def _normalize_url(url):
+    return (url or '').rstrip('/')
+
+
+def _format_steps(steps):
+    return '\n'.join(f"- {step}" for step in steps)
+
+
+def _last_text(items):
+    for item in reversed(items):
+        if isinstance(item, dict) and item.get("role") == "assistant":
+            content = item.get("content")
+            if isinstance(content, list):
+                return ' '.join(c.get("text", "") for c in content if isinstance(c, dict))
+            if isinstance(content, str):
+                return content
+    return ''
+
+
+class SessionSetups:
+    """Captures setup checkpoints on first use and restores them for later test cases."""
+
+    def __init__(self, computer, agent, budget=None):
+        self.computer = computer
+        self.agent = agent
+        self.budget = budget
+        self.conversations = {}  # setup name -> agent conversation at the checkpoint
+        self.failed = set()  # setups that could not be captured; not retried
+
+    def prepare(self, preamble):
+        """
+        Put the browser in a fresh context restored from the preamble's checkpoint.
+
+        Captures the checkpoint first if needed. Returns a PreparedSetup with the
+        note to give the agent about the skipped steps and the conversation to
+        continue, or None if the test case should run the steps itself.
+        """
+        if preamble is None or preamble.name in self.failed:
+            return None
+        if not self.computer.has_state(preamble.name) and not self._capture(preamble):
+            self.failed.add(preamble.name)
+            return None
+        self.computer.restore_state(preamble.name)
+        self.computer.settle()
+        if preamble.username:
+            state = f"the browser is logged in as '{preamble.username}' on {self.computer.get_current_url()}"
+        else:
+            state = f"the browser is on {self.computer.get_current_url()}"
+        note = (f"These setup steps were already done for you; {state}. "
+                f"Do not repeat them, continue with the steps that follow:\n{_format_steps(preamble.steps)}")
+        return PreparedSetup(note, list(self.conversations.get(preamble.name, [])))
+
+    def _capture(self, preamble):
+        print(f"Capturing setup checkpoint '{preamble.name}'")
+        steps = preamble.steps
+        history = []
+        if preamble.parent is not None:
+            parent = self.prepare(preamble.parent)
+            if parent is None:
+                return False
+            history = parent.history
+            steps = steps[len(preamble.parent.steps):]
+        else:
+            self.computer.restore_state(None, url=preamble.url)
+            self.computer.settle()
+
+        input_items = history + [{
+            "role": "user",
+            "content": (
+                "You are controlling a real browser. Perform only these setup steps, without asking "
+                f"for confirmation, then reply with the single word {DONE_WORD}. Do not call report_result.\n"
+                f"{_format_steps(steps)}"
+            ),
+        }]
+
+        previous_budget = self.agent.budget
+        if self.budget is not None:
+            self.agent.budget = self.budget.child(f"setup {preamble.name}")
+        if self.agent.loop_detector:
+            self.agent.loop_detector.reset(context=f"setup {preamble.name}")
+        try:
+            for _ in range(SETUP_MAX_TURNS):
+                output_items = self.agent.run_full_turn(input_items, print_steps=True)
+                input_items = input_items + output_items
+                if self._done(preamble, output_items):
+                    break
+                input_items.append({"role": "user", "content": f"Continue with the setup steps, then reply {DONE_WORD}."})
+        except Exception as e:
+            print(f"Setup '{preamble.name}' failed: {e}")
+            return False
+        finally:
+            self.agent.budget = previous_budget
+
+        if not self._done(preamble, input_items):
+            print(f"Setup '{preamble.name}' did not complete; running its steps in each test case")
+            return False
+        self.computer.save_state(preamble.name)
+        self.conversations[preamble.name] = input_items
+        print(f"Saved setup checkpoint '{preamble.name}' at {self.computer.get_current_url()}")
+        return True
+
+    def _done(self, preamble, items):
+        if preamble.verify_url_change:
+            # Logging in always leaves the login page
+            return _normalize_url(self.computer.get_current_url()) != _normalize_url(preamble.url)
+        return DONE_WORD.lower() in _last_text(items).lower()
@@ -6,12 +6,41 @@ document.addEventListener('DOMContentLoaded', () => {
   const promptEl = document.getElementById('prompt')
   const insightsEl = document.getElementById('insights')
   const previewEl = document.getElementById('preview')
+  const liveBtn = document.getElementById('live')
   
   let activeTaskId = null
   let statusCheckInterval = null
   let isWaitingForInput = false  // Track if we're waiting for user input
   let isUserTyping = false      // Track if user is actively typing
   let lastPrompt = ''           // Store last prompt to prevent duplicates
+  let liveImg = null            // MJPEG <img> while the live view is open
+
+  // The server only streams (and the browser only produces frames) while this image is connected
+  const startLive = () => {
+    if (!activeTaskId || liveImg) return
+    previewEl.innerHTML = ''
+    liveImg = document.createElement('img')
+    liveImg.alt = 'Live browser view'
+    liveImg.src = `/api/screencast/${activeTaskId}`
+    liveImg.onerror = () => stopLive()
+    previewEl.appendChild(liveImg)
+    liveBtn.textContent = 'Stop live view'
+    liveBtn.classList.add('live-on')
+  }
+
+  const stopLive = () => {
+    if (liveImg) {
+      liveImg.onerror = null
+      liveImg.src = ''  // closes the stream
+      liveImg.remove()
+      liveImg = null
+    }
+    liveBtn.textContent = 'Watch live'
+    liveBtn.classList.remove('live-on')
+    liveBtn.disabled = !activeTaskId
+  }
+
+  liveBtn.addEventListener('click', () => (liveImg ? stopLive() : startLive()))
 
   const updateTaskStatus = async (taskId) => {
     try {
@@ -25,23 +54,24 @@ document.addEventListener('DOMContentLoaded', () => {
         insightsEl.textContent = data.message
         clearInterval(statusCheckInterval)
         activeTaskId = null
+        stopLive()
         return
       }
 
-      // Update screenshot if available
-      if (data.screenshot) {
+      // Update screenshot if available (the live view replaces it while open)
+      if (data.screenshot && !liveImg) {
         console.log('Screenshot length:', data.screenshot.length)
         // Clear any existing content
         previewEl.innerHTML = '';
         // Create and add the new image
         const img = document.createElement('img');
-        img.src = `data:image/png;base64,${data.screenshot}`;
+        img.src = `data:${data.screenshot_mime || 'image/png'};base64,${data.screenshot}`;
         img.alt = 'Latest screenshot';
         img.style.display = 'block'; // Ensure image is displayed as block
         img.onload = () => console.log('Screenshot loaded successfully');
         img.onerror = () => console.error('Screenshot failed to load');
         previewEl.appendChild(img);
-      } else if (!previewEl.querySelector('img')) {
+      } else if (!liveImg && !previewEl.querySelector('img')) {
         // Show placeholder if no image
         previewEl.innerHTML = '<div class="screenshot-placeholder">Screenshot preview will appear here</div>';
       }
@@ -77,6 +107,7 @@ document.addEventListener('DOMContentLoaded', () => {
       if (data.status === 'completed') {
         clearInterval(statusCheckInterval)
         activeTaskId = null
+        stopLive()
       }
     } catch (e) {
       console.error('Error checking task status:', e)
@@ -112,6 +143,7 @@ document.addEventListener('DOMContentLoaded', () => {
       
       if (data.status === 'ok') {
         activeTaskId = data.task_id
+        liveBtn.disabled = false
         insightsEl.textContent = 'Task started. Waiting for updates...'
         
         // Start checking status
@@ -134,6 +166,7 @@ document.addEventListener('DOMContentLoaded', () => {
       clearInterval(statusCheckInterval)
     }
     activeTaskId = null
+    stopLive()
     instructionsEl.value = ''
     promptEl.value = ''
     promptEl.disabled = true
@@ -178,6 +211,7 @@ document.addEventListener('DOMContentLoaded', () => {
       clearInterval(statusCheckInterval)
     }
     activeTaskId = null
+    stopLive()
     instructionsEl.value = ''
     promptEl.value = ''
     promptEl.disabled = true
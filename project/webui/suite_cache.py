@@ -0,0 +1,206 @@
+"""
+Parsed Test Suite Cache
+Loads test suites from text, files or directories and caches the parsed test cases by content hash.
+
+A suite's ID is the SHA-256 of its text, so resubmitting the same suite (or
+referring to it by ID) skips parsing entirely. Parsed suites are kept in an
+in-memory LRU and persisted as JSON so they survive server restarts.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+
+from testcase_parser import PARSER_VERSION, TestCase, parse_test_cases
+
+# File extensions picked up when a suite is loaded from a directory
+SUITE_EXTENSIONS = ('.md', '.txt')
+
+# Parsed suites kept in memory before the least recently used one is evicted
+DEFAULT_MAX_ENTRIES = 32
+
+
+@dataclass
+class Suite:
+    """A parsed test suite."""
+
+    suite_id: str
+    instructions: str
+    test_cases: list[TestCase] = field(default_factory=list)
+    source: str | None = None
+
+    def blocks(self):
+        """(number, name, text) per test case, or the whole suite if it has no test cases."""
+        if not self.test_cases:
+            return [(None, None, self.instructions)]
+        return [tc.as_tuple() for tc in self.test_cases]
+
+    def describe(self):
+        """JSON-friendly summary (without the suite text)."""
+        return {
+            'suite_id': self.suite_id,
+            'source': self.source,
+            'size': len(self.instructions),
+            'test_case_count': len(self.test_cases),
+            'test_cases': [{'number': tc.number, 'name': tc.name} for tc in self.test_cases],
+        }
+
+
+def suite_id_for(instructions):
+    """Content hash used as the suite ID."""
+    return hashlib.sha256(instructions.encode('utf-8')).hexdigest()
+
+
+def _inside(root, path):
+    root = os.path.realpath(root)
+    return os.path.commonpath([root, os.path.realpath(path)]) == root
+
+
+def resolve_suite_path(suites_dir, path):
+    """
+    Real path of a suite file or directory given relative to `suites_dir` (or
+    absolute); ValueError if it resolves outside `suites_dir`, symlinks included,
+    or is a file without a suite extension.
+    """
+    resolved = os.path.realpath(os.path.join(suites_dir, path))
+    if not _inside(suites_dir, resolved):
+        raise ValueError(f"Suite path {path!r} is outside the suites directory")
+    if not os.path.isdir(resolved) and not resolved.lower().endswith(SUITE_EXTENSIONS):
+        raise ValueError(f"Suite files must be {' or '.join(SUITE_EXTENSIONS)}: {path!r}")
+    return resolved
+
+
+def load_suite_text(path, root=None):
+    """
+    Read a suite from a file, or from every .md/.txt file in a directory.
+
+    Directory files are concatenated in sorted (path) order, so the result, and
+    therefore the suite ID, is stable. With `root`, files that resolve outside
+    it (through symlinks) are skipped.
+    """
+    if os.path.isdir(path):
+        files = []
+        for walk_root, _, names in os.walk(path):
+            files.extend(os.path.join(walk_root, name) for name in names
+                         if name.lower().endswith(SUITE_EXTENSIONS))
+        if root is not None:
+            files = [file_path for file_path in files if _inside(root, file_path)]
+        if not files:
+            raise FileNotFoundError(f"No suite files ({', '.join(SUITE_EXTENSIONS)}) found in {path}")
+        parts = []
+        for file_path in sorted(files):
+            with open(file_path, 'r', encoding='utf-8') as f:
+                parts.append(f.read().strip())
+        return '\n\n'.join(parts)
+
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+class SuiteCache:
+    """LRU + on-disk cache of parsed suites keyed by content hash."""
+
+    def __init__(self, cache_dir=None, max_entries=DEFAULT_MAX_ENTRIES, suites_dir=None):
+        """
+        Args:
+            suites_dir: If set, load_path() only reads suites inside this directory,
+                with paths taken relative to it. Set it whenever paths come from clients.
+        """
+        self.cache_dir = cache_dir
+        self.suites_dir = suites_dir
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, suite_id):
+        """Return a cached Suite by ID (memory first, then disk), or None."""
+        with self._lock:
+            suite = self._entries.get(suite_id)
+            if suite is not None:
+                self._entries.move_to_end(suite_id)
+                self.hits += 1
+                return suite
+        suite = self._load_from_disk(suite_id)
+        if suite is not None:
+            with self._lock:
+                self.hits += 1
+            self._remember(suite)
+        return suite
+
+    def get_or_parse(self, instructions, source=None):
+        """Return the Suite for this text, parsing and caching it on a miss."""
+        suite_id = suite_id_for(instructions)
+        suite = self.get(suite_id)
+        if suite is not None:
+            return suite
+
+        with self._lock:
+            self.misses += 1
+        suite = Suite(suite_id, instructions, parse_test_cases(instructions), source)
+        self._remember(suite)
+        self._save_to_disk(suite)
+        return suite
+
+    def load_path(self, path):
+        """
+        Load a suite from a file or directory and return its (cached) Suite.
+
+        Raises ValueError for paths outside `suites_dir` (see resolve_suite_path()).
+        """
+        if self.suites_dir is not None:
+            path = resolve_suite_path(self.suites_dir, path)
+        return self.get_or_parse(load_suite_text(path, root=self.suites_dir), source=os.path.abspath(path))
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+    def _remember(self, suite):
+        with self._lock:
+            self._entries[suite.suite_id] = suite
+            self._entries.move_to_end(suite.suite_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _disk_path(self, suite_id):
+        return os.path.join(self.cache_dir, f"{suite_id}.json")
+
+    def _load_from_disk(self, suite_id):
+        # IDs come from clients; only accept plain hex digests as file names
+        if not self.cache_dir or not all(c in '0123456789abcdef' for c in suite_id) or len(suite_id) != 64:
+            return None
+        path = self._disk_path(suite_id)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('parser_version') != PARSER_VERSION:
+                return None
+            return Suite(
+                suite_id=data['suite_id'],
+                instructions=data['instructions'],
+                test_cases=[TestCase(**tc) for tc in data['test_cases']],
+                source=data.get('source'),
+            )
+        except Exception as e:
+            print(f"⚠️  Ignoring unreadable suite cache entry {path}: {e}")
+            return None
+
+    def _save_to_disk(self, suite):
+        if not self.cache_dir:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._disk_path(suite.suite_id)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'parser_version': PARSER_VERSION, **asdict(suite)}, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️  Could not write suite cache entry: {e}")
@@ -0,0 +1,121 @@
+"""
+Tests for the streaming HTML session report
+"""
+
+import base64
+import io
+import json
+import re
+import sys
+
+from PIL import Image
+
+import generate_session_report
+from generate_session_report import ASSETS_DIRNAME, SUMMARY_BLOCK_BYTES, THUMBNAIL_SIZE, generate_html_report
+
+
+def png_base64(width, height, color):
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), color).save(buffer, "PNG")
+    return base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+def make_report(tmp_path):
+    test_cases = [
+        {
+            "test_case_number": f"1001.1.1.{i}",
+            "test_case_name": f"Test {i} <b>ünïcode</b>",
+            "result": result,
+            "executed_at": f"2025-11-24 13:2{i}:00",
+            "instructions": "Load https://www.saucedemo.com/",
+            "terminal_output": "output",
+            "screenshot": png_base64(1280, 720, (40 * i, 0, 0)),
+        }
+        for i, result in enumerate(["Pass", "Fail", "Pass"], 1)
+    ]
+    test_cases[2]["screenshot"] = "iVBORw0KGgo..."  # truncated in the report: no image
+    report = {
+        "session_id": "session_1",
+        "execution_date": "2025-11-24 13:20:00",
+        "test_cases": test_cases,
+        "summary": {"total_tests": 3, "passed": 2, "failed": 1, "unknown": 0, "pass_rate": "66.67%"},
+    }
+    path = tmp_path / "test_case_report.json"
+    path.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    return path, report
+
+
+def test_report_links_thumbnails_and_full_screenshots(tmp_path):
+    path, report = make_report(tmp_path)
+    output = tmp_path / "report.html"
+
+    generate_html_report(str(path), str(output))
+
+    page = output.read_text(encoding="utf-8")
+    assert page.startswith("<!DOCTYPE html>") and page.rstrip().endswith("</html>")
+    assert page.count('<div class="test-case">') == 3
+    numbers = re.findall(r'<span class="test-case-number">([^<]+)</span>', page)
+    assert numbers == ["1001.1.1.1", "1001.1.1.2", "1001.1.1.3"]
+    assert "Test 1 &lt;b&gt;ünïcode&lt;/b&gt;" in page and "<b>ünïcode" not in page
+
+    # The summary cards were written over the fixed-size placeholder, in place
+    head = generate_session_report.render_page_head("session_1", "2025-11-24 13:20:00").encode("utf-8")
+    block = output.read_bytes()[len(head):len(head) + SUMMARY_BLOCK_BYTES]
+    assert '<div class="value">66.67%</div>' in block.decode("utf-8")
+    assert "data:image" not in page
+
+    assets = tmp_path / ASSETS_DIRNAME
+    assert sorted(p.name for p in assets.iterdir()) == [
+        "TC_1001_1_1_1_2025-11-24_13-21-00.png", "TC_1001_1_1_1_2025-11-24_13-21-00_thumb.jpg",
+        "TC_1001_1_1_2_2025-11-24_13-22-00.png", "TC_1001_1_1_2_2025-11-24_13-22-00_thumb.jpg",
+    ]
+    full = assets / "TC_1001_1_1_1_2025-11-24_13-21-00.png"
+    assert full.read_bytes() == base64.b64decode(report["test_cases"][0]["screenshot"])
+    with Image.open(assets / "TC_1001_1_1_1_2025-11-24_13-21-00_thumb.jpg") as thumb:
+        assert thumb.format == "JPEG"
+        assert thumb.width <= THUMBNAIL_SIZE[0] and thumb.height <= THUMBNAIL_SIZE[1]
+    assert f'src="{ASSETS_DIRNAME}/TC_1001_1_1_1_2025-11-24_13-21-00_thumb.jpg"' in page
+    assert f'href="{ASSETS_DIRNAME}/TC_1001_1_1_1_2025-11-24_13-21-00.png"' in page
+    assert page.count("<img ") == 2
+
+
+def test_single_file_report_embeds_screenshots(tmp_path):
+    path, report = make_report(tmp_path)
+    output = tmp_path / "report.html"
+
+    generate_html_report(str(path), str(output), single_file=True)
+
+    page = output.read_text(encoding="utf-8")
+    assert not (tmp_path / ASSETS_DIRNAME).exists()
+    embedded = re.findall(r'<img src="data:image/png;base64,([^"]+)"', page)
+    assert embedded == [test_case["screenshot"] for test_case in report["test_cases"][:2]]
+
+
+def test_measure_reports_peak_memory(tmp_path, monkeypatch, capsys):
+    path, _ = make_report(tmp_path)
+    output = tmp_path / "report.html"
+    monkeypatch.setattr(sys, "argv", ["generate_session_report.py", "--report", str(path),
+                                      "--output", str(output), "--measure", "--no-open"])
+
+    generate_session_report.main()
+
+    printed = capsys.readouterr().out
+    assert re.search(r"Peak memory: \d+\.\d MB", printed)
+    assert output.exists()
+
+
+def test_screenshot_names_stay_inside_the_assets_dir(tmp_path):
+    path, report = make_report(tmp_path)
+    report["test_cases"][0]["test_case_number"] = "../../escaped/1"
+    report["test_cases"][1]["executed_at"] = "/tmp/../x\\y"
+    path.write_text(json.dumps(report), encoding="utf-8")
+
+    generate_html_report(str(path), str(tmp_path / "out" / "report.html"))
+
+    names = sorted(p.name for p in (tmp_path / "out" / ASSETS_DIRNAME).iterdir())
+    assert names == [
+        "TC_1001_1_1_2__tmp____x_y.png", "TC_1001_1_1_2__tmp____x_y_thumb.jpg",
+        "TC_______escaped_1_2025-11-24_13-21-00.png", "TC_______escaped_1_2025-11-24_13-21-00_thumb.jpg",
+    ]
+    assets = tmp_path / "out" / ASSETS_DIRNAME
+    assert all(p.parent == assets for p in tmp_path.rglob("*") if p.suffix in (".png", ".jpg"))
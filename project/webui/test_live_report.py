@@ -0,0 +1,98 @@
+"""
+Tests for the incrementally written live session report
+"""
+
+import base64
+import io
+
+from PIL import Image
+
+from computers.shared.resource_profiles import RESOURCE_PROFILES
+from generate_session_report import SUMMARY_BLOCK_BYTES, render_page_head, render_summary_block
+from live_report import LiveSessionReport
+
+
+def png_base64():
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 48), (200, 0, 0)).save(buffer, "PNG")
+    return base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+def make_test_case(i, result):
+    return {
+        "test_case_number": f"1001.1.1.{i}",
+        "test_case_name": f"Test {i}",
+        "result": result,
+        "executed_at": f"2025-11-24 13:2{i}:00",
+        "terminal_output": "output",
+        "screenshot": png_base64() if i == 1 else None,
+    }
+
+
+def summary_of(results):
+    passed = results.count("Pass")
+    return {"total_tests": len(results), "passed": passed, "failed": len(results) - passed,
+            "unknown": 0, "pass_rate": f"{passed / len(results) * 100:.2f}%"}
+
+
+def test_start_append_read_finish(tmp_path):
+    html_path = tmp_path / "live_session_report.html"
+    report = LiveSessionReport(str(html_path))
+    report.start("session_1", "2025-11-24 13:20:00")
+    offset = len(render_page_head("session_1", "2025-11-24 13:20:00").encode("utf-8"))
+
+    results = ["Pass", "Fail", "Pass"]
+    for i, result in enumerate(results, 1):
+        report.append(make_test_case(i, result), summary_of(results[:i]))
+
+        page = report.read_page()
+        # The summary block keeps its place and size; only its content changes
+        block = page[offset:offset + SUMMARY_BLOCK_BYTES]
+        assert block == render_summary_block(summary_of(results[:i]), i)
+        assert page[offset + SUMMARY_BLOCK_BYTES:].lstrip().startswith(b'<div class="test-cases">')
+        assert page.count(b"location.reload()") == 1
+        assert page.rstrip().endswith(b"</html>")
+
+    positions = [page.index(f'<span class="test-case-number">1001.1.1.{i}</span>'.encode()) for i in (1, 2, 3)]
+    assert positions == sorted(positions)
+    assert (tmp_path / "report_assets" / "TC_1001_1_1_1_2025-11-24_13-21-00_thumb.jpg").exists()
+    assert b"66.67%" in page[offset:offset + SUMMARY_BLOCK_BYTES]
+
+    report.finish()
+    finished = report.read_page()
+    assert finished == html_path.read_bytes()
+    assert b"location.reload()" not in finished and finished.rstrip().endswith(b"</html>")
+    assert finished.count(b"</html>") == 1 and finished.count(b'<div class="test-case">') == 3
+
+    # Nothing is added once the session is finished
+    report.append(make_test_case(4, "Pass"), summary_of(results + ["Pass"]))
+    assert html_path.read_bytes() == finished
+
+
+def test_new_session_replaces_the_previous_report(tmp_path):
+    report = LiveSessionReport(str(tmp_path / "live_session_report.html"))
+    report.start("session_1")
+    report.append(make_test_case(2, "Fail"), summary_of(["Fail"]))
+    report.finish()
+
+    report.start("session_2")
+
+    page = report.read_page()
+    assert b"session_2" in page and b"session_1" not in page
+    assert b'<div class="test-case">' not in page and b"location.reload()" in page
+
+
+def test_largest_summary_fits_the_block():
+    usage = {"model_calls": 10 ** 7, "input_tokens": 10 ** 13, "output_tokens": 10 ** 13,
+             "upload_bytes": 10 ** 15, "wall_seconds": 10 ** 9}
+    longest = max(RESOURCE_PROFILES.values(), key=lambda p: len(p.name) + len(p.description))
+    summary = {"total_tests": 10 ** 6, "passed": 10 ** 6, "failed": 10 ** 6, "unknown": 10 ** 6,
+               "pass_rate": "100.00%", "usage": usage}
+
+    for overrides in ({f"cdn{i}.example-domain.com": "text-only" for i in range(40)},
+                      {'"<&>' * 200: "full"}, {"ü" * 400: "full"}):
+        summary["resource_profile"] = {"name": longest.name, "description": longest.description,
+                                       "overrides": overrides}
+        block = render_summary_block(summary, 10 ** 6)  # raises if it does not fit
+        assert len(block) == SUMMARY_BLOCK_BYTES
+        assert block.decode("utf-8").rstrip().endswith("</div>")
@@ -0,0 +1,51 @@
+"""
+Tests for the agent output classifier
+"""
+
+import json
+import os
+
+import pytest
+
+from output_classifier import OutputClassifier, classify_output
+
+CORPUS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'output_classifier_corpus.json')
+
+with open(CORPUS_FILE, 'r', encoding='utf-8') as f:
+    CORPUS = json.load(f)
+
+
+@pytest.mark.parametrize('entry', CORPUS, ids=[f"corpus-{i}" for i in range(len(CORPUS))])
+def test_labeled_corpus(entry):
+    result = classify_output(entry['output'], entry['last_output'])
+    assert result.verdict == entry['verdict']
+    assert result.complete == entry['complete']
+    assert result.question_type == entry['question_type']
+    assert result.auto_response == entry['auto_response']
+    assert result.completed_signal == entry['completed_signal']
+
+
+def test_overlapping_phrases_keep_every_category():
+    # "not visible" contains "visible"; the failure must still win
+    assert classify_output("The cart icon is not visible").verdict == 'Fail'
+    # "completed successfully" also signals "completed"
+    result = classify_output("Checkout completed successfully.")
+    assert result.verdict == 'Pass'
+    assert result.completed_signal
+
+
+def test_explicit_statement_only_counts_near_the_end():
+    output = "Result: Pass\n" + "Moved the mouse to the footer.\n" * 30 + "The link is broken: error 404"
+    assert classify_output(output).verdict == 'Fail'
+
+
+def test_only_tail_window_is_scanned():
+    classifier = OutputClassifier(tail_window=100)
+    output = "An error was shown at first.\n" + "Retrying the step.\n" * 20 + "The cart badge is displayed."
+    assert classifier.classify(output).verdict == 'Pass'
+
+
+def test_last_output_outside_output_is_still_classified():
+    result = classify_output("Clicked login.", "Should I continue?")
+    assert result.question_type == 'procedural'
+    assert result.auto_response == 'yes, proceed'
@@ -2,26 +2,17 @@
 Test the multi-test case parsing logic
 """
 
-import re
-
-def extract_all_testcases(instructions):
-    """Extract all test case numbers and descriptions from instructions."""
-    pattern = r'TestCase Number\s*-\s*([0-9.]+)\s*,\s*([^:]+):'
-    matches = re.finditer(pattern, instructions, re.IGNORECASE)
-    
-    test_cases = []
-    for match in matches:
-        test_case_number = match.group(1).strip()
-        test_case_name = match.group(2).strip()
-        test_cases.append({
-            'number': test_case_number,
-            'name': test_case_name,
-            'start_pos': match.start()
-        })
-    
-    return test_cases
-
-# Test with sample input
+import os
+
+import pytest
+
+from testcase_parser import TestCase, parse_test_cases, split_instructions_by_testcase
+
+TESTCASE_MD = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'testcase.md')
+
+TERMINATOR = "Tell us if this test case is passed or failed? Update the result in one word (Pass/Fail) in report against this test case number."
+
+# Mix of the one-line convention and a structured Markdown block
 sample_instructions = """
 Login with 'standard_user' and 'secret_sauce'.
 Once on the Products page, find "Sauce Labs Backpack" and click 'ADD TO CART'.
@@ -50,19 +41,95 @@ TestCase Number - 1001.1.1.5, Add Multiple Products Test: Ensure multiple produc
 Tell us if this test case is passed or failed? Update the result in one word (Pass/Fail) in report against this test case number.
 """
 
-test_cases = extract_all_testcases(sample_instructions)
 
-print(f"\n{'='*70}")
-print(f"Found {len(test_cases)} test cases:")
-print(f"{'='*70}\n")
+def test_detects_both_test_cases():
+    test_cases = parse_test_cases(sample_instructions)
+
+    assert [tc.number for tc in test_cases] == ['1001.1.1.4', '1001.1.1.5']
+    assert [tc.name for tc in test_cases] == ['Add Single Product Test', 'Add Multiple Products Test']
+
+
+def test_one_line_convention_collects_prose_steps():
+    first = parse_test_cases(sample_instructions)[0]
+
+    assert first.steps[0] == "Login with 'standard_user' and 'secret_sauce'."
+    assert len(first.steps) == 4
+    assert first.validation.startswith('TestCase Number - 1001.1.1.4')
+    assert first.text.endswith(TERMINATOR)
+
+
+def test_structured_block_fields():
+    second = parse_test_cases(sample_instructions)[1]
+
+    assert second.description.startswith('Add Multiple Products Test - ')
+    assert second.steps == [
+        "Login with 'standard_user' and 'secret_sauce'",
+        'Add "Sauce Labs Backpack" to the cart',
+        'Add "Sauce Labs Bike Light" to the cart',
+        'Add "Sauce Labs Bolt T-Shirt" to the cart',
+        'Click on the cart icon to review added items',
+        'Verify that all selected products are displayed with accurate names and prices',
+    ]
+    assert second.validation.startswith('**Validation:**')
+    # The block starts after the previous test case's closing sentence
+    assert second.text.startswith('---\n\n## Test Case 5: Add Multiple Products Test')
+
+
+def test_testcase_md():
+    with open(TESTCASE_MD, encoding='utf-8') as f:
+        test_cases = parse_test_cases(f.read())
+
+    assert [tc.number for tc in test_cases] == ['1001.1.1.1', '1001.1.1.2', '1001.1.1.3', '1001.1.1.4']
+    assert test_cases[0].start_url == 'https://www.saucedemo.com/'
+    assert test_cases[3].start_url is None
+    assert all(tc.steps for tc in test_cases)
+
+
+def test_missing_closing_sentence_splits_at_next_heading():
+    with open(TESTCASE_MD, encoding='utf-8') as f:
+        suite = f.read().replace(TERMINATOR, '')
+
+    test_cases = parse_test_cases(suite)
+
+    assert [tc.name for tc in test_cases] == [
+        'Valid Login Test', 'Invalid Password Test', 'Blank Login Fields Test', 'Add Single Product Test'
+    ]
+    assert test_cases[1].text.startswith('## Test Case 2: Invalid Password Test')
+
+
+def test_heading_and_number_field_without_one_line_anchor():
+    suite = "## Test Case 7: Logout Test\n\n**Test Case Number:** 1001.2.1\n\n**Steps:**\n1. Open the menu\n2. Click Logout\n"
+
+    (test_case,) = parse_test_cases(suite)
+
+    assert (test_case.number, test_case.name) == ('1001.2.1', 'Logout Test')
+    assert test_case.steps == ['Open the menu', 'Click Logout']
+
+
+def test_split_without_test_cases_returns_whole_text():
+    assert split_instructions_by_testcase("Open bing.com and search for cats") == [
+        (None, None, "Open bing.com and search for cats")
+    ]
+
+
+def test_split_returns_tuples():
+    blocks = split_instructions_by_testcase(sample_instructions)
+
+    assert [block[:2] for block in blocks] == [
+        ('1001.1.1.4', 'Add Single Product Test'),
+        ('1001.1.1.5', 'Add Multiple Products Test'),
+    ]
+    assert all(isinstance(tc, TestCase) for tc in parse_test_cases(sample_instructions))
+
+
+@pytest.mark.parametrize('size', [1000])
+def test_large_suite(size):
+    suite = '\n'.join(
+        f"Do step {i}.\nTestCase Number - 1.{i}, Case {i}: check.\n{TERMINATOR}" for i in range(size)
+    )
 
-for i, tc in enumerate(test_cases, 1):
-    print(f"{i}. Test Case: {tc['number']}")
-    print(f"   Name: {tc['name']}")
-    print(f"   Position: {tc['start_pos']}")
-    print()
+    test_cases = parse_test_cases(suite)
 
-if len(test_cases) == 2:
-    print("✅ TEST PASSED: Successfully detected both test cases!")
-else:
-    print(f"❌ TEST FAILED: Expected 2 test cases, found {len(test_cases)}")
+    assert len(test_cases) == size
+    assert test_cases[-1].number == f'1.{size - 1}'
+    assert test_cases[-1].steps == [f'Do step {size - 1}.']
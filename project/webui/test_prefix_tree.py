@@ -0,0 +1,99 @@
+"""
+Tests for the shared-prefix execution plan
+"""
+
+import os
+
+from fakes import FakeAgent, FakeComputer
+from prefix_tree import count_saved_steps, plan_shared_prefixes
+from session_setup import SessionSetups
+from testcase_parser import TestCase, parse_test_cases
+
+LOGIN = "Login using 'standard_user' as username and 'secret_sauce' as password"
+URL = "https://www.saucedemo.com/"
+
+
+def case(number, *steps):
+    return TestCase(number, f"Test {number}", "", steps=list(steps))
+
+
+SUITE = [
+    case("1", LOGIN, "Add backpack", "Open cart", "Verify backpack is listed"),
+    case("2", LOGIN, "Add backpack", "Open cart", "Remove backpack"),
+    case("3", LOGIN, "Add backpack", "Open cart", "Checkout"),
+    case("4", LOGIN, "Sort by price"),
+    case("5", "Load https://www.saucedemo.com/", "Leave the fields blank", "Click Login"),
+    case("6", LOGIN + ".", "  add   backpack ", "Open cart", "Verify the badge"),
+]
+
+
+def test_checkpoints_at_branch_points():
+    plan = plan_shared_prefixes(SUITE, URL)
+
+    cart = plan[0]
+    assert cart.steps == [LOGIN, "Add backpack", "Open cart"]
+    assert cart.username == "standard_user"
+    assert cart.url == URL
+    # "Login" is shared by five cases but only four continue with "Add backpack"
+    assert cart.parent.steps == [LOGIN]
+    assert cart.parent.parent is None
+    # Cases under the same branch share the same preamble objects
+    assert plan[1] is cart and plan[2] is cart
+    assert plan[5] is cart  # steps match after normalizing case, spacing and full stops
+    assert plan[3] is cart.parent
+    assert plan[4] is None
+
+
+def test_unique_cases_have_no_plan():
+    plan = plan_shared_prefixes([case("1", LOGIN, "Sort"), case("2", "Open about page", "Sort")], URL)
+    assert plan == [None, None]
+
+
+def test_start_url_loads_are_not_checkpointed():
+    suite = [
+        case("1", "Load https://www.saucedemo.com/", "Type 'standard_user'", "Click Login"),
+        case("2", "Load https://www.saucedemo.com/", "Leave the fields blank", "Click Login"),
+    ]
+    assert plan_shared_prefixes(suite, URL) == [None, None]
+
+    # A load followed by shared agent steps is checkpointed, but only the agent steps count
+    suite = [case(c.number, *c.steps[:1], LOGIN, *c.steps[1:]) for c in suite]
+    plan = plan_shared_prefixes(suite, URL)
+    assert plan[0].steps == ["Load https://www.saucedemo.com/", LOGIN]
+    assert count_saved_steps(plan) == (2, 1)
+    assert plan_shared_prefixes(suite, URL, min_steps=2) == [None, None]
+
+
+def test_shipped_testcase_md_has_no_checkpoint():
+    path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'testcase.md')
+    with open(path, 'r', encoding='utf-8') as f:
+        test_cases = parse_test_cases(f.read())
+    plan = plan_shared_prefixes(test_cases, URL)
+    assert plan == [None] * len(test_cases)
+    assert count_saved_steps(plan) == (0, 0)
+
+
+def test_step_counts():
+    plan = plan_shared_prefixes(SUITE, URL)
+    # 4 cases x 3 cart steps + 1 login for case 4, versus login once + 2 cart steps once
+    assert count_saved_steps(plan) == (13, 3)
+
+
+def test_nested_checkpoints_run_each_prefix_once():
+    plan = plan_shared_prefixes(SUITE, URL)
+    computer = FakeComputer()
+    agent = FakeAgent(computer, navigate=lambda turn: f"{URL}step{turn}")
+    setups = SessionSetups(computer, agent)
+
+    prepared = [setups.prepare(preamble) for preamble in plan]
+
+    # One run for the login, one for the cart steps on top of it
+    assert len(agent.prompts) == 2
+    assert LOGIN in agent.prompts[0] and "Add backpack" not in agent.prompts[0]
+    assert LOGIN not in agent.prompts[1] and "Open cart" in agent.prompts[1]
+    # The cart checkpoint's conversation starts with the login conversation
+    assert prepared[0].history[0]["content"] == agent.prompts[0]
+    assert len(prepared[0].history) == 4
+    assert prepared[4] is None
+    assert "logged in as 'standard_user'" in prepared[3].note
+    assert computer.snapshots == {plan[3].name: f"{URL}step1", plan[0].name: f"{URL}step2"}
@@ -0,0 +1,107 @@
+"""
+Tests for the streaming test report reader
+"""
+
+import json
+
+import pytest
+
+import report_reader
+from report_reader import DEFER, SKIP, DeferredScreenshot, ReportReader
+
+
+def make_report(tmp_path, test_cases, **fields):
+    report = {
+        "test_suite": "Sauce Demo Automation Test Suite",
+        "session_id": "session_1",
+        "execution_date": "2025-11-24 13:22:20",
+        "test_cases": test_cases,
+        **fields,
+    }
+    path = tmp_path / "test_case_report.json"
+    path.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    return str(path), report
+
+
+def make_test_case(i, screenshot="iVBORw0KGgo="):
+    return {
+        "test_case_number": f"1001.1.1.{i}",
+        "test_case_name": f"Test {i} – ünïcode ✓",
+        "result": "Pass" if i % 2 else "Fail",
+        "terminal_output": "output " * 50,
+        "screenshot": screenshot,
+    }
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch):
+    # Force many buffer refills so entries straddle chunk boundaries
+    monkeypatch.setattr(report_reader, "CHUNK_SIZE", 64)
+
+
+def test_iterates_same_test_cases_as_json_load(tmp_path):
+    path, report = make_report(tmp_path, [make_test_case(i) for i in range(1, 8)],
+                               summary={"total_tests": 7, "passed": 4})
+
+    reader = ReportReader(path)
+    assert list(reader.iter_test_cases()) == report["test_cases"]
+    assert reader.test_case_count == 7
+    assert reader.metadata["session_id"] == "session_1"
+    assert reader.metadata["summary"] == {"total_tests": 7, "passed": 4}
+    assert "test_cases" not in reader.metadata
+
+
+def test_skip_drops_screenshots(tmp_path):
+    path, _ = make_report(tmp_path, [make_test_case(i) for i in range(1, 4)])
+
+    for test_case in ReportReader(path).iter_test_cases(screenshots=SKIP):
+        assert "screenshot" not in test_case
+
+
+def test_defer_loads_screenshot_on_demand(tmp_path):
+    test_cases = [make_test_case(i, screenshot=f"data{i}" * 100) for i in range(1, 5)]
+    test_cases.append(make_test_case(5, screenshot=None))
+    path, _ = make_report(tmp_path, test_cases)
+
+    deferred = list(ReportReader(path).iter_test_cases(screenshots=DEFER))
+    for original, test_case in zip(test_cases[:4], deferred):
+        assert isinstance(test_case["screenshot"], DeferredScreenshot)
+        assert report_reader.load_screenshot(test_case["screenshot"]) == original["screenshot"]
+    assert deferred[4]["screenshot"] is None
+
+
+def test_screenshots_are_skipped_without_being_decoded(tmp_path, monkeypatch):
+    # Escaped quotes and backslashes, some straddling the 64-character chunks
+    screenshots = ["a" * 60 + '\\\\"' + "b" * 70, "\\" * 40 + '"', "c" * 63 + "\\", ""]
+    test_cases = [make_test_case(i, screenshot=shot) for i, shot in enumerate(screenshots, 1)]
+    test_cases.append(make_test_case(5, screenshot=None))
+    path, report = make_report(tmp_path, test_cases, summary={"total_tests": 5})
+    decoded = []
+    value = report_reader._JsonStream.value
+    monkeypatch.setattr(report_reader._JsonStream, "value", lambda self: decoded.append(value(self)) or decoded[-1])
+
+    reader = ReportReader(path)
+    deferred = list(reader.iter_test_cases(screenshots=DEFER))
+
+    assert not [v for v in decoded for shot in screenshots[:3] if json.dumps(shot) in json.dumps(v)]
+    assert [report_reader.load_screenshot(tc["screenshot"]) for tc in deferred] == screenshots + [None]
+    assert [{k: v for k, v in tc.items() if k != "screenshot"} for tc in deferred] == [
+        {k: v for k, v in tc.items() if k != "screenshot"} for tc in report["test_cases"]]
+    assert reader.metadata["summary"] == {"total_tests": 5}
+    assert all("screenshot" not in tc for tc in ReportReader(path).iter_test_cases(screenshots=SKIP))
+
+
+def test_read_metadata_and_empty_report(tmp_path):
+    path, _ = make_report(tmp_path, [], summary={"total_tests": 0})
+
+    reader = ReportReader(path)
+    assert reader.read_metadata()["summary"] == {"total_tests": 0}
+    assert reader.test_case_count == 0
+
+
+def test_malformed_report_raises(tmp_path):
+    path = tmp_path / "broken.json"
+    path.write_text('{"test_cases": [{"result": "Pass"} {"result": "Fail"}]}', encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        list(ReportReader(str(path)).iter_test_cases())
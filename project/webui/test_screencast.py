@@ -0,0 +1,58 @@
+"""
+Tests for the live screencast channel
+"""
+
+import threading
+
+from screencast import BOUNDARY, ScreencastChannel, ScreencastHub
+
+
+def test_frames_are_only_wanted_while_someone_watches():
+    channel = ScreencastChannel()
+    assert not channel.wanted()
+
+    stream = channel.stream(keepalive=0.01)
+    channel.publish(b"jpeg-1")
+    chunk = next(stream)
+    assert channel.wanted() and channel.viewers == 1
+    assert chunk.startswith(f"--{BOUNDARY}\r\nContent-Type: image/jpeg\r\n".encode())
+    assert chunk.endswith(b"jpeg-1\r\n")
+
+    stream.close()  # what the server does when the viewer disconnects
+    assert not channel.wanted() and channel.viewers == 0
+
+
+def test_slow_viewers_skip_to_the_newest_frame():
+    channel = ScreencastChannel()
+    stream = channel.stream(keepalive=0.01)
+    channel.publish(b"first")
+    assert next(stream).endswith(b"first\r\n")
+
+    for i in range(10):  # published while the viewer was busy
+        channel.publish(f"frame-{i}".encode())
+    assert next(stream).endswith(b"frame-9\r\n")
+    # Nothing new: the keepalive re-sends the current frame
+    assert next(stream).endswith(b"frame-9\r\n")
+    stream.close()
+
+
+def test_close_ends_waiting_streams():
+    hub = ScreencastHub(max_fps=2)
+    hub.open("task")
+    channel = hub.channel("task")
+    assert hub.channel("task") is channel and channel.max_fps == 2
+    chunks = []
+
+    def watch():
+        chunks.extend(channel.stream(keepalive=10))
+
+    viewer = threading.Thread(target=watch)
+    viewer.start()
+    hub.close("task")
+    viewer.join(timeout=2)
+
+    assert not viewer.is_alive() and chunks == []
+    assert channel.viewers == 0
+    assert not hub.is_live("task") and not hub._live and not hub._channels  # nothing kept per finished task
+    late = hub.channel("task")  # a viewer arriving after the run
+    assert late is not channel and late.closed and list(late.stream()) == []
@@ -0,0 +1,75 @@
+"""
+Tests for the parallel screenshot exporter
+"""
+
+import base64
+import json
+import os
+
+import pytest
+
+import screenshot_export
+from report_reader import DEFER, ReportReader
+from screenshot_export import MISSING, TRUNCATED, UNCHANGED, WRITTEN, ExportStats, iter_export_screenshots
+
+
+def make_test_case(i, screenshot):
+    return {
+        "test_case_number": f"1001.1.1.{i}",
+        "test_case_name": f"Test {i}",
+        "result": "Pass",
+        "executed_at": "2025-11-24 13:22:20",
+        "screenshot": screenshot,
+    }
+
+
+def fake_png(i, size=256):
+    return base64.b64encode(b"\x89PNG" + bytes([i]) * size).decode("ascii")
+
+
+def export(tmp_path, test_cases):
+    path = tmp_path / "test_case_report.json"
+    path.write_text(json.dumps({"session_id": "session_1", "test_cases": test_cases}), encoding="utf-8")
+    stats = ExportStats()
+    results = []
+    for meta, result in iter_export_screenshots(ReportReader(str(path)).iter_test_cases(screenshots=DEFER),
+                                                str(tmp_path / "screenshots"), max_workers=4):
+        assert "screenshot" not in meta
+        stats.add(result)
+        results.append((meta["test_case_number"], result["status"], result["filename"]))
+    return results, stats
+
+
+@pytest.fixture(autouse=True)
+def small_window(monkeypatch):
+    # Keep only a few test cases in flight so the window has to drain while submitting
+    monkeypatch.setattr(screenshot_export, "WINDOW_PER_WORKER", 1)
+
+
+def test_second_export_rewrites_only_changed_screenshots(tmp_path):
+    test_cases = [make_test_case(i, fake_png(i)) for i in range(1, 21)]
+    test_cases[4]["screenshot"] = None
+    test_cases[5]["screenshot"] = "iVBORw0KGgo..."
+
+    first, stats = export(tmp_path, test_cases)
+
+    assert [number for number, _, _ in first] == [f"1001.1.1.{i}" for i in range(1, 21)]
+    assert stats.counts[WRITTEN] == 18 and stats.counts[MISSING] == 1 and stats.counts[TRUNCATED] == 1
+    out = tmp_path / "screenshots"
+    written = {name: os.stat(out / name) for _, status, name in first if status == WRITTEN}
+    assert sorted(os.listdir(out)) == sorted(written)
+
+    # One screenshot changes content at the same size, another changes size
+    test_cases[2]["screenshot"] = fake_png(99)
+    test_cases[9]["screenshot"] = fake_png(10, size=512)
+    second, stats = export(tmp_path, test_cases)
+
+    changed = {name for _, status, name in second if status == WRITTEN}
+    assert changed == {first[2][2], first[9][2]}
+    assert stats.counts[UNCHANGED] == 16 and stats.bytes_written == 260 + 516
+    for name, before in written.items():
+        after = os.stat(out / name)
+        # Skipped files are left alone; rewritten ones are replaced by a new file
+        assert (after.st_ino == before.st_ino) == (name not in changed)
+    assert (out / first[2][2]).read_bytes() == base64.b64decode(fake_png(99))
+    assert not [name for name in os.listdir(out) if name.endswith(".tmp")]
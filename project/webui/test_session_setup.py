@@ -0,0 +1,69 @@
+"""
+Tests for login preamble detection and setup snapshots
+"""
+
+import os
+
+from fakes import FakeAgent, FakeComputer
+from session_setup import SessionSetups, detect_login_preamble
+from testcase_parser import TestCase, parse_test_cases
+
+TESTCASE_MD = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'testcase.md')
+LOGIN_URL = "https://www.saucedemo.com/"
+INVENTORY_URL = "https://www.saucedemo.com/inventory.html"
+
+
+def test_detects_only_login_preambles_in_testcase_md():
+    with open(TESTCASE_MD, 'r', encoding='utf-8') as f:
+        test_cases = parse_test_cases(f.read())
+
+    preambles = [detect_login_preamble(tc, LOGIN_URL) for tc in test_cases]
+
+    # 1-3 exercise the login form itself; 4 only needs to be logged in
+    assert preambles[:3] == [None, None, None]
+    assert preambles[3].name == "login:standard_user@www.saucedemo.com"
+    assert preambles[3].url == LOGIN_URL
+    assert preambles[3].steps == ["Login using 'standard_user' as username and 'secret_sauce' as password"]
+
+
+def test_load_step_sets_url_and_login_must_not_be_last():
+    steps = ["Load https://shop.example.com/.", "Login with 'alice' and 'pw'", "Open the cart"]
+    preamble = detect_login_preamble(TestCase("1", "Cart", "", steps=steps))
+    assert preamble.name == "login:alice@shop.example.com"
+    assert preamble.url == "https://shop.example.com/"
+    assert preamble.steps == steps[:2]
+
+    assert detect_login_preamble(TestCase("2", "Login", "", steps=steps[:2])) is None
+
+
+def test_snapshot_is_captured_once_and_restored_per_test_case():
+    computer = FakeComputer()
+    agent = FakeAgent(computer, navigate=lambda turn: INVENTORY_URL)
+    setups = SessionSetups(computer, agent)
+    preamble = detect_login_preamble(TestCase("1", "Cart", "", steps=[
+        "Login using 'standard_user' as username and 'secret_sauce' as password", "Open the cart"]), LOGIN_URL)
+
+    first = setups.prepare(preamble)
+    second = setups.prepare(preamble)
+
+    assert len(agent.prompts) == 1  # the login ran once
+    assert computer.snapshots == {preamble.name: INVENTORY_URL}
+    assert computer.restored == [None, preamble.name, preamble.name]
+    assert first == second and "logged in as 'standard_user'" in first.note
+    # The test case continues the conversation that performed the login
+    assert first.history[0]["content"] == agent.prompts[0]
+    assert first.history[-1]["content"][0]["text"] == "DONE"
+    assert computer.url == INVENTORY_URL
+
+
+def test_failed_capture_is_not_retried():
+    computer = FakeComputer()
+    agent = FakeAgent(computer)  # the login never gets past the login page
+    setups = SessionSetups(computer, agent)
+    preamble = detect_login_preamble(TestCase("1", "Cart", "", steps=[
+        "Login with 'standard_user' and 'secret_sauce'", "Open the cart"]), LOGIN_URL)
+
+    assert setups.prepare(preamble) is None
+    assert setups.prepare(preamble) is None
+    assert computer.snapshots == {}
+    assert len(agent.prompts) == 3  # one capture attempt, all of its turns
@@ -0,0 +1,88 @@
+"""
+Tests for the parsed test suite cache
+"""
+
+import os
+
+import pytest
+
+from suite_cache import SuiteCache, load_suite_text, suite_id_for
+
+SUITE = """Open the login page.
+TestCase Number - 1.1, Login Test: check login.
+Tell us if this test case is passed or failed? Update the result in one word (Pass/Fail) in report against this test case number.
+"""
+
+
+def test_same_text_is_parsed_once(monkeypatch):
+    calls = []
+    import suite_cache
+    real_parse = suite_cache.parse_test_cases
+    monkeypatch.setattr(suite_cache, 'parse_test_cases', lambda text: calls.append(text) or real_parse(text))
+
+    cache = SuiteCache()
+    first = cache.get_or_parse(SUITE)
+    second = cache.get_or_parse(SUITE)
+
+    assert first is second
+    assert len(calls) == 1
+    assert first.suite_id == suite_id_for(SUITE)
+    assert [tc.number for tc in first.test_cases] == ['1.1']
+    assert cache.stats() == {'entries': 1, 'hits': 1, 'misses': 1}
+
+
+def test_lru_eviction():
+    cache = SuiteCache(max_entries=2)
+    a = cache.get_or_parse(SUITE + 'a')
+    b = cache.get_or_parse(SUITE + 'b')
+    cache.get(a.suite_id)  # a is now most recently used
+    cache.get_or_parse(SUITE + 'c')
+
+    assert cache.get(a.suite_id) is a
+    assert cache.get(b.suite_id) is None
+
+
+def test_disk_cache_survives_restart(tmp_path):
+    suite = SuiteCache(str(tmp_path)).get_or_parse(SUITE)
+
+    reloaded = SuiteCache(str(tmp_path)).get(suite.suite_id)
+
+    assert reloaded is not None
+    assert reloaded.test_cases == suite.test_cases
+    assert reloaded.blocks() == suite.blocks()
+
+
+def test_unknown_or_invalid_ids(tmp_path):
+    cache = SuiteCache(str(tmp_path))
+
+    assert cache.get('0' * 64) is None
+    assert cache.get('../../etc/passwd') is None
+
+
+def test_load_directory_in_sorted_order(tmp_path):
+    (tmp_path / 'b.md').write_text(SUITE.replace('1.1', '1.2'), encoding='utf-8')
+    (tmp_path / 'a.txt').write_text(SUITE, encoding='utf-8')
+    (tmp_path / 'notes.json').write_text('{}', encoding='utf-8')
+
+    suite = SuiteCache().load_path(str(tmp_path))
+
+    assert [tc.number for tc in suite.test_cases] == ['1.1', '1.2']
+    assert suite.source == os.path.abspath(str(tmp_path))
+    assert load_suite_text(str(tmp_path)) == suite.instructions
+
+
+def test_paths_outside_the_suites_dir_are_rejected(tmp_path):
+    suites = tmp_path / 'suites'
+    suites.mkdir()
+    (suites / 'login.md').write_text(SUITE, encoding='utf-8')
+    (tmp_path / 'secret.md').write_text('password', encoding='utf-8')
+    (suites / 'config.json').write_text('{}', encoding='utf-8')
+    (suites / 'linked.md').symlink_to(tmp_path / 'secret.md')
+    cache = SuiteCache(suites_dir=str(suites))
+
+    assert cache.load_path('login.md').test_cases[0].number == '1.1'
+    for path in ('../../etc/passwd', '/etc/passwd', '../secret.md', 'linked.md', 'config.json'):
+        with pytest.raises(ValueError):
+            cache.load_path(path)
+    # Loading the whole directory skips the file linked from outside it
+    assert 'password' not in cache.load_path('.').instructions
@@ -0,0 +1,29 @@
+"""
+Tests for the command-line report viewer
+"""
+
+import json
+
+from report_reader import ReportReader
+from view_report import display_failed_tests
+
+
+def test_failed_tests_show_why_a_case_was_stopped(tmp_path, capsys):
+    test_cases = [
+        {"test_case_number": "1001.1.1.1", "test_case_name": "Login", "result": "Pass",
+         "executed_at": "2025-11-24 13:21:00", "terminal_output": "Pass"},
+        {"test_case_number": "1001.1.1.2", "test_case_name": "Checkout", "result": "Fail",
+         "executed_at": "2025-11-24 13:22:00", "terminal_output": "Clicked checkout.",
+         "stop_reason": "model call budget of 3 exhausted"},
+        {"test_case_number": "1001.1.1.3", "test_case_name": "Sort", "result": "Fail",
+         "executed_at": "2025-11-24 13:23:00", "terminal_output": "The list is not sorted. Fail"},
+    ]
+    path = tmp_path / "test_case_report.json"
+    path.write_text(json.dumps({"session_id": "session_1", "test_cases": test_cases}), encoding="utf-8")
+
+    display_failed_tests(ReportReader(str(path)))
+
+    printed = capsys.readouterr().out
+    assert "FAILED TESTS (2 total)" in printed
+    assert "Stopped: model call budget of 3 exhausted" in printed
+    assert printed.count("Stopped:") == 1
@@ -0,0 +1,223 @@
+"""
+Test Case Parser
+Splits a test suite into structured test cases in a single pass over its lines.
+
+Two layouts are understood, and may be mixed in one suite:
+
+  - The one-line convention: free-form steps followed by
+    `TestCase Number - 1001.1.1.4, Add Single Product Test: ...` and the
+    "Update the result in one word (Pass/Fail) ..." sentence.
+  - The structured Markdown blocks used in testcase.md: a `## Test Case N: Name`
+    heading with `**Test Case Number:**`, `**Description:**`, `**Steps:**` and
+    `**Validation:**` sections.
+
+A test case ends right after its "Update the result ..." sentence (or where the
+next test case starts if that sentence is missing); the last one runs to the end
+of the suite. `TestCase.text` is the exact slice of the suite for that test
+case, which is what the agent is given.
+"""
+
+import re
+from dataclasses import dataclass, field
+
+# Bump when parsing output changes so cached parses (see suite_cache.py) are discarded
+PARSER_VERSION = 1
+
+# `TestCase Number - 1001.1.1.1, Valid Login Test:`
+ONE_LINE_PATTERN = re.compile(r'TestCase Number\s*-\s*([0-9.]+)\s*,\s*([^:]+):', re.IGNORECASE)
+
+# Sentence closing every test case
+TERMINATOR_PATTERN = re.compile(
+    r'Update the result in one word \(Pass/Fail\) in report against this test case number\.',
+    re.IGNORECASE,
+)
+
+URL_PATTERN = re.compile(r'https?://[^\s]+')
+
+# Line-level tokens, tried in order against the stripped line
+LINE_PATTERN = re.compile(
+    r'(?P<heading>#{1,6}\s*Test\s*Case\b[^:\n]*:\s*(?P<heading_name>.*))'
+    r'|(?P<number_field>\*\*Test\s*Case\s*(?:Number|No\.?|ID)\s*:?\*\*\s*:?\s*(?P<field_number>[0-9][0-9.]*))'
+    r'|(?P<description_field>\*\*Description\s*:?\*\*\s*:?\s*(?P<description>.*))'
+    r'|(?P<section>\*\*(?P<section_name>[A-Za-z ]+?)\s*:?\*\*\s*:?\s*(?P<section_rest>.*))'
+    r'|(?P<separator>(?:-{3,}|\*{3,}|_{3,})$)'
+    r'|(?P<bullet>(?:[-*+]|\d+[.)])\s+(?P<bullet_text>.+))',
+    re.IGNORECASE,
+)
+
+# Cheap pre-checks so the inline searches only run on lines that can match
+_ONE_LINE_HINT = 'testcase number'
+_TERMINATOR_HINT = 'update the result'
+
+
+@dataclass
+class TestCase:
+    """One test case parsed out of a suite."""
+
+    __test__ = False  # not a pytest test class
+
+    number: str | None
+    name: str | None
+    text: str
+    description: str | None = None
+    steps: list[str] = field(default_factory=list)
+    validation: str | None = None
+    start_url: str | None = None
+    start: int = 0
+    end: int = 0
+
+    def as_tuple(self):
+        """(number, name, text), the shape returned by split_instructions_by_testcase."""
+        return (self.number, self.name, self.text)
+
+
+class _Builder:
+    """Accumulates the tokens of the test case currently being parsed."""
+
+    def __init__(self, start):
+        self.start = start
+        self.number = None
+        self.one_line_name = None
+        self.heading_name = None
+        self.description = None
+        self.section = None
+        self.section_steps = []
+        self.has_steps_section = False
+        self.prose_steps = []
+        self.validation_start = None
+        self.anchor_line_start = None
+        self.boundary = None  # latest heading/separator seen after the number
+        self.boundary_heading = None  # heading name found at that boundary
+
+    def set_number(self, number, line_start):
+        self.number = number
+        if self.anchor_line_start is None:
+            self.anchor_line_start = line_start
+
+    def build(self, instructions, end):
+        text = instructions[self.start:end].strip()
+        name = self.one_line_name or self.heading_name
+        if not name and self.description:
+            name = self.description.split(' - ', 1)[0].strip()
+        validation = None
+        validation_start = self.validation_start
+        if validation_start is None:
+            validation_start = self.anchor_line_start
+        if validation_start is not None and validation_start < end:
+            validation = instructions[validation_start:end].strip() or None
+        url = URL_PATTERN.search(text)
+        return TestCase(
+            number=self.number,
+            name=name,
+            text=text,
+            description=self.description,
+            steps=self.section_steps if self.has_steps_section else self.prose_steps,
+            validation=validation,
+            start_url=url.group(0) if url else None,
+            start=self.start,
+            end=end,
+        )
+
+
+def parse_test_cases(instructions):
+    """
+    Parse a suite into a list of TestCase objects in one pass over its lines.
+
+    Text that does not belong to any numbered test case is ignored; if the suite
+    has no test case numbers at all the result is empty.
+    """
+    test_cases = []
+    current = _Builder(0)
+    offset = 0
+
+    for line in instructions.splitlines(keepends=True):
+        line_start = offset
+        offset += len(line)
+        stripped = line.strip()
+        if not stripped:
+            continue
+        lowered = stripped.lower()
+
+        # --- Number anchors: may open a new test case or confirm the current one
+        number = name = None
+        if _ONE_LINE_HINT in lowered:
+            match = ONE_LINE_PATTERN.search(line)
+            if match:
+                number, name = match.group(1).strip(), match.group(2).strip()
+        token = LINE_PATTERN.match(stripped)
+        if number is None and token and token.group('number_field'):
+            number = token.group('field_number').strip().rstrip('.')
+
+        if number is not None:
+            if current.number is not None and number != current.number:
+                # A different test case started without the closing sentence
+                split_at = current.boundary if current.boundary is not None else line_start
+                heading_name = current.boundary_heading
+                test_cases.append(current.build(instructions, split_at))
+                current = _Builder(split_at)
+                current.heading_name = heading_name
+            if current.number is None:
+                current.set_number(number, line_start)
+            if name and not current.one_line_name:
+                current.one_line_name = name
+                current.anchor_line_start = line_start
+
+        # --- Structure of the current test case
+        if token and number is None:
+            if token.group('heading'):
+                heading_name = token.group('heading_name').strip() or None
+                if current.number is not None:
+                    # Most likely the start of the next test case
+                    current.boundary = line_start
+                    current.boundary_heading = heading_name
+                else:
+                    current.heading_name = heading_name or current.heading_name
+                current.section = None
+            elif token.group('description_field'):
+                current.description = token.group('description').strip()
+            elif token.group('section'):
+                current.section = token.group('section_name').strip().lower()
+                if current.section == 'steps':
+                    current.has_steps_section = True
+                elif current.section == 'validation':
+                    current.validation_start = line_start
+            elif token.group('separator'):
+                if current.number is not None:
+                    current.boundary = line_start
+                    current.boundary_heading = None
+                current.section = None
+            elif token.group('bullet') and current.section == 'steps':
+                current.section_steps.append(token.group('bullet_text').strip())
+            elif token.group('bullet') and current.number is None and current.section is None:
+                current.prose_steps.append(token.group('bullet_text').strip())
+        elif token is None and number is None and current.number is None and current.section is None:
+            current.prose_steps.append(stripped)
+        elif token is None and number is None and current.section == 'steps':
+            current.section_steps.append(stripped)
+
+        # --- Closing sentence ends the test case right after it
+        if _TERMINATOR_HINT in lowered:
+            match = TERMINATOR_PATTERN.search(line)
+            if match:
+                end = line_start + match.end()
+                if current.number is not None:
+                    test_cases.append(current.build(instructions, end))
+                current = _Builder(end)
+
+    if current.number is not None:
+        test_cases.append(current.build(instructions, len(instructions)))
+    elif test_cases:
+        # Trailing text after the last closing sentence stays with the last test case
+        last = test_cases[-1]
+        last.text = instructions[last.start:].strip()
+        last.end = len(instructions)
+
+    return test_cases
+
+
+def split_instructions_by_testcase(instructions):
+    """Split instructions into (number, name, text) blocks, one per test case."""
+    test_cases = parse_test_cases(instructions)
+    if not test_cases:
+        return [(None, None, instructions)]
+    return [tc.as_tuple() for tc in test_cases]
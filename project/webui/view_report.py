@@ -3,30 +3,40 @@ Test Case Report Viewer
 View and analyze test case execution reports
 """
 
-import json
 import os
 from datetime import datetime
 
+from report_reader import DEFER, SKIP, ReportReader, iter_test_cases, report_metadata
+from screenshot_export import (
+    DEFAULT_WORKERS,
+    ERROR,
+    TRUNCATED,
+    UNCHANGED,
+    WRITTEN,
+    ExportStats,
+    iter_export_screenshots,
+)
+
 REPORT_FILE = os.path.join(os.path.dirname(__file__), 'test_reports', 'test_case_report.json')
 
 def load_report():
-    """Load the test report from JSON file."""
+    """Open the test report for streaming; test cases are read lazily from disk."""
     if not os.path.exists(REPORT_FILE):
         print("❌ No test report found!")
         print(f"Expected location: {REPORT_FILE}")
         return None
     
-    with open(REPORT_FILE, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return ReportReader(REPORT_FILE)
 
 def display_summary(report):
     """Display summary statistics."""
+    metadata = report_metadata(report)
     print("\n" + "="*80)
-    print(f"  TEST SUITE: {report.get('test_suite', 'Unknown')}")
-    print(f"  EXECUTION DATE: {report.get('execution_date', 'Unknown')}")
+    print(f"  TEST SUITE: {metadata.get('test_suite', 'Unknown')}")
+    print(f"  EXECUTION DATE: {metadata.get('execution_date', 'Unknown')}")
     print("="*80)
     
-    summary = report.get('summary', {})
+    summary = metadata.get('summary', {})
     total = summary.get('total_tests', 0)
     passed = summary.get('passed', 0)
     failed = summary.get('failed', 0)
@@ -39,27 +49,38 @@ def display_summary(report):
     print(f"   ❌ Failed: {failed}")
     print(f"   ❔ Unknown: {unknown}")
     print(f"   Pass Rate: {pass_rate}")
+    usage = summary.get('usage')
+    if usage:
+        print(f"   Model calls: {usage.get('model_calls', 0)}  "
+              f"Tokens: {usage.get('input_tokens', 0):,} in / {usage.get('output_tokens', 0):,} out  "
+              f"Sent: {usage.get('upload_bytes', 0) / (1024 * 1024):.1f} MB  "
+              f"Time: {usage.get('wall_seconds', 0):.0f}s")
+    profile = summary.get('resource_profile')
+    if profile and (profile.get('name') != 'full' or profile.get('overrides')):
+        overrides = ', '.join(f"{domain}: {name}" for domain, name in profile.get('overrides', {}).items())
+        print(f"   Resources: {profile.get('name')} ({profile.get('description', '')})"
+              + (f"  Overrides: {overrides}" if overrides else ''))
     print()
 
 def display_detailed_results(report):
     """Display detailed test case results."""
-    test_cases = report.get('test_cases', [])
-    
-    if not test_cases:
-        print("No test cases executed yet.")
-        return
-    
-    print("\n" + "="*80)
-    print("  DETAILED TEST RESULTS")
-    print("="*80 + "\n")
-    
-    for i, tc in enumerate(test_cases, 1):
+    printed = 0
+    
+    for i, tc in enumerate(iter_test_cases(report, screenshots=SKIP), 1):
+        if i == 1:
+            print("\n" + "="*80)
+            print("  DETAILED TEST RESULTS")
+            print("="*80 + "\n")
+        printed = i
+        
         result_symbol = "✅" if tc['result'] == 'Pass' else "❌" if tc['result'] == 'Fail' else "❔"
         
         print(f"{i}. {result_symbol} Test Case: {tc['test_case_number']}")
         print(f"   Name: {tc['test_case_name']}")
         print(f"   Result: {tc['result']}")
         print(f"   Executed: {tc['executed_at']}")
+        if tc.get('stop_reason'):
+            print(f"   Stopped: {tc['stop_reason']}")
         
         # Show terminal output summary (first 200 chars)
         terminal_out = tc.get('terminal_output', '')
@@ -68,11 +89,24 @@ def display_detailed_results(report):
             print(f"   Output: {terminal_summary}")
         
         print()
+    
+    if not printed:
+        print("No test cases executed yet.")
 
 def display_failed_tests(report):
     """Display only failed test cases."""
-    test_cases = report.get('test_cases', [])
-    failed_tests = [tc for tc in test_cases if tc['result'] == 'Fail']
+    # Keep only the fields printed below so the list stays small on big reports
+    failed_tests = [
+        {
+            'test_case_number': tc['test_case_number'],
+            'test_case_name': tc['test_case_name'],
+            'executed_at': tc['executed_at'],
+            'stop_reason': tc.get('stop_reason'),
+            'terminal_output': (tc.get('terminal_output') or 'No output')[:200],
+        }
+        for tc in iter_test_cases(report, screenshots=SKIP)
+        if tc['result'] == 'Fail'
+    ]
     
     if not failed_tests:
         print("\n✅ No failed tests! All tests passed.")
@@ -86,64 +120,55 @@ def display_failed_tests(report):
         print(f"{i}. ❌ Test Case: {tc['test_case_number']}")
         print(f"   Name: {tc['test_case_name']}")
         print(f"   Executed: {tc['executed_at']}")
+        if tc.get('stop_reason'):
+            print(f"   Stopped: {tc['stop_reason']}")
         print(f"   Output: {tc.get('terminal_output', 'No output')[:200]}")
         print()
 
-def export_csv_report(report, output_file='test_report.csv'):
-    """Export test results to CSV format with screenshots saved as separate files."""
+def export_csv_report(report, output_file='test_report.csv', max_workers=DEFAULT_WORKERS):
+    """Export test results to CSV format with screenshots saved as separate files.
+    
+    Screenshots are decoded and written on a thread pool; files whose content is
+    unchanged since the last export are skipped.
+    """
     import csv
-    import base64
     
-    test_cases = report.get('test_cases', [])
+    # Screenshots are deferred and only read back from disk by the export workers
+    test_cases = iter_test_cases(report, screenshots=DEFER)
     
     # Create screenshots directory
     screenshots_dir = os.path.join(os.path.dirname(output_file), 'screenshots')
     if not os.path.exists(screenshots_dir):
         os.makedirs(screenshots_dir)
     
+    stats = ExportStats()
+    
     with open(output_file, 'w', newline='', encoding='utf-8') as f:
         writer = csv.writer(f)
         writer.writerow(['Test Case Number', 'Test Case Name', 'Result', 'Executed At', 'Terminal Output', 'Screenshot File'])
         
-        for tc in test_cases:
-            # Save screenshot if available
-            screenshot_file = ''
-            screenshot_data = tc.get('screenshot', '')
+        for tc, outcome in iter_export_screenshots(test_cases, screenshots_dir, max_workers):
+            stats.add(outcome)
             
-            if screenshot_data:
-                # Handle both truncated and full screenshots
-                # Remove the "..." suffix if present
-                if screenshot_data.endswith('...'):
-                    screenshot_data = screenshot_data[:-3]
-                
-                try:
-                    # Create filename from test case number
-                    safe_tc_number = tc['test_case_number'].replace('.', '_')
-                    screenshot_filename = f"TC_{safe_tc_number}_{tc['executed_at'].replace(':', '-').replace(' ', '_')}.png"
-                    screenshot_path = os.path.join(screenshots_dir, screenshot_filename)
-                    
-                    # Decode and save screenshot
-                    screenshot_bytes = base64.b64decode(screenshot_data)
-                    with open(screenshot_path, 'wb') as img_file:
-                        img_file.write(screenshot_bytes)
-                    
-                    screenshot_file = screenshot_filename
-                    print(f"  Saved screenshot: {screenshot_filename}")
-                except Exception as e:
-                    print(f"  ⚠️  Could not save screenshot for {tc['test_case_number']}: {e}")
-                    screenshot_file = 'Error saving screenshot'
+            screenshot_file = ''
+            if outcome['status'] in (WRITTEN, UNCHANGED):
+                screenshot_file = outcome['filename']
+            elif outcome['status'] in (TRUNCATED, ERROR):
+                print(f"  ⚠️  Could not save screenshot for {tc['test_case_number']}: {outcome['error'] or 'truncated screenshot'}")
+                screenshot_file = 'Error saving screenshot'
             
             writer.writerow([
                 tc['test_case_number'],
                 tc['test_case_name'],
                 tc['result'],
                 tc['executed_at'],
-                tc.get('terminal_output', '')[:500],  # Truncate for CSV
+                (tc.get('terminal_output') or '')[:500],  # Truncate for CSV
                 screenshot_file
             ])
     
     print(f"\n✅ Report exported to: {output_file}")
-    print(f"✅ Screenshots saved to: {screenshots_dir}")
+    print(f"✅ Screenshots saved to: {screenshots_dir} ({stats.counts[WRITTEN]} written, {stats.counts[UNCHANGED]} unchanged)")
+    stats.print_summary()
 
 def main():
     """Main function to display test report."""